@@ -39,21 +39,57 @@ class Settings(BaseModel):
         or _default_user_agents()
     )
     db_url: str = os.getenv("DB_URL", "sqlite:///./data/anime.db")
+    async_db_url: Optional[str] = os.getenv("ASYNC_DB_URL") or None
+    db_read_pool_size: int = max(1, int(os.getenv("DB_READ_POOL_SIZE", 5)))
+    sqlite_journal_mode: str = os.getenv("SQLITE_JOURNAL_MODE", "wal").lower()
+    sqlite_synchronous: str = os.getenv("SQLITE_SYNCHRONOUS", "normal").lower()
+    sqlite_mmap_size: int = max(0, int(os.getenv("SQLITE_MMAP_SIZE", 268435456)))
+    sqlite_cache_size: int = int(os.getenv("SQLITE_CACHE_SIZE", -65536))
+    sqlite_temp_store: str = os.getenv("SQLITE_TEMP_STORE", "memory").lower()
+    sqlite_busy_timeout_ms: int = max(0, int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", 5000)))
     _scraper_max_items_raw: Optional[str] = os.getenv("SCRAPER_MAX_ITEMS")
     scraper_max_items: Optional[int] = (
         int(_scraper_max_items_raw) if _scraper_max_items_raw else None
     )
+    scraper_resume: bool = os.getenv("SCRAPER_RESUME", "true").lower() == "true"
+    scraper_lease_seconds: int = max(1, int(os.getenv("SCRAPER_LEASE_SECONDS", 300)))
+    scraper_worker_poll_seconds: float = max(0.0, float(os.getenv("SCRAPER_WORKER_POLL_SECONDS", 2)))
     scraper_fetch_mirrors: bool = os.getenv("SCRAPER_FETCH_MIRRORS", "true").lower() == "true"
     scraper_concurrency: int = max(1, int(os.getenv("SCRAPER_CONCURRENCY", 8)))
     scraper_episode_concurrency: int = max(1, int(os.getenv("SCRAPER_EPISODE_CONCURRENCY", 2)))
     scraper_mirror_concurrency: int = max(1, int(os.getenv("SCRAPER_MIRROR_CONCURRENCY", 4)))
+    scraper_queue_size: int = max(1, int(os.getenv("SCRAPER_QUEUE_SIZE", 32)))
+    scraper_write_batch_size: int = max(1, int(os.getenv("SCRAPER_WRITE_BATCH_SIZE", 50)))
+    scraper_write_flush_ms: int = max(0, int(os.getenv("SCRAPER_WRITE_FLUSH_MS", 20)))
+    scraper_parse_backend: str = os.getenv("SCRAPER_PARSE_BACKEND", "inline").lower()
+    scraper_parse_workers: int = max(1, int(os.getenv("SCRAPER_PARSE_WORKERS", os.cpu_count() or 1)))
+    scraper_bulk_episodes: bool = os.getenv("SCRAPER_BULK_EPISODES", "true").lower() == "true"
+    scraper_bulk_mirrors: bool = os.getenv("SCRAPER_BULK_MIRRORS", "true").lower() == "true"
+    scraper_mirror_raw: bool = os.getenv("SCRAPER_MIRROR_RAW", "true").lower() == "true"
+    scraper_db_chunk_size: int = max(1, int(os.getenv("SCRAPER_DB_CHUNK_SIZE", 500)))
+    scraper_mirror_fanout: bool = os.getenv("SCRAPER_MIRROR_FANOUT", "false").lower() == "true"
     scraper_ongoing_refresh_hours: int = max(1, int(os.getenv("SCRAPER_ONGOING_REFRESH_HOURS", 6)))
+    scraper_max_refresh_hours: int = max(1, int(os.getenv("SCRAPER_MAX_REFRESH_HOURS", 168)))
+    scraper_list_refresh_minutes: int = max(1, int(os.getenv("SCRAPER_LIST_REFRESH_MINUTES", 60)))
     scraper_retry_incomplete_mirrors: bool = (
         os.getenv("SCRAPER_RETRY_INCOMPLETE_MIRRORS", "true").lower() == "true"
     )
+    scraper_http_cache: bool = os.getenv("SCRAPER_HTTP_CACHE", "true").lower() == "true"
+    scraper_http_cache_dir: str = os.getenv("SCRAPER_HTTP_CACHE_DIR", "./data/http_cache")
+    scraper_http_cache_max_mb: int = max(1, int(os.getenv("SCRAPER_HTTP_CACHE_MAX_MB", 256)))
+    scraper_archive: bool = os.getenv("SCRAPER_ARCHIVE", "false").lower() == "true"
+    scraper_archive_dir: str = os.getenv("SCRAPER_ARCHIVE_DIR", "./data/archive")
+    scraper_metrics_file: Optional[str] = os.getenv("SCRAPER_METRICS_FILE") or None
     scraper_ajax_delay_min: float = float(os.getenv("SCRAPER_AJAX_DELAY_MIN", 0.3))
     scraper_ajax_delay_max: float = float(os.getenv("SCRAPER_AJAX_DELAY_MAX", 1.0))
+    scraper_adaptive_rate: bool = os.getenv("SCRAPER_ADAPTIVE_RATE", "true").lower() == "true"
+    scraper_rate_min: float = max(0.01, float(os.getenv("SCRAPER_RATE_MIN", 0.2)))
+    scraper_rate_max: float = max(0.01, float(os.getenv("SCRAPER_RATE_MAX", 8)))
+    scraper_rate_increase: float = float(os.getenv("SCRAPER_RATE_INCREASE", 0.05))
+    scraper_rate_backoff: float = min(0.95, max(0.05, float(os.getenv("SCRAPER_RATE_BACKOFF", 0.5))))
+    scraper_rate_latency_factor: float = max(1.0, float(os.getenv("SCRAPER_RATE_LATENCY_FACTOR", 2.5)))
     scraper_ajax_max_retries: int = int(os.getenv("SCRAPER_AJAX_MAX_RETRIES", 2))
+    scraper_nonce_ttl_seconds: int = max(1, int(os.getenv("SCRAPER_NONCE_TTL_SECONDS", 900)))
     ajax_action_nonce: str = os.getenv("AJAX_ACTION_NONCE", "aa1208d27f29ca340c92c66d1926f13f")
     ajax_action_embed: str = os.getenv("AJAX_ACTION_EMBED", "2a3505c93b0035d3f455df82bf976b84")
 
@@ -0,0 +1,197 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import AsyncIterator, Dict, Iterator, Optional, Tuple
+
+from app.core.config import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+settings = get_settings()
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _labels(labels: Dict[str, object]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _matches(labels: Labels, match: Dict[str, object]) -> bool:
+    values = dict(labels)
+    return all(values.get(key) == str(value) for key, value in match.items())
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    body = ",".join(f'{key}="{value}"' for key, value in pairs)
+    return "{" + body + "}"
+
+
+class Histogram:
+    def __init__(self, buckets: Tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._counters: Dict[str, Dict[Labels, float]] = {}
+        self._histograms: Dict[str, Dict[Labels, Histogram]] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def inc(self, name: str, value: float = 1.0, **labels: object) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[key] = series.get(key, 0.0) + value
+
+    def observe(self, name: str, value: float, **labels: object) -> None:
+        key = _labels(labels)
+        with self._lock:
+            series = self._histograms.setdefault(name, {})
+            if key not in series:
+                series[key] = Histogram()
+            series[key].observe(value)
+
+    @contextmanager
+    def time(self, name: str, **labels: object) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def counter_total(self, name: str, **match: object) -> float:
+        with self._lock:
+            return sum(v for labels, v in self._counters.get(name, {}).items() if _matches(labels, match))
+
+    def counter_by(self, name: str, label: str) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for labels, value in self._counters.get(name, {}).items():
+                key = dict(labels).get(label, "")
+                totals[key] = totals.get(key, 0.0) + value
+        return totals
+
+    def histogram_sum(self, name: str, **match: object) -> Tuple[int, float]:
+        count, total = 0, 0.0
+        with self._lock:
+            for labels, hist in self._histograms.get(name, {}).items():
+                if _matches(labels, match):
+                    count += hist.count
+                    total += hist.sum
+        return count, total
+
+    def histogram_sum_by(self, name: str, label: str) -> Dict[str, float]:
+        totals: Dict[str, float] = {}
+        with self._lock:
+            for labels, hist in self._histograms.get(name, {}).items():
+                key = dict(labels).get(label, "")
+                totals[key] = totals.get(key, 0.0) + hist.sum
+        return totals
+
+    def render_prometheus(self) -> str:
+        lines = []
+        with self._lock:
+            for name in sorted(self._counters):
+                lines.append(f"# TYPE {name} counter")
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{_format_labels(labels)} {value:g}")
+            for name in sorted(self._histograms):
+                lines.append(f"# TYPE {name} histogram")
+                for labels, hist in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(hist.buckets, hist.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_format_labels(labels, ('le', f'{bound:g}'))} {cumulative}")
+                    lines.append(f"{name}_bucket{_format_labels(labels, ('le', '+Inf'))} {hist.count}")
+                    lines.append(f"{name}_sum{_format_labels(labels)} {hist.sum:.6f}")
+                    lines.append(f"{name}_count{_format_labels(labels)} {hist.count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f"{path.suffix}.{os.getpid()}.tmp")
+        tmp_path.write_text(self.render_prometheus(), "utf-8")
+        os.replace(tmp_path, path)
+
+
+metrics = MetricsRegistry()
+
+
+@asynccontextmanager
+async def timed_acquire(semaphore: asyncio.Semaphore, name: str) -> AsyncIterator[None]:
+    started = time.perf_counter()
+    async with semaphore:
+        metrics.observe("scraper_semaphore_wait_seconds", time.perf_counter() - started, semaphore=name)
+        yield
+
+
+def run_summary(registry: MetricsRegistry, duration: float) -> dict:
+    requests_total = registry.counter_total("scraper_requests_total")
+    items_total = registry.counter_total("scraper_items_total")
+    mirrors_total = registry.counter_total("scraper_mirrors_total")
+    mirrors_success = registry.counter_total("scraper_mirrors_total", status="success")
+    return {
+        "duration_seconds": round(duration, 3),
+        "requests": int(requests_total),
+        "requests_by_status": registry.counter_by("scraper_requests_total", "status"),
+        "requests_by_endpoint": registry.counter_by("scraper_requests_total", "endpoint"),
+        "requests_per_sec": round(requests_total / duration, 3) if duration > 0 else None,
+        "retries": int(registry.counter_total("scraper_retries_total")),
+        "http_cache_hits": int(registry.counter_total("scraper_http_cache_hits_total")),
+        "response_bytes": int(registry.counter_total("scraper_response_bytes_total")),
+        "items": registry.counter_by("scraper_items_total", "result"),
+        "items_per_sec": round(items_total / duration, 3) if duration > 0 else None,
+        "skipped": registry.counter_by("scraper_items_skipped_total", "reason"),
+        "parse_seconds": round(registry.histogram_sum("scraper_parse_seconds")[1], 3),
+        "db_write_seconds": round(registry.histogram_sum("scraper_db_write_seconds")[1], 3),
+        "db_commit_seconds": round(registry.histogram_sum("scraper_db_commit_seconds")[1], 3),
+        "semaphore_wait_seconds": {
+            name: round(total, 3)
+            for name, total in registry.histogram_sum_by("scraper_semaphore_wait_seconds", "semaphore").items()
+        },
+        "mirror_success_rate": round(mirrors_success / mirrors_total, 4) if mirrors_total else None,
+    }
+
+
+def write_metrics_file(registry: MetricsRegistry = metrics) -> None:
+    if not settings.scraper_metrics_file:
+        return
+    try:
+        registry.write_textfile(settings.scraper_metrics_file)
+    except OSError as exc:
+        logger.warning("metrics file write failed", extra={"path": settings.scraper_metrics_file, "error": str(exc)})
+
+
+def publish_run_metrics(duration: float, registry: MetricsRegistry = metrics) -> dict:
+    summary = run_summary(registry, duration)
+    logger.info("scrape run summary", extra={"summary": summary})
+    write_metrics_file(registry)
+    return summary
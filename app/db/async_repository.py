@@ -0,0 +1,71 @@
+from typing import Any, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db import models, repository
+
+
+T = TypeVar("T")
+
+
+async def run_in_session(
+    session_factory: async_sessionmaker[AsyncSession],
+    fn: Callable[..., T],
+    *args: Any,
+    commit: bool = False,
+    **kwargs: Any,
+) -> T:
+    async with session_factory() as session:
+        result = await session.run_sync(fn, *args, **kwargs)
+        if commit:
+            await session.commit()
+        return result
+
+
+async def get_anime_list(
+    session: AsyncSession,
+    status: Optional[str],
+    q: Optional[str],
+    limit: int,
+    offset: int,
+    with_total: bool = True,
+    after: Optional[str] = None,
+) -> Tuple[List[models.Anime], Optional[int], Optional[str]]:
+    return await session.run_sync(repository.get_anime_list, status, q, limit, offset, with_total, after)
+
+
+async def get_anime_by_id(session: AsyncSession, anime_id: int, with_genres: bool = False) -> Optional[models.Anime]:
+    return await session.run_sync(repository.get_anime_by_id, anime_id, with_genres)
+
+
+async def get_episode_by_id(session: AsyncSession, episode_id: int) -> Optional[models.Episode]:
+    return await session.get(models.Episode, episode_id)
+
+
+async def get_episodes_by_anime(
+    session: AsyncSession,
+    anime_id: int,
+    limit: int,
+    offset: int,
+    order: str,
+    with_total: bool = True,
+    after: Optional[str] = None,
+) -> Tuple[List[models.Episode], Optional[int], Optional[str]]:
+    return await session.run_sync(
+        repository.get_episodes_by_anime, anime_id, limit, offset, order, with_total, after
+    )
+
+
+async def get_episode_mirrors(
+    session: AsyncSession,
+    episode_id: int,
+    quality: Optional[str],
+    provider: Optional[str],
+    limit: int,
+    offset: int,
+    with_total: bool = True,
+    after: Optional[str] = None,
+) -> Tuple[List[models.EpisodeMirror], Optional[int], Optional[str]]:
+    return await session.run_sync(
+        repository.get_episode_mirrors, episode_id, quality, provider, limit, offset, with_total, after
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Index, Integer, LargeBinary, String, Text, DateTime, ForeignKey, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 
@@ -23,10 +23,16 @@ class Anime(Base):
     studio = Column(String)
     image_url = Column(String)
     synopsis = Column(Text)
+    content_hash = Column(String)
     last_scraped_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (
+        Index("ix_anime_title_id", "title", "id"),
+        Index("ix_anime_status_title_id", "status_list_page", "title", "id"),
+    )
+
     genres = relationship("Genre", secondary="anime_genre", back_populates="animes")
     episodes = relationship("Episode", back_populates="anime", cascade="all, delete-orphan")
 
@@ -60,6 +66,8 @@ class Episode(Base):
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
     updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
 
+    __table_args__ = (Index("ix_episode_anime_number_id", "anime_id", "episode_number", "id"),)
+
     anime = relationship("Anime", back_populates="episodes")
     mirrors = relationship("EpisodeMirror", back_populates="episode", cascade="all, delete-orphan")
 
@@ -75,9 +83,6 @@ class EpisodeMirror(Base):
     mirror_id = Column(Integer, nullable=False)
     mirror_i = Column(Integer, nullable=False)
     mirror_q = Column(String, nullable=False)
-    raw_data_content = Column(Text)
-    nonce = Column(String)
-    raw_embed_html = Column(Text)
     fetch_status = Column(String, default="unknown", nullable=False)
     error_message = Column(Text)
     last_scraped_at = Column(DateTime, default=datetime.utcnow, nullable=False)
@@ -90,3 +95,39 @@ class EpisodeMirror(Base):
     )
 
     episode = relationship("Episode", back_populates="mirrors")
+    raw = relationship("EpisodeMirrorRaw", uselist=False, cascade="all, delete-orphan")
+
+
+class EpisodeMirrorRaw(Base):
+    __tablename__ = "episode_mirror_raw"
+
+    episode_mirror_id = Column(Integer, ForeignKey("episode_mirror.id", ondelete="CASCADE"), primary_key=True)
+    data_content = Column(LargeBinary)
+    embed_html = Column(LargeBinary)
+    nonce = Column(String)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class CrawlJob(Base):
+    __tablename__ = "crawl_job"
+
+    id = Column(Integer, primary_key=True)
+    kind = Column(String, nullable=False)
+    job_key = Column(String, nullable=False)
+    payload = Column(Text)
+    state = Column(String, default="pending", nullable=False, index=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    error_message = Column(Text)
+    lease_owner = Column(String)
+    lease_expires_at = Column(DateTime)
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+    __table_args__ = (UniqueConstraint("kind", "job_key", name="uq_crawl_job_key"),)
+
+
+class TableVersion(Base):
+    __tablename__ = "table_version"
+
+    table_name = Column(String, primary_key=True)
+    version = Column(Integer, default=0, nullable=False)
@@ -1,21 +1,60 @@
-from datetime import datetime
-from typing import Iterable, List, Tuple, Optional, Union, cast
-from sqlalchemy.orm import Session
-from sqlalchemy import exists, select, func
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Any, Callable, Dict, Iterable, List, Sequence, Tuple, Optional, TypeVar, Union, cast
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import Select, and_, column, delete, event, exists, insert, literal_column, or_, select, func, table, text, update
+from sqlalchemy.dialects import postgresql, sqlite
+import base64
+import json
 import re
+import threading
+import weakref
+import zlib
+from collections import OrderedDict
 
 from app.db import models
 
 
+VOLATILE_FIELDS = {"last_scraped_at"}
+EPISODE_FIELDS = ("anime_id", "episode_url", "episode_title", "episode_date_text", "episode_number")
+ANIME_FTS_TABLE = "anime_fts"
+ANIME_FTS_COLUMNS = ("title", "title_japanese", "synopsis")
+ANIME_FTS_WEIGHTS = (10.0, 5.0, 1.0)
+TOTALS_CACHE_SIZE = 1024
+VERSIONED_TABLES = {
+    "anime": ("status_list_page", "title", "title_japanese", "synopsis"),
+    "episode": ("anime_id",),
+    "episode_mirror": ("episode_id", "quality", "provider_name"),
+}
+MIRROR_RAW_FIELDS = {"raw_data_content": "data_content", "raw_embed_html": "embed_html", "nonce": "nonce"}
+
+T = TypeVar("T")
+
+
+def chunked(values: Sequence[T], size: int) -> Iterable[Sequence[T]]:
+    for start in range(0, len(values), size):
+        yield values[start : start + size]
+
+
+def assign_changed(obj: object, data: dict) -> bool:
+    changed = False
+    for k, v in data.items():
+        if getattr(obj, k) != v:
+            setattr(obj, k, v)
+            if k not in VOLATILE_FIELDS:
+                changed = True
+    return changed
+
+
 def upsert_anime(session: Session, anime_data: dict) -> models.Anime:
     existing = session.execute(
         select(models.Anime).where(models.Anime.source_url == anime_data["source_url"])
     ).scalar_one_or_none()
 
     if existing:
-        for k, v in anime_data.items():
-            setattr(existing, k, v)
-        existing.updated_at = datetime.utcnow()  # type: ignore[assignment]
+        if assign_changed(existing, anime_data):
+            existing.updated_at = datetime.utcnow()  # type: ignore[assignment]
         return existing
 
     anime = models.Anime(**anime_data)
@@ -23,6 +62,17 @@ def upsert_anime(session: Session, anime_data: dict) -> models.Anime:
     return anime
 
 
+def get_anime_scrape_state(session: Session, source_url: str) -> Optional[dict]:
+    row = session.execute(
+        select(models.Anime.last_scraped_at, models.Anime.status_detail).where(
+            models.Anime.source_url == source_url
+        )
+    ).one_or_none()
+    if row is None:
+        return None
+    return {"last_scraped_at": row[0], "status_detail": row[1]}
+
+
 def upsert_genres(session: Session, genre_names: Iterable[str]) -> List[models.Genre]:
     genres = []
     for name in genre_names:
@@ -34,9 +84,91 @@ def upsert_genres(session: Session, genre_names: Iterable[str]) -> List[models.G
     return genres
 
 
-def sync_anime_genres(session: Session, anime: models.Anime, genre_names: Iterable[str]) -> None:
-    genres = upsert_genres(session, genre_names)
-    anime.genres = genres
+class GenreCache:
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._loaded = False
+        self._lock = threading.Lock()
+
+    def ids_for(self, session: Session, genre_names: Iterable[str]) -> List[int]:
+        names = list(dict.fromkeys(name for name in genre_names if name))
+        with self._lock:
+            if not self._loaded:
+                self._ids = {row[0]: row[1] for row in session.execute(select(models.Genre.name, models.Genre.id))}
+                self._loaded = True
+            missing = [name for name in names if name not in self._ids]
+            if missing:
+                self._insert_missing(session, missing)
+            return [self._ids[name] for name in names]
+
+    def _insert_missing(self, session: Session, names: List[str]) -> None:
+        dialect = session.get_bind().dialect.name
+        rows = [{"name": name} for name in names]
+        if dialect == "sqlite":
+            session.execute(sqlite.insert(models.Genre).on_conflict_do_nothing(index_elements=["name"]), rows)
+        elif dialect == "postgresql":
+            session.execute(postgresql.insert(models.Genre).on_conflict_do_nothing(index_elements=["name"]), rows)
+        else:
+            existing = set(session.execute(select(models.Genre.name).where(models.Genre.name.in_(names))).scalars())
+            new_rows = [row for row in rows if row["name"] not in existing]
+            if new_rows:
+                session.execute(insert(models.Genre), new_rows)
+        inserted = {
+            row[0]: row[1]
+            for row in session.execute(select(models.Genre.name, models.Genre.id).where(models.Genre.name.in_(names)))
+        }
+        self._ids.update(inserted)
+        event.listen(session, "after_rollback", partial(self._forget, list(inserted)), once=True)
+
+    def _forget(self, names: List[str], session: Session) -> None:
+        with self._lock:
+            for name in names:
+                self._ids.pop(name, None)
+
+
+_genre_caches: "weakref.WeakKeyDictionary[Engine, GenreCache]" = weakref.WeakKeyDictionary()
+_genre_caches_lock = threading.Lock()
+_anime_fts_engines: "weakref.WeakKeyDictionary[Engine, bool]" = weakref.WeakKeyDictionary()
+_totals_caches: "weakref.WeakKeyDictionary[Engine, TotalsCache]" = weakref.WeakKeyDictionary()
+_totals_caches_lock = threading.Lock()
+
+
+def genre_cache_for(session: Session) -> GenreCache:
+    bind = cast(Engine, session.get_bind())
+    with _genre_caches_lock:
+        cache = _genre_caches.get(bind)
+        if cache is None:
+            cache = GenreCache()
+            _genre_caches[bind] = cache
+        return cache
+
+
+def sync_anime_genres(
+    session: Session, anime: models.Anime, genre_names: Iterable[str], genre_cache: Optional[GenreCache] = None
+) -> bool:
+    if genre_cache is not None:
+        wanted = genre_cache.ids_for(session, genre_names)
+    else:
+        genres = upsert_genres(session, dict.fromkeys(genre_names))
+        session.flush()
+        wanted = [cast(int, genre.id) for genre in genres]
+    session.flush()
+    current = set(
+        session.execute(select(models.AnimeGenre.genre_id).where(models.AnimeGenre.anime_id == anime.id)).scalars()
+    )
+    to_add = [genre_id for genre_id in wanted if genre_id not in current]
+    to_delete = current - set(wanted)
+    if to_delete:
+        session.execute(
+            delete(models.AnimeGenre).where(
+                models.AnimeGenre.anime_id == anime.id, models.AnimeGenre.genre_id.in_(to_delete)
+            )
+        )
+    if to_add:
+        session.execute(insert(models.AnimeGenre), [{"anime_id": anime.id, "genre_id": gid} for gid in to_add])
+    if to_add or to_delete:
+        session.expire(anime, ["genres"])
+    return bool(to_add or to_delete)
 
 
 def upsert_episodes(session: Session, anime: models.Anime, episodes: Iterable[dict]) -> List[models.Episode]:
@@ -46,9 +178,8 @@ def upsert_episodes(session: Session, anime: models.Anime, episodes: Iterable[di
             select(models.Episode).where(models.Episode.episode_url == data["episode_url"])
         ).scalar_one_or_none()
         if existing:
-            for k, v in data.items():
-                setattr(existing, k, v)
-            existing.updated_at = datetime.utcnow()  # type: ignore[assignment]
+            if assign_changed(existing, data):
+                existing.updated_at = datetime.utcnow()  # type: ignore[assignment]
             results.append(existing)
             continue
         ep = models.Episode(**data)
@@ -58,30 +189,250 @@ def upsert_episodes(session: Session, anime: models.Anime, episodes: Iterable[di
     return results
 
 
-def get_anime_list(session: Session, status: str | None, q: str | None, limit: int, offset: int) -> Tuple[List[models.Anime], int]:
+def bulk_upsert_episodes(
+    session: Session, anime_id: int, episodes: Iterable[dict], chunk_size: int = 500
+) -> Dict[str, int]:
+    rows_by_url: Dict[str, dict] = {}
+    for data in episodes:
+        url = data.get("episode_url")
+        if url:
+            rows_by_url[url] = {field: data.get(field) for field in EPISODE_FIELDS} | {"anime_id": anime_id}
+    urls = list(rows_by_url)
+
+    columns = [getattr(models.Episode, field) for field in EPISODE_FIELDS]
+    existing: Dict[str, dict] = {}
+    for chunk in chunked(urls, chunk_size):
+        stmt = select(models.Episode.id, *columns).where(models.Episode.episode_url.in_(chunk))
+        for row in session.execute(stmt).mappings():
+            existing[row["episode_url"]] = dict(row)
+
+    now = datetime.utcnow()
+    inserts: List[dict] = []
+    updates: List[dict] = []
+    for url, data in rows_by_url.items():
+        current = existing.get(url)
+        if current is None:
+            inserts.append({**data, "created_at": now, "updated_at": now})
+        elif any(current[field] != data[field] for field in EPISODE_FIELDS):
+            updates.append({**data, "id": current["id"], "updated_at": now})
+
+    for chunk in chunked(inserts, chunk_size):
+        session.execute(insert(models.Episode), list(chunk))
+    for chunk in chunked(updates, chunk_size):
+        session.execute(update(models.Episode), list(chunk))
+
+    ids_by_url = {url: row["id"] for url, row in existing.items()}
+    new_urls = [row["episode_url"] for row in inserts]
+    for chunk in chunked(new_urls, chunk_size):
+        stmt = select(models.Episode.episode_url, models.Episode.id).where(models.Episode.episode_url.in_(chunk))
+        ids_by_url.update({row[0]: row[1] for row in session.execute(stmt).all()})
+    return ids_by_url
+
+
+class TotalsCache:
+    def __init__(self, max_entries: int = TOTALS_CACHE_SIZE) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[tuple, Tuple[int, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple, version: int) -> Optional[int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def put(self, key: tuple, version: int, total: int) -> None:
+        with self._lock:
+            self._entries[key] = (version, total)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+def totals_cache_for(session: Session) -> TotalsCache:
+    bind = cast(Engine, session.get_bind())
+    with _totals_caches_lock:
+        cache = _totals_caches.get(bind)
+        if cache is None:
+            cache = TotalsCache()
+            _totals_caches[bind] = cache
+        return cache
+
+
+def table_version(session: Session, table_name: str) -> Optional[int]:
+    return session.execute(
+        select(models.TableVersion.version).where(models.TableVersion.table_name == table_name)
+    ).scalar_one_or_none()
+
+
+def count_rows(session: Session, stmt: Select) -> int:
+    return session.execute(select(func.count()).select_from(stmt.order_by(None).subquery())).scalar_one()
+
+
+def cached_total(session: Session, table_name: str, key: tuple, stmt: Select) -> int:
+    version = table_version(session, table_name)
+    if version is None:
+        return count_rows(session, stmt)
+    cache = totals_cache_for(session)
+    cache_key = (table_name, *key)
+    total = cache.get(cache_key, version)
+    if total is None:
+        total = count_rows(session, stmt)
+        cache.put(cache_key, version, total)
+    return total
+
+
+def anime_fts_enabled(session: Session) -> bool:
+    bind = cast(Engine, session.get_bind())
+    if bind.dialect.name != "sqlite":
+        return False
+    if bind in _anime_fts_engines:
+        return True
+    enabled = session.execute(
+        text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": ANIME_FTS_TABLE}
+    ).first() is not None
+    if enabled:
+        _anime_fts_engines[bind] = True
+    return enabled
+
+
+def fts_match_query(q: str) -> Optional[str]:
+    tokens = re.findall(r"\w+", q)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def encode_cursor(values: Sequence[object]) -> str:
+    raw = json.dumps(list(values), separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def decode_cursor(cursor: str, *value_types: Tuple[type, ...]) -> List[Any]:
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except ValueError as exc:
+        raise InvalidCursor("invalid cursor") from exc
+    expected = [*value_types, (int,)]
+    if (
+        not isinstance(values, list)
+        or len(values) != len(expected)
+        or any(isinstance(value, bool) or not isinstance(value, types) for value, types in zip(values, expected))
+    ):
+        raise InvalidCursor("invalid cursor")
+    return values
+
+
+def keyset_after(key: Any, id_column: Any, value: object, last_id: int, descending: bool = False) -> Any:
+    if descending:
+        if value is None:
+            return or_(key.is_not(None), and_(key.is_(None), id_column < last_id))
+        return or_(key < value, and_(key == value, id_column < last_id))
+    if value is None:
+        return and_(key.is_(None), id_column > last_id)
+    return or_(key > value, and_(key == value, id_column > last_id), key.is_(None))
+
+
+def page_rows(
+    rows: Sequence[Any], limit: int, cursor_values: Callable[[Any], Sequence[object]]
+) -> Tuple[List[Any], Optional[str]]:
+    if len(rows) <= limit:
+        return list(rows), None
+    rows = rows[:limit]
+    return list(rows), encode_cursor(cursor_values(rows[-1]))
+
+
+def get_anime_list(
+    session: Session,
+    status: str | None,
+    q: str | None,
+    limit: int,
+    offset: int,
+    with_total: bool = True,
+    after: str | None = None,
+) -> Tuple[List[models.Anime], Optional[int], Optional[str]]:
     stmt = select(models.Anime)
     if status:
         stmt = stmt.where(models.Anime.status_list_page == status)
-    if q:
+    match = fts_match_query(q) if q else None
+    sort_key: Any = models.Anime.title
+    sort_types: Tuple[type, ...] = (str,)
+    if match and anime_fts_enabled(session):
+        fts = table(ANIME_FTS_TABLE, column("rowid"))
+        stmt = stmt.join(fts, fts.c.rowid == models.Anime.id).where(
+            literal_column(ANIME_FTS_TABLE).op("MATCH")(match)
+        )
+        sort_key = func.bm25(literal_column(ANIME_FTS_TABLE), *ANIME_FTS_WEIGHTS)
+        sort_types = (float, int)
+    elif q:
         stmt = stmt.where(models.Anime.title.ilike(f"%{q}%"))
-    items = list(session.execute(stmt.offset(offset).limit(limit)).scalars().all())
-    total = len(session.execute(stmt.with_only_columns(models.Anime.id)).all())
-    return items, total
 
+    page = stmt.add_columns(sort_key)
+    if after:
+        value, last_id = decode_cursor(after, sort_types)
+        page = page.where(keyset_after(sort_key, models.Anime.id, value, last_id))
+    rows = session.execute(page.order_by(sort_key, models.Anime.id).offset(offset).limit(limit + 1)).all()
+    rows, next_cursor = page_rows(rows, limit, lambda row: (row[1], row[0].id))
+    items = [row[0] for row in rows]
+    if not with_total:
+        return items, None, next_cursor
+    total = cached_total(session, "anime", ("list", status, q), stmt.with_only_columns(models.Anime.id))
+    return items, total, next_cursor
+
+
+def get_anime_by_id(session: Session, anime_id: int, with_genres: bool = False) -> models.Anime | None:
+    options = [selectinload(models.Anime.genres)] if with_genres else []
+    return session.get(models.Anime, anime_id, options=options)
+
+
+def get_episodes_by_anime(
+    session: Session,
+    anime_id: int,
+    limit: int,
+    offset: int,
+    order: str,
+    with_total: bool = True,
+    after: str | None = None,
+) -> Tuple[List[models.Episode], Optional[int], Optional[str]]:
+    stmt = select(models.Episode).where(models.Episode.anime_id == anime_id)
+    descending = order != "asc"
+    page = stmt
+    if after:
+        value, last_id = decode_cursor(after, (int, type(None)))
+        page = page.where(keyset_after(models.Episode.episode_number, models.Episode.id, value, last_id, descending))
+    if descending:
+        page = page.order_by(models.Episode.episode_number.desc().nullsfirst(), models.Episode.id.desc())
+    else:
+        page = page.order_by(models.Episode.episode_number.asc().nullslast(), models.Episode.id.asc())
+    episodes = session.execute(page.offset(offset).limit(limit + 1)).scalars().all()
+    items, next_cursor = page_rows(episodes, limit, lambda episode: (episode.episode_number, episode.id))
+    if not with_total:
+        return items, None, next_cursor
+    total = cached_total(session, "episode", ("anime", anime_id), stmt.with_only_columns(models.Episode.id))
+    return items, total, next_cursor
 
-def get_anime_by_id(session: Session, anime_id: int) -> models.Anime | None:
-    return session.get(models.Anime, anime_id)
 
+def get_episode_ids_by_url(session: Session, anime_id: int) -> dict[str, int]:
+    rows = session.execute(
+        select(models.Episode.episode_url, models.Episode.id).where(models.Episode.anime_id == anime_id)
+    ).all()
+    return {row[0]: row[1] for row in rows if row[0]}
 
-def get_episodes_by_anime(session: Session, anime_id: int, limit: int, offset: int, order: str) -> Tuple[List[models.Episode], int]:
-    stmt = select(models.Episode).where(models.Episode.anime_id == anime_id)
-    if order == "asc":
-        stmt = stmt.order_by(models.Episode.episode_number.asc().nullslast())
-    else:
-        stmt = stmt.order_by(models.Episode.episode_number.desc().nullsfirst())
-    items = list(session.execute(stmt.offset(offset).limit(limit)).scalars().all())
-    total = len(session.execute(stmt.with_only_columns(models.Episode.id)).all())
-    return items, total
+
+def get_episode_ids_for_urls(session: Session, episode_urls: Sequence[str], chunk_size: int = 500) -> dict[str, int]:
+    ids: dict[str, int] = {}
+    for chunk in chunked(list(episode_urls), chunk_size):
+        rows = session.execute(
+            select(models.Episode.episode_url, models.Episode.id).where(models.Episode.episode_url.in_(chunk))
+        ).all()
+        ids.update({row[0]: row[1] for row in rows})
+    return ids
 
 
 def get_episode_urls_by_anime(session: Session, anime_id: int) -> set[str]:
@@ -106,21 +457,190 @@ def upsert_episode_mirror(session: Session, episode_id: int, mirror_data: dict)
             models.EpisodeMirror.provider_name == mirror_data["provider_name"],
         )
         existing = session.execute(stmt).scalar_one_or_none()
+    mirror_data, raw = split_mirror_raw(mirror_data)
     if existing:
         for k, v in mirror_data.items():
             setattr(existing, k, v)
         existing.updated_at = datetime.utcnow()  # type: ignore[assignment]
-        return existing
-
-    mirror = models.EpisodeMirror(**mirror_data, episode_id=episode_id)
-    session.add(mirror)
+        mirror = existing
+    else:
+        mirror = models.EpisodeMirror(**mirror_data, episode_id=episode_id)
+        session.add(mirror)
+    if raw is not None:
+        session.flush()
+        store_episode_mirror_raw(session, {cast(int, mirror.id): raw})
     return mirror
 
 
+def pack_raw_text(value: Optional[str]) -> Optional[bytes]:
+    if value is None:
+        return None
+    return zlib.compress(value.encode("utf-8"))
+
+
+def unpack_raw_text(value: Optional[bytes]) -> Optional[str]:
+    if value is None:
+        return None
+    return zlib.decompress(value).decode("utf-8")
+
+
+def split_mirror_raw(mirror_data: dict) -> Tuple[dict, Optional[dict]]:
+    if not any(k in mirror_data for k in MIRROR_RAW_FIELDS):
+        return mirror_data, None
+    hot = {k: v for k, v in mirror_data.items() if k not in MIRROR_RAW_FIELDS}
+    raw = {k: mirror_data[k] for k in MIRROR_RAW_FIELDS if k in mirror_data}
+    return hot, raw
+
+
+def store_episode_mirror_raw(session: Session, raw_by_mirror_id: Dict[int, dict], chunk_size: int = 500) -> None:
+    mirror_ids = list(raw_by_mirror_id)
+    for chunk in chunked(mirror_ids, chunk_size):
+        session.execute(
+            delete(models.EpisodeMirrorRaw).where(models.EpisodeMirrorRaw.episode_mirror_id.in_(chunk))
+        )
+    now = datetime.utcnow()
+    rows = [
+        {
+            "episode_mirror_id": mirror_id,
+            "data_content": pack_raw_text(raw.get("raw_data_content")),
+            "embed_html": pack_raw_text(raw.get("raw_embed_html")),
+            "nonce": raw.get("nonce"),
+            "updated_at": now,
+        }
+        for mirror_id, raw in raw_by_mirror_id.items()
+        if any(value is not None for value in raw.values())
+    ]
+    for chunk in chunked(rows, chunk_size):
+        session.execute(insert(models.EpisodeMirrorRaw), list(chunk))
+
+
+def get_episode_mirror_raw(session: Session, mirror_id: int) -> Optional[dict]:
+    row = session.get(models.EpisodeMirrorRaw, mirror_id)
+    if row is None:
+        return None
+    return {
+        "raw_data_content": unpack_raw_text(row.data_content),
+        "raw_embed_html": unpack_raw_text(row.embed_html),
+        "nonce": row.nonce,
+    }
+
+
+def _mirror_payload_key(episode_id: int, data: dict) -> tuple:
+    return (episode_id, data.get("mirror_id"), data.get("mirror_i"), data.get("mirror_q"))
+
+
+def _mirror_display_key(episode_id: int, data: dict) -> tuple:
+    return (episode_id, data.get("quality"), data.get("provider_name"))
+
+
+def mirror_keys(episode_id: int, data: dict) -> Tuple[tuple, tuple]:
+    return _mirror_payload_key(episode_id, data), _mirror_display_key(episode_id, data)
+
+
+def get_mirror_scraped_at(
+    session: Session, episode_ids: Iterable[int], chunk_size: int = 500
+) -> Dict[tuple, datetime]:
+    scraped_at: Dict[tuple, datetime] = {}
+    for chunk in chunked(list(episode_ids), chunk_size):
+        stmt = select(
+            models.EpisodeMirror.episode_id,
+            models.EpisodeMirror.mirror_id,
+            models.EpisodeMirror.mirror_i,
+            models.EpisodeMirror.mirror_q,
+            models.EpisodeMirror.quality,
+            models.EpisodeMirror.provider_name,
+            models.EpisodeMirror.last_scraped_at,
+        ).where(models.EpisodeMirror.episode_id.in_(chunk))
+        for row in session.execute(stmt).mappings():
+            for key in mirror_keys(row["episode_id"], row):
+                if key not in scraped_at or scraped_at[key] < row["last_scraped_at"]:
+                    scraped_at[key] = row["last_scraped_at"]
+    return scraped_at
+
+
+def bulk_upsert_episode_mirrors(
+    session: Session, mirrors_by_episode: Dict[int, List[dict]], chunk_size: int = 500
+) -> int:
+    episode_ids = [ep_id for ep_id, mirrors in mirrors_by_episode.items() if mirrors]
+    if not episode_ids:
+        return 0
+
+    by_payload: Dict[tuple, dict] = {}
+    by_display: Dict[tuple, dict] = {}
+    for chunk in chunked(episode_ids, chunk_size):
+        stmt = select(
+            models.EpisodeMirror.id,
+            models.EpisodeMirror.episode_id,
+            models.EpisodeMirror.mirror_id,
+            models.EpisodeMirror.mirror_i,
+            models.EpisodeMirror.mirror_q,
+            models.EpisodeMirror.quality,
+            models.EpisodeMirror.provider_name,
+        ).where(models.EpisodeMirror.episode_id.in_(chunk))
+        for row in session.execute(stmt).mappings():
+            target = {"id": row["id"]}
+            by_payload[_mirror_payload_key(row["episode_id"], row)] = target
+            by_display[_mirror_display_key(row["episode_id"], row)] = target
+
+    now = datetime.utcnow()
+    writes: List[dict] = []
+    raw_targets: List[Tuple[dict, dict]] = []
+    for episode_id in episode_ids:
+        for data in mirrors_by_episode[episode_id]:
+            data, raw = split_mirror_raw(data)
+            payload_key = _mirror_payload_key(episode_id, data)
+            display_key = _mirror_display_key(episode_id, data)
+            target = by_payload.get(payload_key) or by_display.get(display_key)
+            if target is None:
+                target = {"created_at": now}
+                writes.append(target)
+            elif len(target) == 1:
+                writes.append(target)
+            target.update(data)
+            target["episode_id"] = episode_id
+            target["updated_at"] = now
+            by_payload[payload_key] = target
+            by_display[display_key] = target
+            if raw is not None:
+                raw_targets.append((target, raw))
+
+    groups: Dict[Tuple[bool, frozenset], List[dict]] = {}
+    for row in writes:
+        groups.setdefault(("id" in row, frozenset(row)), []).append(row)
+    for (is_update, _), rows in groups.items():
+        stmt = update(models.EpisodeMirror) if is_update else insert(models.EpisodeMirror)
+        for chunk in chunked(rows, chunk_size):
+            session.execute(stmt, list(chunk))
+
+    if raw_targets:
+        inserted_ids: Dict[tuple, int] = {}
+        if any("id" not in target for target, _ in raw_targets):
+            for chunk in chunked(episode_ids, chunk_size):
+                stmt = select(
+                    models.EpisodeMirror.id,
+                    models.EpisodeMirror.episode_id,
+                    models.EpisodeMirror.mirror_id,
+                    models.EpisodeMirror.mirror_i,
+                    models.EpisodeMirror.mirror_q,
+                ).where(models.EpisodeMirror.episode_id.in_(chunk))
+                for row in session.execute(stmt).mappings():
+                    inserted_ids[_mirror_payload_key(row["episode_id"], row)] = row["id"]
+        raw_by_mirror_id: Dict[int, dict] = {}
+        for target, raw in raw_targets:
+            mirror_id = target.get("id") or inserted_ids[_mirror_payload_key(target["episode_id"], target)]
+            raw_by_mirror_id[mirror_id] = raw
+        store_episode_mirror_raw(session, raw_by_mirror_id, chunk_size)
+    return len(writes)
+
+
 def get_episode_ids_with_incomplete_mirrors(session: Session, anime_id: int) -> List[int]:
-    success_exists = exists().where(
-        (models.EpisodeMirror.episode_id == models.Episode.id)
-        & (models.EpisodeMirror.fetch_status == "success")
+    success_exists = (
+        exists()
+        .where(
+            (models.EpisodeMirror.episode_id == models.Episode.id)
+            & (models.EpisodeMirror.fetch_status == "success")
+        )
+        .correlate(models.Episode)
     )
     stmt = (
         select(models.Episode.id)
@@ -177,14 +697,272 @@ def is_anime_fully_mirrored(session: Session, anime_id: int) -> bool:
     return episode_count == mirrored_episode_count == total_episode
 
 
+def get_anime_scrape_states(
+    session: Session, source_urls: Optional[Sequence[str]] = None, chunk_size: int = 500
+) -> Dict[str, dict]:
+    stmt = select(
+        models.Anime.id,
+        models.Anime.source_url,
+        models.Anime.title,
+        models.Anime.status_list_page,
+        models.Anime.status_detail,
+        models.Anime.last_scraped_at,
+    )
+    if source_urls is None:
+        statements = [stmt]
+    else:
+        statements = [stmt.where(models.Anime.source_url.in_(chunk)) for chunk in chunked(list(source_urls), chunk_size)]
+    states: Dict[str, dict] = {}
+    for chunk_stmt in statements:
+        for row in session.execute(chunk_stmt):
+            states[row.source_url] = {
+                "anime_id": row.id,
+                "source_url": row.source_url,
+                "title": row.title,
+                "status_list_page": row.status_list_page,
+                "status_detail": row.status_detail,
+                "last_scraped_at": row.last_scraped_at,
+            }
+    return states
+
+
+def update_anime_rows(session: Session, rows: List[dict]) -> None:
+    if rows:
+        session.execute(update(models.Anime), rows)
+
+
+def get_fully_mirrored_anime_ids(session: Session, anime_ids: Iterable[int], chunk_size: int = 500) -> set[int]:
+    fully_mirrored: set[int] = set()
+    for chunk in chunked(list(anime_ids), chunk_size):
+        rows = session.execute(
+            select(
+                models.Anime.id,
+                models.Anime.total_episode,
+                func.count(func.distinct(models.Episode.id)),
+                func.count(func.distinct(models.EpisodeMirror.episode_id)),
+            )
+            .join(models.Episode, models.Episode.anime_id == models.Anime.id)
+            .outerjoin(models.EpisodeMirror, models.Episode.id == models.EpisodeMirror.episode_id)
+            .where(models.Anime.id.in_(chunk))
+            .group_by(models.Anime.id, models.Anime.total_episode)
+        )
+        for anime_id, total_episode_raw, episode_count, mirrored_episode_count in rows:
+            total_episode = _parse_total_episode(total_episode_raw)
+            if total_episode and episode_count == mirrored_episode_count == total_episode:
+                fully_mirrored.add(anime_id)
+    return fully_mirrored
+
+
+def get_episode_first_seen(session: Session, anime_ids: Iterable[int], chunk_size: int = 500) -> Dict[int, List[datetime]]:
+    first_seen: Dict[int, List[datetime]] = {}
+    for chunk in chunked(list(anime_ids), chunk_size):
+        rows = session.execute(
+            select(models.Episode.anime_id, models.Episode.created_at).where(models.Episode.anime_id.in_(chunk))
+        )
+        for anime_id, created_at in rows:
+            first_seen.setdefault(anime_id, []).append(created_at)
+    return first_seen
+
 
 
-def get_episode_mirrors(session: Session, episode_id: int, quality: str | None, provider: str | None, limit: int, offset: int) -> Tuple[List[models.EpisodeMirror], int]:
+
+def get_episode_mirrors(
+    session: Session,
+    episode_id: int,
+    quality: str | None,
+    provider: str | None,
+    limit: int,
+    offset: int,
+    with_total: bool = True,
+    after: str | None = None,
+) -> Tuple[List[models.EpisodeMirror], Optional[int], Optional[str]]:
     stmt = select(models.EpisodeMirror).where(models.EpisodeMirror.episode_id == episode_id)
     if quality:
         stmt = stmt.where(models.EpisodeMirror.quality == quality)
     if provider:
         stmt = stmt.where(models.EpisodeMirror.provider_name == provider)
-    items = list(session.execute(stmt.offset(offset).limit(limit)).scalars().all())
-    total = len(session.execute(stmt.with_only_columns(models.EpisodeMirror.id)).all())
-    return items, total
+    page = stmt
+    if after:
+        (last_id,) = decode_cursor(after)
+        page = page.where(models.EpisodeMirror.id > last_id)
+    mirrors = session.execute(
+        page.order_by(models.EpisodeMirror.id).offset(offset).limit(limit + 1)
+    ).scalars().all()
+    items, next_cursor = page_rows(mirrors, limit, lambda mirror: (mirror.id,))
+    if not with_total:
+        return items, None, next_cursor
+    total = cached_total(
+        session,
+        "episode_mirror",
+        ("episode", episode_id, quality, provider),
+        stmt.with_only_columns(models.EpisodeMirror.id),
+    )
+    return items, total, next_cursor
+
+
+def has_unfinished_crawl_jobs(session: Session) -> bool:
+    return bool(
+        session.execute(
+            select(exists().where(models.CrawlJob.state.in_(("pending", "leased"))))
+        ).scalar()
+    )
+
+
+def has_live_crawl_leases(session: Session) -> bool:
+    live = and_(models.CrawlJob.state == "leased", models.CrawlJob.lease_expires_at >= datetime.utcnow())
+    return bool(session.execute(select(exists().where(live))).scalar())
+
+
+def clear_crawl_jobs(session: Session) -> None:
+    session.execute(delete(models.CrawlJob))
+
+
+def prune_crawl_jobs(session: Session, kind: str, states: Sequence[str] = ("done", "failed")) -> None:
+    session.execute(
+        delete(models.CrawlJob).where(models.CrawlJob.kind == kind, models.CrawlJob.state.in_(list(states)))
+    )
+
+
+def enqueue_crawl_jobs(session: Session, kind: str, jobs: Iterable[Tuple[str, dict]]) -> List[models.CrawlJob]:
+    jobs_by_key = {key: payload for key, payload in jobs if key}
+    if not jobs_by_key:
+        return []
+    existing = {
+        job.job_key: job
+        for job in session.execute(
+            select(models.CrawlJob).where(
+                models.CrawlJob.kind == kind,
+                models.CrawlJob.job_key.in_(list(jobs_by_key)),
+            )
+        ).scalars()
+    }
+    results: List[models.CrawlJob] = []
+    for key, payload in jobs_by_key.items():
+        job = existing.get(key)
+        if job is None:
+            job = models.CrawlJob(kind=kind, job_key=key, payload=json.dumps(payload), state="pending")
+            session.add(job)
+        results.append(job)
+    return results
+
+
+def get_pending_crawl_jobs(session: Session, kind: str) -> List[models.CrawlJob]:
+    stmt = (
+        select(models.CrawlJob)
+        .where(models.CrawlJob.kind == kind, models.CrawlJob.state == "pending")
+        .order_by(models.CrawlJob.id)
+    )
+    return list(session.execute(stmt).scalars().all())
+
+
+def crawl_job_payload(job: models.CrawlJob) -> dict:
+    return json.loads(cast(str, job.payload)) if job.payload else {}
+
+
+def mark_crawl_job(
+    session: Session, kind: str, job_key: str, state: str, error_message: Optional[str] = None
+) -> None:
+    job = session.execute(
+        select(models.CrawlJob).where(models.CrawlJob.kind == kind, models.CrawlJob.job_key == job_key)
+    ).scalar_one_or_none()
+    if not job:
+        return
+    job.state = state  # type: ignore[assignment]
+    job.error_message = error_message  # type: ignore[assignment]
+    job.attempts = (job.attempts or 0) + 1  # type: ignore[assignment]
+    job.updated_at = datetime.utcnow()  # type: ignore[assignment]
+
+
+def mark_crawl_jobs(
+    session: Session, kind: str, job_keys: Sequence[str], state: str, chunk_size: int = 500
+) -> None:
+    now = datetime.utcnow()
+    for chunk in chunked(list(job_keys), chunk_size):
+        session.execute(
+            update(models.CrawlJob)
+            .where(models.CrawlJob.kind == kind, models.CrawlJob.job_key.in_(chunk))
+            .values(state=state, error_message=None, attempts=models.CrawlJob.attempts + 1, updated_at=now)
+            .execution_options(synchronize_session=False)
+        )
+
+
+def reset_crawl_leases(session: Session) -> None:
+    session.execute(
+        update(models.CrawlJob)
+        .where(
+            models.CrawlJob.state == "leased",
+            or_(models.CrawlJob.lease_expires_at.is_(None), models.CrawlJob.lease_expires_at < datetime.utcnow()),
+        )
+        .values(state="pending", lease_owner=None, lease_expires_at=None)
+    )
+
+
+def claim_crawl_jobs(
+    session: Session, kind: str, worker_id: str, limit: int, lease_seconds: int
+) -> List[Tuple[int, str, dict]]:
+    if limit <= 0:
+        return []
+    now = datetime.utcnow()
+    claimable = or_(
+        models.CrawlJob.state == "pending",
+        and_(models.CrawlJob.state == "leased", models.CrawlJob.lease_expires_at < now),
+    )
+    candidates = (
+        select(models.CrawlJob.id)
+        .where(models.CrawlJob.kind == kind, claimable)
+        .order_by(models.CrawlJob.id)
+        .limit(limit)
+    )
+    stmt = (
+        update(models.CrawlJob)
+        .where(models.CrawlJob.id.in_(candidates), claimable)
+        .values(
+            state="leased",
+            lease_owner=worker_id,
+            lease_expires_at=now + timedelta(seconds=lease_seconds),
+            updated_at=now,
+        )
+        .returning(models.CrawlJob.id, models.CrawlJob.job_key, models.CrawlJob.payload)
+        .execution_options(synchronize_session=False)
+    )
+    rows = session.execute(stmt).all()
+    return sorted((row.id, row.job_key, json.loads(row.payload) if row.payload else {}) for row in rows)
+
+
+def renew_crawl_leases(session: Session, worker_id: str, job_ids: Sequence[int], lease_seconds: int) -> int:
+    if not job_ids:
+        return 0
+    result = session.execute(
+        update(models.CrawlJob)
+        .where(
+            models.CrawlJob.id.in_(list(job_ids)),
+            models.CrawlJob.state == "leased",
+            models.CrawlJob.lease_owner == worker_id,
+        )
+        .values(lease_expires_at=datetime.utcnow() + timedelta(seconds=lease_seconds))
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount or 0
+
+
+def complete_crawl_job(
+    session: Session, job_id: int, worker_id: str, state: str, error_message: Optional[str] = None
+) -> bool:
+    result = session.execute(
+        update(models.CrawlJob)
+        .where(
+            models.CrawlJob.id == job_id,
+            models.CrawlJob.state == "leased",
+            models.CrawlJob.lease_owner == worker_id,
+        )
+        .values(
+            state=state,
+            error_message=error_message,
+            attempts=models.CrawlJob.attempts + 1,
+            lease_owner=None,
+            lease_expires_at=None,
+            updated_at=datetime.utcnow(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount == 1
@@ -0,0 +1,150 @@
+import logging
+
+from sqlalchemy import inspect, insert, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import OperationalError
+
+from app.db import models
+from app.db.repository import ANIME_FTS_COLUMNS, ANIME_FTS_TABLE, MIRROR_RAW_FIELDS, VERSIONED_TABLES, pack_raw_text
+from app.db.session import Base
+
+
+logger = logging.getLogger(__name__)
+
+ANIME_FTS_TRIGGERS = {
+    f"{ANIME_FTS_TABLE}_ai": "AFTER INSERT ON anime BEGIN {insert_new}; END",
+    f"{ANIME_FTS_TABLE}_ad": "AFTER DELETE ON anime BEGIN {delete_old}; END",
+    f"{ANIME_FTS_TABLE}_au": "AFTER UPDATE OF {columns} ON anime BEGIN {delete_old}; {insert_new}; END",
+}
+
+
+def add_missing_columns(engine: Engine) -> None:
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {col["name"] for col in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing or not column.nullable:
+                    continue
+                col_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(text(f'ALTER TABLE "{table.name}" ADD COLUMN "{column.name}" {col_type}'))
+
+
+def add_missing_indexes(engine: Engine) -> None:
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {index["name"] for index in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+
+
+def move_legacy_mirror_raw(engine: Engine, chunk_size: int = 500) -> None:
+    inspector = inspect(engine)
+    if not inspector.has_table("episode_mirror"):
+        return
+    existing = {col["name"] for col in inspector.get_columns("episode_mirror")}
+    legacy = [name for name in MIRROR_RAW_FIELDS if name in existing]
+    if not legacy:
+        return
+
+    columns = ", ".join(f'"{name}"' for name in legacy)
+    has_raw = " OR ".join(f'"{name}" IS NOT NULL' for name in legacy)
+    with engine.begin() as conn:
+        last_id = 0
+        while True:
+            rows = conn.execute(
+                text(
+                    f'SELECT id, {columns} FROM "episode_mirror" WHERE id > :last_id AND ({has_raw}) '
+                    "ORDER BY id LIMIT :limit"
+                ),
+                {"last_id": last_id, "limit": chunk_size},
+            ).mappings().all()
+            if not rows:
+                break
+            conn.execute(
+                insert(models.EpisodeMirrorRaw),
+                [
+                    {
+                        "episode_mirror_id": row["id"],
+                        "data_content": pack_raw_text(row.get("raw_data_content")),
+                        "embed_html": pack_raw_text(row.get("raw_embed_html")),
+                        "nonce": row.get("nonce"),
+                    }
+                    for row in rows
+                ],
+            )
+            last_id = rows[-1]["id"]
+        for name in legacy:
+            conn.execute(text(f'ALTER TABLE "episode_mirror" DROP COLUMN "{name}"'))
+
+
+def sync_anime_fts(engine: Engine) -> bool:
+    if engine.dialect.name != "sqlite":
+        return False
+    columns = ", ".join(ANIME_FTS_COLUMNS)
+    statements = {
+        "columns": columns,
+        "insert_new": f"INSERT INTO {ANIME_FTS_TABLE}(rowid, {columns}) VALUES "
+        f"(new.id, {', '.join(f'new.{name}' for name in ANIME_FTS_COLUMNS)})",
+        "delete_old": f"INSERT INTO {ANIME_FTS_TABLE}({ANIME_FTS_TABLE}, rowid, {columns}) VALUES "
+        f"('delete', old.id, {', '.join(f'old.{name}' for name in ANIME_FTS_COLUMNS)})",
+    }
+    with engine.begin() as conn:
+        existing = set(
+            conn.execute(
+                text("SELECT name FROM sqlite_master WHERE name = :table OR (tbl_name = 'anime' AND type = 'trigger')"),
+                {"table": ANIME_FTS_TABLE},
+            ).scalars()
+        )
+        if existing >= {ANIME_FTS_TABLE, *ANIME_FTS_TRIGGERS}:
+            return True
+        try:
+            conn.execute(
+                text(
+                    f"CREATE VIRTUAL TABLE IF NOT EXISTS {ANIME_FTS_TABLE} USING fts5({columns}, "
+                    "content='anime', content_rowid='id', tokenize='unicode61 remove_diacritics 2')"
+                )
+            )
+        except OperationalError as exc:
+            logger.warning("fts5 unavailable, anime search falls back to LIKE", extra={"error": str(exc)})
+            return False
+        for name, body in ANIME_FTS_TRIGGERS.items():
+            conn.execute(text(f"CREATE TRIGGER IF NOT EXISTS {name} {body.format(**statements)}"))
+        conn.execute(text(f"INSERT INTO {ANIME_FTS_TABLE}({ANIME_FTS_TABLE}) VALUES ('rebuild')"))
+    return True
+
+
+def sync_table_versions(engine: Engine) -> bool:
+    if engine.dialect.name != "sqlite":
+        return False
+    with engine.begin() as conn:
+        for table_name, columns in VERSIONED_TABLES.items():
+            conn.execute(
+                text("INSERT OR IGNORE INTO table_version (table_name, version) VALUES (:name, 0)"),
+                {"name": table_name},
+            )
+            bump = f"UPDATE table_version SET version = version + 1 WHERE table_name = '{table_name}'"
+            events = {
+                "vi": "AFTER INSERT",
+                "vd": "AFTER DELETE",
+                "vu": f"AFTER UPDATE OF {', '.join(columns)}",
+            }
+            for suffix, event in events.items():
+                conn.execute(
+                    text(f"CREATE TRIGGER IF NOT EXISTS {table_name}_{suffix} {event} ON {table_name} BEGIN {bump}; END")
+                )
+    return True
+
+
+def sync_schema(engine: Engine) -> None:
+    Base.metadata.create_all(bind=engine)
+    move_legacy_mirror_raw(engine)
+    add_missing_columns(engine)
+    add_missing_indexes(engine)
+    sync_anime_fts(engine)
+    sync_table_versions(engine)
@@ -1,11 +1,81 @@
-from sqlalchemy import create_engine
+from typing import Any, List, Tuple
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.pool import QueuePool
 
 from app.core.config import get_settings
 
 
 settings = get_settings()
 
-engine = create_engine(settings.db_url, connect_args={"check_same_thread": False})
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_db_url(db_url: str) -> str:
+    url = make_url(db_url)
+    return url.set(drivername=ASYNC_DRIVERS.get(url.drivername, url.drivername)).render_as_string(
+        hide_password=False
+    )
+
+
+def sqlite_pragmas(read_only: bool = False) -> List[Tuple[str, Any]]:
+    pragmas: List[Tuple[str, Any]] = [("busy_timeout", settings.sqlite_busy_timeout_ms)]
+    if settings.sqlite_journal_mode and not read_only:
+        pragmas.append(("journal_mode", settings.sqlite_journal_mode))
+    if settings.sqlite_synchronous:
+        pragmas.append(("synchronous", settings.sqlite_synchronous))
+    pragmas.append(("mmap_size", settings.sqlite_mmap_size))
+    pragmas.append(("cache_size", settings.sqlite_cache_size))
+    if settings.sqlite_temp_store:
+        pragmas.append(("temp_store", settings.sqlite_temp_store))
+    if read_only:
+        pragmas.append(("query_only", "on"))
+    return pragmas
+
+
+def apply_sqlite_pragmas(engine: Engine | AsyncEngine, read_only: bool = False) -> None:
+    sync_engine = engine.sync_engine if isinstance(engine, AsyncEngine) else engine
+    if sync_engine.dialect.name != "sqlite":
+        return
+    pragmas = sqlite_pragmas(read_only)
+
+    @event.listens_for(sync_engine, "connect")
+    def set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas:
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def create_db_engine(db_url: str) -> Engine:
+    engine = create_engine(db_url, connect_args={"check_same_thread": False})
+    apply_sqlite_pragmas(engine)
+    return engine
+
+
+def pool_size_options(db_url: str, pool_size: int) -> dict:
+    url = make_url(db_url)
+    if not issubclass(url.get_dialect().get_pool_class(url), QueuePool):
+        return {}
+    return {"pool_size": pool_size}
+
+
+def create_async_db_engine(db_url: str, read_only: bool = False, **kwargs: Any) -> AsyncEngine:
+    engine = create_async_engine(db_url, **kwargs)
+    apply_sqlite_pragmas(engine, read_only)
+    return engine
+
+
+engine = create_db_engine(settings.db_url)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+async_engine = create_async_db_engine(settings.async_db_url or async_db_url(settings.db_url))
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+read_db_url = settings.async_db_url or async_db_url(settings.db_url)
+read_engine = create_async_db_engine(
+    read_db_url, read_only=True, **pool_size_options(read_db_url, settings.db_read_pool_size)
+)
+ReadSessionLocal = async_sessionmaker(read_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
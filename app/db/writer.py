@@ -0,0 +1,137 @@
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.metrics import metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+WriteOp = Callable[[Session], Any]
+
+
+class DbWriter:
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        batch_size: int,
+        flush_interval: float,
+        queue_size: int,
+    ) -> None:
+        self.session_factory = session_factory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = max(0.0, flush_interval)
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=max(1, queue_size))
+        self._task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "DbWriter":
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        await self.close()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is None:
+            return
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+
+    async def enqueue(self, op: WriteOp) -> asyncio.Future:
+        fut = asyncio.get_running_loop().create_future()
+        await self._queue.put((op, fut))
+        return fut
+
+    async def submit(self, op: WriteOp) -> Any:
+        return await (await self.enqueue(op))
+
+    async def _next_batch(self) -> Tuple[List[Tuple[WriteOp, asyncio.Future]], bool]:
+        first = await self._queue.get()
+        if first is None:
+            return [], True
+        batch = [first]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.flush_interval
+        while len(batch) < self.batch_size:
+            try:
+                entry = self._queue.get_nowait()
+            except asyncio.QueueEmpty:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    entry = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            if entry is None:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    async def _run(self) -> None:
+        closing = False
+        while not closing:
+            batch, closing = await self._next_batch()
+            if batch:
+                await self._apply(batch)
+
+    async def _execute(self, ops: List[WriteOp]) -> List[Any]:
+        with metrics.time("scraper_db_write_seconds"):
+            async with self.session_factory() as session:
+                try:
+                    results = await session.run_sync(_run_ops, ops)
+                    with metrics.time("scraper_db_commit_seconds"):
+                        await session.commit()
+                except Exception:
+                    await session.rollback()
+                    metrics.inc("scraper_db_batches_total", result="failed")
+                    raise
+        metrics.inc("scraper_db_batches_total", result="committed")
+        metrics.inc("scraper_db_ops_total", len(ops))
+        return results
+
+    async def _apply(self, batch: List[Tuple[WriteOp, asyncio.Future]]) -> None:
+        try:
+            results = await self._execute([op for op, _ in batch])
+        except Exception as exc:  # noqa: BLE001
+            if len(batch) == 1:
+                _set_exception(batch[0][1], exc)
+                return
+            logger.warning("write batch failed, retrying ops one by one", extra={"size": len(batch), "error": str(exc)})
+            for op, fut in batch:
+                try:
+                    result = (await self._execute([op]))[0]
+                except Exception as op_exc:  # noqa: BLE001
+                    _set_exception(fut, op_exc)
+                else:
+                    _set_result(fut, result)
+            return
+        for (_, fut), result in zip(batch, results):
+            _set_result(fut, result)
+
+
+def _run_ops(session: Session, ops: List[WriteOp]) -> List[Any]:
+    results = []
+    for op in ops:
+        results.append(op(session))
+        session.flush()
+    return results
+
+
+def _set_result(fut: asyncio.Future, result: Any) -> None:
+    if not fut.done():
+        fut.set_result(result)
+
+
+def _set_exception(fut: asyncio.Future, exc: BaseException) -> None:
+    if not fut.done():
+        fut.set_exception(exc)
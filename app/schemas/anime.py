@@ -67,9 +67,11 @@ class AnimeDetail(AnimeBase):
 
 class AnimeListResponse(BaseModel):
     items: List[AnimeBase]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
 
 
 class EpisodeListResponse(BaseModel):
     items: List[EpisodeOut]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
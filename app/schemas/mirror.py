@@ -19,4 +19,5 @@ class EpisodeMirrorOut(BaseModel):
 
 class EpisodeMirrorListResponse(BaseModel):
     items: List[EpisodeMirrorOut]
-    total: int
+    total: Optional[int] = None
+    next_cursor: Optional[str] = None
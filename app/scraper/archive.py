@@ -0,0 +1,97 @@
+import gzip
+import hashlib
+import json
+import os
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+from urllib.parse import urlencode
+
+from app.core.config import get_settings
+
+
+settings = get_settings()
+
+VOLATILE_FORM_FIELDS = {"nonce"}
+
+
+def archive_key(url: str, data: Optional[dict] = None) -> str:
+    if not data:
+        return url
+    form = sorted((str(k), str(v)) for k, v in data.items() if k not in VOLATILE_FORM_FIELDS)
+    return f"{url}#{urlencode(form)}"
+
+
+class PageArchive:
+    def __init__(self, directory: str | Path, compresslevel: int = 6) -> None:
+        self.directory = Path(directory)
+        self.compresslevel = compresslevel
+        (self.directory / "objects").mkdir(parents=True, exist_ok=True)
+        self.index_path = self.directory / "index.jsonl"
+        self._latest: Optional[Dict[str, dict]] = None
+
+    def _object_path(self, digest: str) -> Path:
+        return self.directory / "objects" / digest[:2] / f"{digest}.gz"
+
+    def entries(self) -> Dict[str, dict]:
+        if self._latest is None:
+            latest: Dict[str, dict] = {}
+            if self.index_path.exists():
+                with open(self.index_path, encoding="utf-8") as fh:
+                    for line in fh:
+                        try:
+                            entry = json.loads(line)
+                        except ValueError:
+                            continue
+                        current = latest.get(entry["key"])
+                        if current is None or entry["fetched_at"] >= current["fetched_at"]:
+                            latest[entry["key"]] = entry
+            self._latest = latest
+        return self._latest
+
+    def latest(self, key: str) -> Optional[dict]:
+        return self.entries().get(key)
+
+    def store(
+        self,
+        key: str,
+        url: str,
+        body: bytes,
+        content_type: Optional[str] = None,
+        fetched_at: Optional[datetime] = None,
+    ) -> str:
+        digest = hashlib.sha256(body).hexdigest()
+        path = self._object_path(digest)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(gzip.compress(body, compresslevel=self.compresslevel))
+            os.replace(tmp_path, path)
+
+        entry = {
+            "key": key,
+            "url": url,
+            "fetched_at": (fetched_at or datetime.utcnow()).isoformat(),
+            "sha256": digest,
+            "size": len(body),
+            "content_type": content_type,
+        }
+        with open(self.index_path, "a", encoding="utf-8") as fh:
+            fh.write(json.dumps(entry) + "\n")
+        self.entries()[key] = entry
+        return digest
+
+    def read(self, digest: str) -> bytes:
+        return gzip.decompress(self._object_path(digest).read_bytes())
+
+    def read_latest(self, key: str) -> Optional[tuple[bytes, datetime]]:
+        entry = self.latest(key)
+        if entry is None:
+            return None
+        return self.read(entry["sha256"]), datetime.fromisoformat(entry["fetched_at"])
+
+
+def default_archive() -> Optional[PageArchive]:
+    if not settings.scraper_archive:
+        return None
+    return PageArchive(settings.scraper_archive_dir)
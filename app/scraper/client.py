@@ -1,22 +1,182 @@
 import asyncio
+import hashlib
+import json
+import os
 import random
-from typing import Any
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
 
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
+from tenacity import RetryCallState, retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 from app.core.config import get_settings
+from app.core.metrics import metrics
+from app.scraper.archive import PageArchive, archive_key, default_archive
+from app.scraper.ratelimit import AdaptiveRateLimiter, RateLimiterRegistry, endpoint_class, parse_retry_after
 
 
 settings = get_settings()
 
 
+class HttpCache:
+    def __init__(self, directory: str | Path, max_bytes: int) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._entries: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._load_index()
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _key(self, url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _body_path(self, key: str) -> Path:
+        return self.directory / f"{key}.body"
+
+    def _meta_path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def _load_index(self) -> None:
+        metas = sorted(self.directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        for meta_path in metas:
+            key = meta_path.stem
+            body_path = self._body_path(key)
+            if not body_path.exists():
+                meta_path.unlink(missing_ok=True)
+                continue
+            size = body_path.stat().st_size
+            self._entries[key] = size
+            self._total_bytes += size
+        self._evict()
+
+    def _drop(self, key: str) -> None:
+        size = self._entries.pop(key, None)
+        if size is not None:
+            self._total_bytes -= size
+        self._body_path(key).unlink(missing_ok=True)
+        self._meta_path(key).unlink(missing_ok=True)
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._drop(key)
+
+    def lookup(self, url: str) -> Optional[dict]:
+        key = self._key(url)
+        if key not in self._entries:
+            return None
+        try:
+            return json.loads(self._meta_path(key).read_text("utf-8"))
+        except (OSError, ValueError):
+            self._drop(key)
+            return None
+
+    def read_body(self, url: str) -> Optional[bytes]:
+        key = self._key(url)
+        if key not in self._entries:
+            return None
+        try:
+            body = self._body_path(key).read_bytes()
+            os.utime(self._meta_path(key))
+        except OSError:
+            self._drop(key)
+            return None
+        self._entries.move_to_end(key)
+        return body
+
+    def store(self, url: str, resp: httpx.Response) -> None:
+        key = self._key(url)
+        etag = resp.headers.get("etag")
+        last_modified = resp.headers.get("last-modified")
+        body = resp.content
+        if not (etag or last_modified) or len(body) > self.max_bytes:
+            if key in self._entries:
+                self._drop(key)
+            return
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "content_type": resp.headers.get("content-type"),
+        }
+        body_path = self._body_path(key)
+        tmp_path = body_path.with_suffix(".tmp")
+        tmp_path.write_bytes(body)
+        os.replace(tmp_path, body_path)
+        self._meta_path(key).write_text(json.dumps(meta), "utf-8")
+
+        self._total_bytes -= self._entries.pop(key, 0)
+        self._entries[key] = len(body)
+        self._total_bytes += len(body)
+        self._evict()
+
+
+def conditional_headers(meta: dict) -> dict:
+    headers = {}
+    if meta.get("etag"):
+        headers["If-None-Match"] = meta["etag"]
+    if meta.get("last_modified"):
+        headers["If-Modified-Since"] = meta["last_modified"]
+    return headers
+
+
+def _default_cache() -> Optional[HttpCache]:
+    if not settings.scraper_http_cache:
+        return None
+    return HttpCache(settings.scraper_http_cache_dir, settings.scraper_http_cache_max_mb * 1024 * 1024)
+
+
+def _initial_rate(endpoint: str) -> float:
+    if endpoint == "ajax":
+        mean_delay = (settings.scraper_ajax_delay_min + settings.scraper_ajax_delay_max) / 2
+    else:
+        mean_delay = (settings.scraper_delay_min + settings.scraper_delay_max) / 2
+    return 1.0 / mean_delay if mean_delay > 0 else settings.scraper_rate_max
+
+
+def _build_limiter(endpoint: str) -> AdaptiveRateLimiter:
+    return AdaptiveRateLimiter(
+        rate=_initial_rate(endpoint),
+        min_rate=settings.scraper_rate_min,
+        max_rate=settings.scraper_rate_max,
+        increase=settings.scraper_rate_increase,
+        backoff=settings.scraper_rate_backoff,
+        latency_factor=settings.scraper_rate_latency_factor,
+    )
+
+
+def _default_limiters() -> Optional[RateLimiterRegistry]:
+    if not settings.scraper_adaptive_rate:
+        return None
+    return RateLimiterRegistry(_build_limiter)
+
+
+def _count_retry(retry_state: RetryCallState) -> None:
+    metrics.inc("scraper_retries_total", operation=retry_state.fn.__name__ if retry_state.fn else "unknown")
+
+
 class ScraperClient:
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        cache: Optional[HttpCache] = None,
+        limiters: Optional[RateLimiterRegistry] = None,
+        archive: Optional[PageArchive] = None,
+    ) -> None:
         self.client = httpx.AsyncClient(
             timeout=httpx.Timeout(settings.http_timeout, connect=settings.http_connect_timeout),
             follow_redirects=True,
+            transport=transport,
         )
+        self.cache = cache if cache is not None else _default_cache()
+        self.limiters = limiters if limiters is not None else _default_limiters()
+        self.archive = archive if archive is not None else default_archive()
 
     async def close(self) -> None:
         await self.client.aclose()
@@ -24,27 +184,84 @@ class ScraperClient:
     def _pick_user_agent(self) -> str:
         return random.choice(settings.user_agents or [settings.user_agent])
 
+    async def _send(self, method: str, url: str, delay_min: float, delay_max: float, **kwargs: Any) -> httpx.Response:
+        limiter = self.limiters.get(url) if self.limiters is not None else None
+        if limiter is None:
+            await asyncio.sleep(random.uniform(delay_min, delay_max))
+        else:
+            await limiter.acquire()
+
+        endpoint = endpoint_class(url)
+        started = time.monotonic()
+        try:
+            resp = await self.client.request(method, url, **kwargs)
+        except httpx.TransportError:
+            metrics.inc("scraper_requests_total", method=method, endpoint=endpoint, status="error")
+            if limiter is not None:
+                limiter.record(None, time.monotonic() - started)
+            raise
+        latency = time.monotonic() - started
+        metrics.inc("scraper_requests_total", method=method, endpoint=endpoint, status=resp.status_code)
+        metrics.observe("scraper_request_seconds", latency, endpoint=endpoint)
+        metrics.inc("scraper_response_bytes_total", len(resp.content), endpoint=endpoint)
+        if limiter is not None:
+            limiter.record(resp.status_code, latency, parse_retry_after(resp))
+        return resp
+
     @retry(
         reraise=True,
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=5),
         retry=retry_if_exception_type(httpx.HTTPError),
+        before_sleep=_count_retry,
     )
     async def get(self, url: str) -> httpx.Response:
-        await asyncio.sleep(random.uniform(settings.scraper_delay_min, settings.scraper_delay_max))
         headers = {"User-Agent": self._pick_user_agent()}
-        resp = await self.client.get(url, headers=headers)
+        cached = self.cache.lookup(url) if self.cache else None
+        if cached:
+            headers.update(conditional_headers(cached))
+        resp = await self._page_request(url, headers)
+        if resp.status_code == 304 and self.cache and cached:
+            body = self.cache.read_body(url)
+            if body is not None:
+                metrics.inc("scraper_http_cache_hits_total")
+                resp = self._cached_response(resp, cached, body)
+                self._archive(url, None, resp)
+                return resp
+            resp = await self._page_request(url, {"User-Agent": headers["User-Agent"]})
         resp.raise_for_status()
+        if self.cache:
+            self.cache.store(url, resp)
+        self._archive(url, None, resp)
         return resp
 
+    def _archive(self, url: str, data: Optional[dict], resp: httpx.Response) -> None:
+        if self.archive is not None:
+            self.archive.store(archive_key(url, data), url, resp.content, resp.headers.get("content-type"))
+
+    async def _page_request(self, url: str, headers: dict) -> httpx.Response:
+        return await self._send(
+            "GET", url, settings.scraper_delay_min, settings.scraper_delay_max, headers=headers
+        )
+
+    def _cached_response(self, not_modified: httpx.Response, meta: dict, body: bytes) -> httpx.Response:
+        headers = {}
+        if meta.get("content_type"):
+            headers["Content-Type"] = meta["content_type"]
+        if meta.get("etag"):
+            headers["ETag"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["Last-Modified"] = meta["last_modified"]
+        return httpx.Response(200, headers=headers, content=body, request=not_modified.request)
+
     @retry(
         reraise=True,
         stop=stop_after_attempt(3),
         wait=wait_exponential(multiplier=1, min=1, max=5),
         retry=retry_if_exception_type(httpx.HTTPError),
+        before_sleep=_count_retry,
     )
     async def post_form(self, url: str, data: dict, referer: str | None = None) -> httpx.Response:
-        await asyncio.sleep(random.uniform(settings.scraper_ajax_delay_min, settings.scraper_ajax_delay_max))
         headers = {
             "User-Agent": self._pick_user_agent(),
             "Content-Type": "application/x-www-form-urlencoded",
@@ -53,8 +270,16 @@ class ScraperClient:
         if referer:
             headers["Referer"] = referer
             headers["Origin"] = settings.base_url
-        resp = await self.client.post(url, data=data, headers=headers)
+        resp = await self._send(
+            "POST",
+            url,
+            settings.scraper_ajax_delay_min,
+            settings.scraper_ajax_delay_max,
+            data=data,
+            headers=headers,
+        )
         resp.raise_for_status()
+        self._archive(url, data, resp)
         return resp
 
     async def __aenter__(self) -> "ScraperClient":
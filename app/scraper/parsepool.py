@@ -0,0 +1,55 @@
+import asyncio
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Optional
+
+from app.core.config import get_settings
+from app.core.metrics import metrics
+
+
+settings = get_settings()
+
+PARSE_BACKENDS = ("inline", "thread", "process")
+
+
+class ParsePool:
+    def __init__(self, backend: str = "inline", workers: int = 1) -> None:
+        if backend not in PARSE_BACKENDS:
+            raise ValueError(f"unknown parse backend: {backend}")
+        self.backend = backend
+        self.workers = max(1, workers)
+        self.executor: Optional[Executor] = None
+        if backend == "process":
+            self.executor = ProcessPoolExecutor(max_workers=self.workers)
+        elif backend == "thread":
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="parse")
+
+    @property
+    def concurrency(self) -> int:
+        return self.workers if self.executor is not None else 1
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        if self.executor is None:
+            return fn(*args)
+        return await asyncio.get_running_loop().run_in_executor(self.executor, fn, *args)
+
+    def close(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=True, cancel_futures=True)
+            self.executor = None
+
+    def __enter__(self) -> "ParsePool":
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.close()
+
+
+def create_parse_pool() -> ParsePool:
+    return ParsePool(settings.scraper_parse_backend, settings.scraper_parse_workers)
+
+
+async def run_parser(parse_pool: Optional[ParsePool], fn: Callable[..., Any], *args: Any) -> Any:
+    with metrics.time("scraper_parse_seconds", parser=fn.__name__):
+        if parse_pool is None:
+            return fn(*args)
+        return await parse_pool.run(fn, *args)
@@ -20,21 +20,23 @@ def parse_anime_list(html: str) -> List[dict]:
     return results
 
 
-def parse_detail(html: str) -> Tuple[dict, List[str], str]:
-    tree = HTMLParser(html)
-    detail: dict = {
-        "image_url": None,
-        "title": None,
-        "title_japanese": None,
-        "score": None,
-        "producer": None,
-        "type": None,
-        "status_detail": None,
-        "total_episode": None,
-        "duration": None,
-        "release_date": None,
-        "studio": None,
-    }
+DETAIL_FIELD_MAP = {
+    "judul": "title",
+    "japanese": "title_japanese",
+    "skor": "score",
+    "produser": "producer",
+    "tipe": "type",
+    "status": "status_detail",
+    "total episode": "total_episode",
+    "durasi": "duration",
+    "tanggal rilis": "release_date",
+    "studio": "studio",
+}
+
+
+def _extract_detail(tree: HTMLParser) -> Tuple[dict, List[str], str]:
+    detail: dict = {"image_url": None}
+    detail.update({field: None for field in DETAIL_FIELD_MAP.values()})
     genres: List[str] = []
     synopsis: str = ""
 
@@ -52,30 +54,11 @@ def parse_detail(html: str) -> Tuple[dict, List[str], str]:
                     continue
                 label, _, value = text.partition(":")
                 key = label.strip().lower()
-                val = value.strip()
-                if key == "judul":
-                    detail["title"] = val
-                elif key == "japanese":
-                    detail["title_japanese"] = val
-                elif key == "skor":
-                    detail["score"] = val
-                elif key == "produser":
-                    detail["producer"] = val
-                elif key == "tipe":
-                    detail["type"] = val
-                elif key == "status":
-                    detail["status_detail"] = val
-                elif key == "total episode":
-                    detail["total_episode"] = val
-                elif key == "durasi":
-                    detail["duration"] = val
-                elif key == "tanggal rilis":
-                    detail["release_date"] = val
-                elif key == "studio":
-                    detail["studio"] = val
+                field = DETAIL_FIELD_MAP.get(key)
+                if field:
+                    detail[field] = value.strip()
                 elif key == "genre":
-                    anchors = p.css("a")
-                    for a in anchors:
+                    for a in p.css("a"):
                         name = a.text().strip()
                         if name:
                             genres.append(name)
@@ -88,8 +71,19 @@ def parse_detail(html: str) -> Tuple[dict, List[str], str]:
     return detail, genres, synopsis
 
 
-def parse_episodes(html: str) -> List[dict]:
-    tree = HTMLParser(html)
+def _episode_number(title: str) -> Optional[int]:
+    lower_title = title.lower()
+    if "episode" not in lower_title:
+        return None
+    parts = lower_title.split("episode")
+    if len(parts) > 1:
+        num_str = "".join(ch for ch in parts[1].strip() if ch.isdigit())
+        if num_str:
+            return int(num_str)
+    return None
+
+
+def _extract_episodes(tree: HTMLParser) -> List[dict]:
     episodes: List[dict] = []
     for li in tree.css("div.episodelist ul li"):
         a = li.css_first("a")
@@ -102,27 +96,31 @@ def parse_episodes(html: str) -> List[dict]:
         if date_span:
             date_text = date_span.text().strip()
 
-        episode_number: Optional[int] = None
-        lower_title = title.lower()
-        if "episode" in lower_title:
-            parts = lower_title.split("episode")
-            if len(parts) > 1:
-                tail = parts[1].strip()
-                num_str = "".join(ch for ch in tail if ch.isdigit())
-                if num_str:
-                    episode_number = int(num_str)
-
         episodes.append(
             {
                 "episode_url": url,
                 "episode_title": title,
                 "episode_date_text": date_text,
-                "episode_number": episode_number,
+                "episode_number": _episode_number(title),
             }
         )
     return episodes
 
 
+def parse_detail(html: str) -> Tuple[dict, List[str], str]:
+    return _extract_detail(HTMLParser(html))
+
+
+def parse_episodes(html: str) -> List[dict]:
+    return _extract_episodes(HTMLParser(html))
+
+
+def parse_detail_page(html: str) -> Tuple[dict, List[str], str, List[dict]]:
+    tree = HTMLParser(html)
+    detail, genres, synopsis = _extract_detail(tree)
+    return detail, genres, synopsis, _extract_episodes(tree)
+
+
 def parse_mirrors(html: str) -> List[dict]:
     tree = HTMLParser(html)
     mirrors: List[dict] = []
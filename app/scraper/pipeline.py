@@ -1,12 +1,37 @@
 import asyncio
+import hashlib
+import json
 import logging
+import time
 from datetime import datetime, timedelta, timezone
+from functools import partial
 from urllib.parse import urljoin
-from typing import List, Optional, cast
+from typing import Awaitable, Callable, Dict, List, Optional, cast
+
+from sqlalchemy.orm import Session
 
 from app.core.config import get_settings
-from app.db import models
+from app.core.metrics import metrics, publish_run_metrics, timed_acquire
 from app.db.repository import (
+    clear_crawl_jobs,
+    crawl_job_payload,
+    enqueue_crawl_jobs,
+    get_pending_crawl_jobs,
+    has_live_crawl_leases,
+    has_unfinished_crawl_jobs,
+    mark_crawl_job,
+    mark_crawl_jobs,
+    reset_crawl_leases,
+    split_mirror_raw,
+    get_anime_scrape_state,
+    get_anime_scrape_states,
+    get_fully_mirrored_anime_ids,
+    update_anime_rows,
+    get_episode_ids_by_url,
+    assign_changed,
+    bulk_upsert_episodes,
+    bulk_upsert_episode_mirrors,
+    genre_cache_for,
     upsert_anime,
     sync_anime_genres,
     upsert_episodes,
@@ -16,12 +41,15 @@ from app.db.repository import (
     get_episode_ids_with_incomplete_mirrors,
     get_episodes_by_ids,
 )
-from app.db.session import SessionLocal, engine
+from app.db.schema import sync_schema
+from app.db.async_repository import run_in_session
+from app.db.session import AsyncSessionLocal, engine
+from app.db.writer import DbWriter
 from app.scraper.client import ScraperClient
+from app.scraper.parsepool import ParsePool, create_parse_pool, run_parser
 from app.scraper.parsers import (
     parse_anime_list,
-    parse_detail,
-    parse_episodes,
+    parse_detail_page,
     parse_mirrors,
     decode_embed_base64_to_iframe_src,
 )
@@ -30,7 +58,7 @@ from app.scraper.parsers import (
 async def fetch_nonce(client: ScraperClient, referer: str, semaphore: asyncio.Semaphore) -> Optional[str]:
     data = {"action": settings.ajax_action_nonce}
     try:
-        async with semaphore:
+        async with timed_acquire(semaphore, "ajax"):
             resp = await client.post_form(urljoin(settings.base_url, "/wp-admin/admin-ajax.php"), data=data, referer=referer)
         return resp.json().get("data")
     except Exception as exc:  # noqa: BLE001
@@ -38,18 +66,90 @@ async def fetch_nonce(client: ScraperClient, referer: str, semaphore: asyncio.Se
         return None
 
 
-async def fetch_mirror_embed(
-    client: ScraperClient, referer: str, payload: dict, nonce: str, semaphore: asyncio.Semaphore
-) -> Optional[str]:
-    data = {
+class FrontierBusy(Exception):
+    pass
+
+
+class NonceCache:
+    def __init__(self, ttl_seconds: float, clock: Callable[[], float] = time.monotonic) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._nonce: Optional[str] = None
+        self._fetched_at = 0.0
+        self._trusted = False
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return self._nonce is not None and self._clock() - self._fetched_at < self.ttl_seconds
+
+    async def _fetch(
+        self, client: ScraperClient, referer: str, semaphore: asyncio.Semaphore, trusted: bool
+    ) -> Optional[str]:
+        nonce = await fetch_nonce(client, referer, semaphore)
+        self._nonce = nonce
+        self._fetched_at = self._clock()
+        self._trusted = trusted and nonce is not None
+        return nonce
+
+    async def get(self, client: ScraperClient, referer: str, semaphore: asyncio.Semaphore) -> Optional[str]:
+        if self._is_fresh():
+            return self._nonce
+        async with self._lock:
+            if self._is_fresh():
+                return self._nonce
+            return await self._fetch(client, referer, semaphore, trusted=False)
+
+    async def refresh(
+        self, client: ScraperClient, referer: str, semaphore: asyncio.Semaphore, stale: Optional[str]
+    ) -> Optional[str]:
+        async with self._lock:
+            if self._is_fresh() and (self._nonce != stale or self._trusted):
+                return self._nonce
+            return await self._fetch(client, referer, semaphore, trusted=True)
+
+    def mark_valid(self, nonce: str) -> None:
+        if nonce == self._nonce:
+            self._trusted = True
+
+
+def mirror_embed_form(payload: dict, nonce: Optional[str]) -> dict:
+    return {
         "id": payload["mirror_id"],
         "i": payload["mirror_i"],
         "q": payload["mirror_q"],
         "nonce": nonce,
         "action": settings.ajax_action_embed,
     }
+
+
+def build_mirror_record(
+    mirror: dict,
+    embed_b64: Optional[str],
+    iframe_src: Optional[str],
+    nonce: Optional[str],
+    scraped_at: Optional[datetime] = None,
+) -> dict:
+    if embed_b64:
+        status = "success" if iframe_src else "partial"
+    else:
+        status = "failed"
+    return {
+        **mirror,
+        "iframe_src": iframe_src,
+        "raw_embed_html": embed_b64 or None,
+        "nonce": nonce,
+        "fetch_status": status,
+        "error_message": "failed to fetch mirror" if status == "failed" else None,
+        "last_scraped_at": scraped_at or datetime.utcnow(),
+    }
+
+
+async def fetch_mirror_embed(
+    client: ScraperClient, referer: str, payload: dict, nonce: str, semaphore: asyncio.Semaphore
+) -> Optional[str]:
+    data = mirror_embed_form(payload, nonce)
     try:
-        async with semaphore:
+        async with timed_acquire(semaphore, "ajax"):
             resp = await client.post_form(urljoin(settings.base_url, "/wp-admin/admin-ajax.php"), data=data, referer=referer)
         return resp.json().get("data")
     except Exception as exc:  # noqa: BLE001
@@ -57,8 +157,46 @@ async def fetch_mirror_embed(
         return None
 
 
+async def fetch_mirror_result(
+    client: ScraperClient,
+    episode_url: str,
+    mirror: dict,
+    ajax_semaphore: asyncio.Semaphore,
+    nonce_cache: NonceCache,
+    parse_pool: Optional[ParsePool] = None,
+) -> dict:
+    iframe_src: Optional[str] = None
+    embed_b64: Optional[str] = None
+    started_at = datetime.utcnow()
+    nonce = await nonce_cache.get(client, episode_url, ajax_semaphore)
+    used_nonce: Optional[str] = nonce
+
+    if nonce:
+        embed_b64 = await fetch_mirror_embed(client, episode_url, mirror, nonce, ajax_semaphore)
+        if embed_b64:
+            nonce_cache.mark_valid(nonce)
+            iframe_src = await run_parser(parse_pool, decode_embed_base64_to_iframe_src, embed_b64)
+
+    if not embed_b64:
+        nonce_retry = await nonce_cache.refresh(client, episode_url, ajax_semaphore, stale=nonce)
+        if nonce_retry and nonce_retry != nonce:
+            used_nonce = nonce_retry
+            embed_b64 = await fetch_mirror_embed(client, episode_url, mirror, nonce_retry, ajax_semaphore)
+            if embed_b64:
+                nonce_cache.mark_valid(nonce_retry)
+                iframe_src = await run_parser(parse_pool, decode_embed_base64_to_iframe_src, embed_b64)
+
+    record = build_mirror_record(mirror, embed_b64, iframe_src, used_nonce, started_at)
+    metrics.inc("scraper_mirrors_total", status=record["fetch_status"])
+    return record
+
+
 async def fetch_episode_mirror_data(
-    client: ScraperClient, episode_url: str, ajax_semaphore: asyncio.Semaphore
+    client: ScraperClient,
+    episode_url: str,
+    ajax_semaphore: asyncio.Semaphore,
+    nonce_cache: Optional[NonceCache] = None,
+    parse_pool: Optional[ParsePool] = None,
 ) -> List[dict]:
     try:
         ep_resp = await client.get(episode_url)
@@ -66,64 +204,106 @@ async def fetch_episode_mirror_data(
         logger.warning("failed fetching episode page for mirrors", extra={"episode_url": episode_url, "error": str(exc)})
         return []
 
-    mirrors = parse_mirrors(ep_resp.text)
+    mirrors = await run_parser(parse_pool, parse_mirrors, ep_resp.text)
     if not mirrors:
         return []
-    nonce = await fetch_nonce(client, episode_url, ajax_semaphore)
+    if nonce_cache is None:
+        nonce_cache = NonceCache(settings.scraper_nonce_ttl_seconds)
+
+    if settings.scraper_mirror_fanout:
+        return list(
+            await asyncio.gather(
+                *(
+                    fetch_mirror_result(client, episode_url, mirror, ajax_semaphore, nonce_cache, parse_pool)
+                    for mirror in mirrors
+                )
+            )
+        )
+
     results: List[dict] = []
     for mirror in mirrors:
-        status = "failed"
-        iframe_src: Optional[str] = None
-        raw_embed_html: Optional[str] = None
-        used_nonce: Optional[str] = nonce
-        error_message: Optional[str] = None
-
-        if nonce:
-            embed_b64 = await fetch_mirror_embed(client, episode_url, mirror, nonce, ajax_semaphore)
-            if embed_b64:
-                iframe_src = decode_embed_base64_to_iframe_src(embed_b64)
-                raw_embed_html = embed_b64
-                status = "success" if iframe_src else "partial"
-
-        if status == "failed":
-            nonce_retry = await fetch_nonce(client, episode_url, ajax_semaphore)
-            used_nonce = nonce_retry
-            if nonce_retry:
-                embed_b64 = await fetch_mirror_embed(client, episode_url, mirror, nonce_retry, ajax_semaphore)
-                if embed_b64:
-                    iframe_src = decode_embed_base64_to_iframe_src(embed_b64)
-                    raw_embed_html = embed_b64
-                    status = "success" if iframe_src else "partial"
-        if status == "failed":
-            error_message = "failed to fetch mirror"
-
         results.append(
-            {
-                **mirror,
-                "iframe_src": iframe_src,
-                "raw_embed_html": raw_embed_html,
-                "nonce": used_nonce,
-                "fetch_status": status,
-                "error_message": error_message,
-                "last_scraped_at": datetime.utcnow(),
-            }
+            await fetch_mirror_result(client, episode_url, mirror, ajax_semaphore, nonce_cache, parse_pool)
         )
     return results
 
 
 async def scrape_episode_mirrors(
     client: ScraperClient,
+    writer: DbWriter,
     episodes: List[dict],
     episode_semaphore: asyncio.Semaphore,
     ajax_semaphore: asyncio.Semaphore,
+    nonce_cache: Optional[NonceCache] = None,
+    parse_pool: Optional[ParsePool] = None,
 ) -> None:
     tasks: List[asyncio.Task] = []
+    fetched: Dict[str, tuple[int, List[dict]]] = {}
+    loop = asyncio.get_running_loop()
+    buffered_at = 0.0
+
+    async def flush() -> None:
+        batch = dict(fetched)
+        fetched.clear()
+        if len(batch) > 1:
+            try:
+                await writer.submit(partial(save_episode_mirrors, mirrors_by_url=batch))
+                return
+            except Exception as exc:  # noqa: BLE001
+                logger.warning(
+                    "mirror batch commit failed, saving episodes one by one",
+                    extra={"size": len(batch), "error": str(exc)},
+                )
+        for url, entry in batch.items():
+            try:
+                await writer.submit(partial(save_episode_mirrors, mirrors_by_url={url: entry}))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("mirror commit failed", extra={"episode_url": url, "error": str(exc)})
+                await writer.submit(
+                    partial(mark_crawl_job, kind="episode_mirrors", job_key=url, state="failed", error_message=str(exc))
+                )
 
-    async def run_fetch(url: str, ep_id: int) -> tuple[int, List[dict]]:
-        async with episode_semaphore:
-            mirror_data = await fetch_episode_mirror_data(client, url, ajax_semaphore)
-            return ep_id, mirror_data
+    async def run_fetch(url: str, ep_id: int) -> None:
+        nonlocal buffered_at
+        async with timed_acquire(episode_semaphore, "episode"):
+            mirror_data = await fetch_episode_mirror_data(client, url, ajax_semaphore, nonce_cache, parse_pool)
+        if not fetched:
+            buffered_at = loop.time()
+        fetched[url] = (ep_id, mirror_data)
+        if (
+            len(fetched) >= settings.scraper_write_batch_size
+            or loop.time() - buffered_at >= settings.scraper_write_flush_ms / 1000
+        ):
+            await flush()
+
+    candidates = episode_mirror_jobs(episodes)
+    if not candidates:
+        return
+
+    pending_urls = await writer.submit(
+        partial(enqueue_pending_job_keys, kind="episode_mirrors", jobs=candidates)
+    )
 
+    for episode_url, payload in candidates:
+        if episode_url in pending_urls:
+            tasks.append(asyncio.create_task(run_fetch(episode_url, payload["episode_id"])))
+
+    if not tasks:
+        return
+
+    results = await asyncio.gather(*tasks, return_exceptions=True)
+    if fetched:
+        await flush()
+    for result in results:
+        if isinstance(result, BaseException):
+            if isinstance(result, Exception):
+                logger.warning("mirror fetch task failed", extra={"error": str(result)})
+                continue
+            raise result
+
+
+def episode_mirror_jobs(episodes: List[dict]) -> List[tuple[str, dict]]:
+    jobs: List[tuple[str, dict]] = []
     for ep in episodes:
         episode_url = ep.get("episode_url")
         episode_id_value = ep.get("episode_id")
@@ -137,31 +317,31 @@ async def scrape_episode_mirrors(
                 extra={"episode_id": episode_id_value, "episode_url": episode_url},
             )
             continue
-        tasks.append(asyncio.create_task(run_fetch(episode_url, episode_id)))
+        jobs.append((episode_url, {"episode_url": episode_url, "episode_id": episode_id}))
+    return jobs
 
-    if not tasks:
-        return
 
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    with SessionLocal() as session:
-        try:
-            for result in results:
-                if isinstance(result, BaseException):
-                    if isinstance(result, Exception):
-                        logger.warning("mirror fetch task failed", extra={"error": str(result)})
-                        continue
-                    raise result
-                if not isinstance(result, tuple):
-                    logger.warning("mirror fetch task unexpected result", extra={"result": str(result)})
-                    continue
-                episode_id, mirrors = result
-                for mirror_data in mirrors:
-                    upsert_episode_mirror(session, episode_id, mirror_data)
-            session.commit()
-        except Exception as exc:  # noqa: BLE001
-            session.rollback()
-            logger.warning("mirror commit failed", extra={"error": str(exc)})
-            raise
+def store_episode_mirrors(session: Session, mirrors_by_episode: Dict[int, List[dict]]) -> None:
+    if not settings.scraper_mirror_raw:
+        mirrors_by_episode = {
+            episode_id: [split_mirror_raw(mirror)[0] for mirror in mirrors]
+            for episode_id, mirrors in mirrors_by_episode.items()
+        }
+    if settings.scraper_bulk_mirrors:
+        bulk_upsert_episode_mirrors(session, mirrors_by_episode, settings.scraper_db_chunk_size)
+    else:
+        for episode_id, mirrors in mirrors_by_episode.items():
+            for mirror_data in mirrors:
+                upsert_episode_mirror(session, episode_id, mirror_data)
+
+
+def save_episode_mirrors(session: Session, mirrors_by_url: Dict[str, tuple[int, List[dict]]]) -> None:
+    store_episode_mirrors(session, {episode_id: mirrors for episode_id, mirrors in mirrors_by_url.values()})
+    mark_crawl_jobs(session, "episode_mirrors", list(mirrors_by_url), "done", settings.scraper_db_chunk_size)
+
+
+def enqueue_pending_job_keys(session: Session, kind: str, jobs: List[tuple[str, dict]]) -> set[str]:
+    return {cast(str, job.job_key) for job in enqueue_crawl_jobs(session, kind, jobs) if job.state == "pending"}
 
 
 logger = logging.getLogger(__name__)
@@ -171,7 +351,7 @@ settings = get_settings()
 
 
 def init_db() -> None:
-    models.Base.metadata.create_all(bind=engine)
+    sync_schema(engine)
 
 
 def normalize_status(value: Optional[str]) -> Optional[str]:
@@ -181,12 +361,7 @@ def normalize_status(value: Optional[str]) -> Optional[str]:
     return normalized or None
 
 
-async def scrape_anime_item(
-    item: dict,
-    client: ScraperClient,
-    episode_semaphore: asyncio.Semaphore,
-    ajax_semaphore: asyncio.Semaphore,
-) -> None:
+def build_anime_context(item: dict) -> Optional[dict]:
     raw_status = item.get("status")
     list_status = raw_status.strip().lower() if isinstance(raw_status, str) else None
     href = item.get("href")
@@ -198,7 +373,7 @@ async def scrape_anime_item(
             "status": item.get("status"),
         }
         logger.warning("missing anime list fields", extra=missing_fields)
-        return
+        return None
     anime_data = {
         "source_url": href,
         "title": title,
@@ -206,140 +381,424 @@ async def scrape_anime_item(
     }
     if raw_status is not None:
         anime_data["status_list_page"] = raw_status
+    return {
+        "href": href,
+        "title": title,
+        "list_status": list_status,
+        "list_status_normalized": normalize_status(list_status),
+        "anime_data": anime_data,
+    }
 
-    logger.info("processing anime", extra={"url": href, "title": title})
-
-    with SessionLocal() as session:
-        anime = upsert_anime(session, anime_data)
-        session.commit()
-        session.refresh(anime)
 
-        if list_status == "completed":
-            if is_anime_fully_mirrored(session, cast(int, anime.id)):
-                logger.info("skipping completed anime", extra={"url": href, "title": title})
-                return
+def prepare_anime(session: Session, anime_data: dict, list_status: Optional[str]) -> dict:
+    previous = get_anime_scrape_state(session, anime_data["source_url"])
+    if previous is not None:
+        anime_data = {key: anime_data[key] for key in ("source_url", "status_list_page") if key in anime_data}
+    else:
+        previous = {}
+    anime = upsert_anime(session, anime_data)
+    session.flush()
+    fully_mirrored = list_status == "completed" and is_anime_fully_mirrored(session, cast(int, anime.id))
+    return {
+        "anime_id": anime.id,
+        "last_scraped_at": previous.get("last_scraped_at"),
+        "status_detail": previous.get("status_detail"),
+        "fully_mirrored": fully_mirrored,
+    }
 
-        last_scraped_at_raw = anime.last_scraped_at
-        last_status_detail_raw = anime.status_detail
 
-    list_status_normalized = normalize_status(list_status)
+def skip_reason(ctx: dict, state: dict) -> Optional[str]:
+    if ctx["list_status"] == "completed" and state.get("fully_mirrored"):
+        return "completed"
+    last_status_detail_raw = state.get("status_detail")
     last_status_detail_normalized = normalize_status(
         last_status_detail_raw if isinstance(last_status_detail_raw, str) else None
     )
-    if list_status_normalized == "ongoing" and last_status_detail_normalized == "ongoing":
-        last_scraped_at_value = last_scraped_at_raw if isinstance(last_scraped_at_raw, datetime) else None
-        if last_scraped_at_value is not None:
-            last_scraped_at = cast(datetime, last_scraped_at_value)
+    if ctx["list_status_normalized"] == "ongoing" and last_status_detail_normalized == "ongoing":
+        last_scraped_at_raw = state.get("last_scraped_at")
+        if isinstance(last_scraped_at_raw, datetime):
+            last_scraped_at = last_scraped_at_raw
             if last_scraped_at.tzinfo is None:
                 last_scraped_at = last_scraped_at.replace(tzinfo=timezone.utc)
             next_refresh = last_scraped_at + timedelta(hours=settings.scraper_ongoing_refresh_hours)
-            now = datetime.now(timezone.utc)
-            if now < next_refresh:
-                logger.info(
-                    "skipping ongoing anime refresh",
-                    extra={"url": href, "title": title, "next_refresh": next_refresh.isoformat()},
-                )
-                return
+            if datetime.now(timezone.utc) < next_refresh:
+                ctx["next_refresh"] = next_refresh
+                return "ongoing_fresh"
+    return None
+
+
+def plan_detail_jobs(session: Session, detail_jobs: List[tuple[str, dict]]) -> List[tuple[str, dict]]:
+    chunk_size = settings.scraper_db_chunk_size
+    contexts = [(job_key, item, build_anime_context(item)) for job_key, item in detail_jobs]
+    states = get_anime_scrape_states(session, [ctx["href"] for _, _, ctx in contexts if ctx], chunk_size)
+    completed_ids = [
+        states[ctx["href"]]["anime_id"]
+        for _, _, ctx in contexts
+        if ctx and ctx["list_status"] == "completed" and ctx["href"] in states
+    ]
+    fully_mirrored = get_fully_mirrored_anime_ids(session, completed_ids, chunk_size)
+
+    work: List[tuple[str, dict]] = []
+    skipped: Dict[str, List[str]] = {"invalid": [], "completed": [], "ongoing_fresh": []}
+    list_updates: List[dict] = []
+    for job_key, item, ctx in contexts:
+        if ctx is None:
+            skipped["invalid"].append(job_key)
+            continue
+        state = states.get(ctx["href"])
+        if state is None:
+            work.append((job_key, item))
+            continue
+        state["fully_mirrored"] = state["anime_id"] in fully_mirrored
+        reason = skip_reason(ctx, state)
+        if reason is None:
+            work.append((job_key, item))
+            continue
+        skipped[reason].append(job_key)
+        list_status = ctx["anime_data"].get("status_list_page")
+        if list_status is not None and list_status != state["status_list_page"]:
+            list_updates.append(
+                {"id": state["anime_id"], "status_list_page": list_status, "updated_at": datetime.utcnow()}
+            )
 
-    detail_resp = await client.get(href)
-    detail_data, genres, synopsis = parse_detail(detail_resp.text)
-    episodes = parse_episodes(detail_resp.text)
-    detail_status = detail_data.get("status_detail")
-    detail_status_normalized = normalize_status(detail_status)
-    is_ongoing = list_status_normalized == "ongoing" and detail_status_normalized == "ongoing"
+    mark_crawl_jobs(session, "detail", [key for keys in skipped.values() for key in keys], "done", chunk_size)
+    for reason, job_keys in skipped.items():
+        if job_keys:
+            metrics.inc("scraper_items_skipped_total", len(job_keys), reason=reason)
+    update_anime_rows(session, list_updates)
+    logger.info(
+        "planned detail jobs",
+        extra={"work": len(work), **{f"skipped_{reason}": len(keys) for reason, keys in skipped.items()}},
+    )
+    return work
 
-    new_episode_urls: set[str] = set()
-    retry_episode_ids: List[int] = []
-    with SessionLocal() as session:
-        try:
-            anime = upsert_anime(session, anime_data)
-            for k, v in detail_data.items():
-                setattr(anime, k, v)
-            anime.synopsis = synopsis  # type: ignore[assignment]
-            anime.last_scraped_at = datetime.utcnow()  # type: ignore[assignment]
-            sync_anime_genres(session, anime, genres)
-            session.flush()
 
-            existing_episode_urls = (
-                get_episode_urls_by_anime(session, cast(int, anime.id)) if is_ongoing else set()
+async def fetch_anime_item(
+    item: dict, client: ScraperClient, writer: DbWriter, planned: bool = False
+) -> Optional[dict]:
+    ctx = build_anime_context(item)
+    if ctx is None:
+        return None
+    href = ctx["href"]
+    title = ctx["title"]
+    logger.info("processing anime", extra={"url": href, "title": title})
+
+    if not planned:
+        state = await writer.submit(
+            partial(prepare_anime, anime_data=ctx["anime_data"], list_status=ctx["list_status"])
+        )
+        reason = skip_reason(ctx, state)
+        if reason is not None:
+            metrics.inc("scraper_items_skipped_total", reason=reason)
+        if reason == "completed":
+            logger.info("skipping completed anime", extra={"url": href, "title": title})
+            return None
+        if reason == "ongoing_fresh":
+            logger.info(
+                "skipping ongoing anime refresh",
+                extra={"url": href, "title": title, "next_refresh": ctx["next_refresh"].isoformat()},
             )
+            return None
+
+    ctx["scraped_at"] = datetime.utcnow()
+    detail_resp = await client.get(href)
+    ctx["html"] = detail_resp.text
+    return ctx
+
+
+async def parse_anime_page(ctx: dict, parse_pool: Optional[ParsePool] = None) -> dict:
+    html = ctx.pop("html")
+    detail_data, genres, synopsis, episodes = await run_parser(parse_pool, parse_detail_page, html)
+    detail_status_normalized = normalize_status(detail_data.get("status_detail"))
+    ctx.update(
+        {
+            "detail": detail_data,
+            "genres": genres,
+            "synopsis": synopsis,
+            "episodes": episodes,
+            "is_ongoing": ctx["list_status_normalized"] == "ongoing" and detail_status_normalized == "ongoing",
+        }
+    )
+    return ctx
+
+
+def content_fingerprint(detail: dict, genres: List[str], synopsis: str, episodes: List[dict]) -> str:
+    payload = {
+        "detail": detail,
+        "genres": genres,
+        "synopsis": synopsis,
+        "episodes": [
+            [ep.get("episode_url"), ep.get("episode_title"), ep.get("episode_date_text"), ep.get("episode_number")]
+            for ep in episodes
+        ],
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")).hexdigest()
+
 
-            for ep in episodes:
-                ep["anime_id"] = anime.id
-                episode_url = ep.get("episode_url")
-                if is_ongoing and episode_url and episode_url not in existing_episode_urls:
-                    new_episode_urls.add(episode_url)
+def persist_anime_page(session: Session, ctx: dict) -> List[dict]:
+    is_ongoing = ctx["is_ongoing"]
+    episodes = ctx["episodes"]
+    fingerprint = content_fingerprint(ctx["detail"], ctx["genres"], ctx["synopsis"], episodes)
+    scraped_at = ctx.get("scraped_at") or datetime.utcnow()
+    anime_data = {**ctx["anime_data"], "last_scraped_at": scraped_at}
+    if ctx["detail"].get("title"):
+        anime_data["title"] = ctx["detail"]["title"]
+    anime = upsert_anime(session, anime_data)
+    session.flush()
+    anime_id = cast(int, anime.id)
 
+    new_episode_urls: set[str] = set()
+    if anime.content_hash == fingerprint:
+        ctx["unchanged"] = True
+        episode_ids_by_url = get_episode_ids_by_url(session, anime_id)
+    else:
+        ctx["unchanged"] = False
+        if assign_changed(anime, {**ctx["detail"], "synopsis": ctx["synopsis"], "content_hash": fingerprint}):
+            anime.updated_at = datetime.utcnow()  # type: ignore[assignment]
+        sync_anime_genres(session, anime, ctx["genres"], genre_cache_for(session))
+
+        existing_episode_urls = get_episode_urls_by_anime(session, anime_id) if is_ongoing else set()
+        for ep in episodes:
+            ep["anime_id"] = anime_id
+            episode_url = ep.get("episode_url")
+            if is_ongoing and episode_url and episode_url not in existing_episode_urls:
+                new_episode_urls.add(episode_url)
+
+        if settings.scraper_bulk_episodes:
+            episode_ids_by_url = bulk_upsert_episodes(session, anime_id, episodes, settings.scraper_db_chunk_size)
+        else:
             episode_rows = upsert_episodes(session, anime, episodes)
+            session.flush()
             episode_ids_by_url = {row.episode_url: row.id for row in episode_rows}
-            for ep in episodes:
-                episode_url = ep.get("episode_url")
-                if episode_url:
-                    ep["episode_id"] = episode_ids_by_url.get(episode_url)
 
-            if is_ongoing and settings.scraper_retry_incomplete_mirrors:
-                retry_episode_ids = get_episode_ids_with_incomplete_mirrors(session, cast(int, anime.id))
+    episode_refs = [
+        {"episode_url": ep["episode_url"], "episode_id": episode_ids_by_url.get(ep["episode_url"])}
+        for ep in episodes
+        if ep.get("episode_url")
+    ]
+
+    if not is_ongoing:
+        return episode_refs
 
-            session.commit()
-            logger.info("committed anime", extra={"url": href, "episodes": len(episodes)})
-        except Exception as exc:  # noqa: BLE001
-            session.rollback()
-            logger.warning("anime commit failed", extra={"url": href, "error": str(exc)})
-            raise
+    episodes_to_mirror = [ref for ref in episode_refs if ref["episode_url"] in new_episode_urls]
+    if settings.scraper_retry_incomplete_mirrors:
+        retry_episode_ids = get_episode_ids_with_incomplete_mirrors(session, cast(int, anime.id))
+        seen_ids = {ref["episode_id"] for ref in episodes_to_mirror if ref["episode_id"]}
+        for row in get_episodes_by_ids(session, retry_episode_ids):
+            if row.episode_url is not None and row.id not in seen_ids:
+                episodes_to_mirror.append({"episode_id": row.id, "episode_url": row.episode_url})
+                seen_ids.add(row.id)
+    return episodes_to_mirror
 
+
+async def mirror_anime_episodes(
+    client: ScraperClient,
+    writer: DbWriter,
+    episodes_to_mirror: List[dict],
+    episode_semaphore: asyncio.Semaphore,
+    ajax_semaphore: asyncio.Semaphore,
+    nonce_cache: Optional[NonceCache] = None,
+    parse_pool: Optional[ParsePool] = None,
+) -> None:
     if settings.scraper_fetch_mirrors:
-        episodes_to_mirror = episodes
-        if is_ongoing:
-            new_episodes = [ep for ep in episodes if ep.get("episode_url") in new_episode_urls]
-            retry_episodes: List[dict] = []
-            if retry_episode_ids:
-                with SessionLocal() as session:
-                    retry_rows = get_episodes_by_ids(session, retry_episode_ids)
-                retry_episodes = [
-                    {"episode_id": row.id, "episode_url": row.episode_url}
-                    for row in retry_rows
-                    if row.episode_url is not None
-                ]
-            seen_ids = {ep.get("episode_id") for ep in new_episodes if ep.get("episode_id")}
-            for retry_ep in retry_episodes:
-                ep_id = retry_ep.get("episode_id")
-                if ep_id and ep_id not in seen_ids:
-                    new_episodes.append(retry_ep)
-                    seen_ids.add(ep_id)
-            episodes_to_mirror = new_episodes
-
-        await scrape_episode_mirrors(client, episodes_to_mirror, episode_semaphore, ajax_semaphore)
-
-
-async def scrape_once() -> None:
+        await scrape_episode_mirrors(
+            client, writer, episodes_to_mirror, episode_semaphore, ajax_semaphore, nonce_cache, parse_pool
+        )
+
+
+async def scrape_anime_item(
+    item: dict,
+    client: ScraperClient,
+    writer: DbWriter,
+    episode_semaphore: asyncio.Semaphore,
+    ajax_semaphore: asyncio.Semaphore,
+    nonce_cache: Optional[NonceCache] = None,
+    parse_pool: Optional[ParsePool] = None,
+) -> None:
+    ctx = await fetch_anime_item(item, client, writer)
+    if ctx is None:
+        return
+    ctx = await parse_anime_page(ctx, parse_pool)
+    episodes_to_mirror = await writer.submit(partial(persist_anime_page, ctx=ctx))
+    logger.info("committed anime", extra={"url": ctx["href"], "episodes": len(ctx["episodes"])})
+    await mirror_anime_episodes(
+        client, writer, episodes_to_mirror, episode_semaphore, ajax_semaphore, nonce_cache, parse_pool
+    )
+
+
+def prepare_crawl_frontier(session: Session, list_url: str) -> bool:
+    resuming = settings.scraper_resume and has_unfinished_crawl_jobs(session)
+    if resuming:
+        reset_crawl_leases(session)
+    else:
+        if has_live_crawl_leases(session):
+            raise FrontierBusy("crawl frontier has live worker leases")
+        clear_crawl_jobs(session)
+        enqueue_crawl_jobs(session, "list", [(list_url, {})])
+    return resuming
+
+
+async def fetch_list_items(client: ScraperClient, list_url: str) -> List[dict]:
+    resp = await client.get(list_url)
+    list_items = parse_anime_list(resp.text)
+    if settings.scraper_max_items:
+        list_items = list_items[: settings.scraper_max_items]
+    logger.info("fetched list page", extra={"count": len(list_items)})
+    for item in list_items:
+        if not item.get("href"):
+            logger.warning("missing anime list fields", extra={"title": item.get("title")})
+    return list_items
+
+
+def enqueue_detail_jobs(session: Session, list_items: List[dict]) -> None:
+    enqueue_crawl_jobs(session, "detail", [(item.get("href"), item) for item in list_items])
+
+
+def save_list_items(session: Session, list_url: str, list_items: List[dict]) -> None:
+    enqueue_detail_jobs(session, list_items)
+    mark_crawl_job(session, "list", list_url, "done")
+
+
+def load_pending_jobs(session: Session) -> tuple[List[tuple[str, dict]], List[dict]]:
+    detail_jobs = [(job.job_key, crawl_job_payload(job)) for job in get_pending_crawl_jobs(session, "detail")]
+    episode_jobs = [crawl_job_payload(job) for job in get_pending_crawl_jobs(session, "episode_mirrors")]
+    return plan_detail_jobs(session, detail_jobs), episode_jobs
+
+
+async def _run_stage(worker: Callable[[], Awaitable[None]], count: int, outbox: Optional[asyncio.Queue], outbox_workers: int) -> None:
+    await asyncio.gather(*(worker() for _ in range(count)))
+    if outbox is not None:
+        for _ in range(outbox_workers):
+            await outbox.put(None)
+
+
+async def run_detail_jobs(
+    detail_jobs: List[tuple[str, dict]],
+    client: ScraperClient,
+    writer: DbWriter,
+    episode_semaphore: asyncio.Semaphore,
+    ajax_semaphore: asyncio.Semaphore,
+    nonce_cache: NonceCache,
+    parse_pool: Optional[ParsePool] = None,
+    planned: bool = False,
+) -> None:
+    fetch_workers = settings.scraper_concurrency
+    parse_workers = parse_pool.concurrency if parse_pool is not None else 1
+    mirror_workers = settings.scraper_concurrency
+    item_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.scraper_queue_size)
+    parse_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.scraper_queue_size)
+    mirror_queue: asyncio.Queue = asyncio.Queue(maxsize=settings.scraper_queue_size)
+
+    async def finish(job_key: str, exc: Optional[Exception] = None) -> None:
+        metrics.inc("scraper_items_total", result="failed" if exc is not None else "done")
+        if exc is not None:
+            logger.warning("anime task failed", extra={"url": job_key, "error": str(exc)})
+        await writer.submit(
+            partial(
+                mark_crawl_job,
+                kind="detail",
+                job_key=job_key,
+                state="failed" if exc is not None else "done",
+                error_message=str(exc) if exc is not None else None,
+            )
+        )
+
+    async def produce() -> None:
+        for job in detail_jobs:
+            await item_queue.put(job)
+
+    async def fetch_worker() -> None:
+        while (job := await item_queue.get()) is not None:
+            job_key, item = job
+            try:
+                ctx = await fetch_anime_item(item, client, writer, planned=planned)
+            except Exception as exc:  # noqa: BLE001
+                await finish(job_key, exc)
+                continue
+            if ctx is None:
+                await finish(job_key)
+                continue
+            ctx["job_key"] = job_key
+            await parse_queue.put(ctx)
+
+    async def parse_worker() -> None:
+        while (ctx := await parse_queue.get()) is not None:
+            try:
+                ctx = await parse_anime_page(ctx, parse_pool)
+            except Exception as exc:  # noqa: BLE001
+                await finish(ctx["job_key"], exc)
+                continue
+            persisted = await writer.enqueue(partial(persist_anime_page, ctx=ctx))
+            await mirror_queue.put((ctx, persisted))
+
+    async def mirror_worker() -> None:
+        while (entry := await mirror_queue.get()) is not None:
+            ctx, persisted = entry
+            try:
+                episodes_to_mirror = await persisted
+                logger.info(
+                    "committed anime",
+                    extra={"url": ctx["href"], "episodes": len(ctx["episodes"]), "unchanged": ctx.get("unchanged")},
+                )
+                await mirror_anime_episodes(
+                    client, writer, episodes_to_mirror, episode_semaphore, ajax_semaphore, nonce_cache, parse_pool
+                )
+            except Exception as exc:  # noqa: BLE001
+                await finish(ctx["job_key"], exc)
+                continue
+            await finish(ctx["job_key"])
+
+    await asyncio.gather(
+        _run_stage(produce, 1, item_queue, fetch_workers),
+        _run_stage(fetch_worker, fetch_workers, parse_queue, parse_workers),
+        _run_stage(parse_worker, parse_workers, mirror_queue, mirror_workers),
+        _run_stage(mirror_worker, mirror_workers, None, 0),
+    )
+
+
+async def scrape_once() -> dict:
+    metrics.reset()
+    started = time.monotonic()
     init_db()
-    async with ScraperClient() as client:
-        list_url = urljoin(settings.base_url, settings.list_path)
-        resp = await client.get(list_url)
-        list_items = parse_anime_list(resp.text)
-        if settings.scraper_max_items:
-            list_items = list_items[: settings.scraper_max_items]
-        logger.info("fetched list page", extra={"count": len(list_items)})
-        anime_semaphore = asyncio.Semaphore(settings.scraper_concurrency)
-        episode_semaphore = asyncio.Semaphore(settings.scraper_episode_concurrency)
-        ajax_semaphore = asyncio.Semaphore(settings.scraper_mirror_concurrency)
-        tasks: List[asyncio.Task] = []
+    list_url = urljoin(settings.base_url, settings.list_path)
+    if await run_in_session(AsyncSessionLocal, prepare_crawl_frontier, list_url, commit=True):
+        logger.info("resuming crawl frontier")
 
-        async def run_item(anime_item: dict) -> None:
-            async with anime_semaphore:
-                await scrape_anime_item(anime_item, client, episode_semaphore, ajax_semaphore)
+    async with ScraperClient() as client:
+        list_pending = bool(await run_in_session(AsyncSessionLocal, get_pending_crawl_jobs, "list"))
+        if list_pending:
+            list_items = await fetch_list_items(client, list_url)
+            await run_in_session(AsyncSessionLocal, save_list_items, list_url, list_items, commit=True)
 
-        for item in list_items:
-            tasks.append(asyncio.create_task(run_item(item)))
+        detail_jobs, episode_jobs = await run_in_session(AsyncSessionLocal, load_pending_jobs, commit=True)
 
-        if tasks:
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            for result in results:
-                if isinstance(result, BaseException):
-                    if isinstance(result, Exception):
-                        logger.warning("anime task failed", extra={"error": str(result)})
-                        continue
-                    raise result
+        episode_semaphore = asyncio.Semaphore(settings.scraper_episode_concurrency)
+        ajax_semaphore = asyncio.Semaphore(settings.scraper_mirror_concurrency)
+        nonce_cache = NonceCache(settings.scraper_nonce_ttl_seconds)
+
+        with create_parse_pool() as parse_pool:
+            async with DbWriter(
+                AsyncSessionLocal,
+                batch_size=settings.scraper_write_batch_size,
+                flush_interval=settings.scraper_write_flush_ms / 1000,
+                queue_size=settings.scraper_queue_size,
+            ) as writer:
+                if episode_jobs and settings.scraper_fetch_mirrors:
+                    logger.info("resuming episode mirror jobs", extra={"count": len(episode_jobs)})
+                    await scrape_episode_mirrors(
+                        client, writer, episode_jobs, episode_semaphore, ajax_semaphore, nonce_cache, parse_pool
+                    )
+                await run_detail_jobs(
+                    detail_jobs,
+                    client,
+                    writer,
+                    episode_semaphore,
+                    ajax_semaphore,
+                    nonce_cache,
+                    parse_pool,
+                    planned=True,
+                )
+    return publish_run_metrics(time.monotonic() - started)
 
 
 def run_blocking_scrape() -> None:
@@ -349,8 +808,8 @@ def run_blocking_scrape() -> None:
             format="%(asctime)s %(levelname)s %(name)s %(message)s",
         )
     logger.info("starting scrape run")
-    asyncio.run(scrape_once())
-    logger.info("scrape run completed")
+    summary = asyncio.run(scrape_once())
+    logger.info("scrape run completed: %s", json.dumps(summary, sort_keys=True))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,98 @@
+import asyncio
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+import httpx
+
+
+THROTTLE_STATUSES = {429, 503}
+
+
+def endpoint_class(url: str) -> str:
+    return "ajax" if httpx.URL(url).path.endswith("admin-ajax.php") else "page"
+
+
+class AdaptiveRateLimiter:
+    def __init__(
+        self,
+        rate: float,
+        min_rate: float,
+        max_rate: float,
+        increase: float,
+        backoff: float,
+        latency_factor: float,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_rate = min_rate
+        self.max_rate = max(max_rate, min_rate)
+        self.rate = min(max(rate, self.min_rate), self.max_rate)
+        self.increase = increase
+        self.backoff = backoff
+        self.latency_factor = latency_factor
+        self.latency_ewma: Optional[float] = None
+        self._clock = clock
+        self._tokens = 1.0
+        self._updated = clock()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(1.0, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = self._clock()
+                self._refill(now)
+                wait = self._paused_until - now
+                if wait <= 0 and self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return
+                if wait <= 0:
+                    wait = (1.0 - self._tokens) / self.rate
+                await asyncio.sleep(wait)
+
+    def _slow_down(self) -> None:
+        self.rate = max(self.min_rate, self.rate * self.backoff)
+
+    def record(self, status: Optional[int], latency: float, retry_after: Optional[float] = None) -> None:
+        if status is None or status in THROTTLE_STATUSES:
+            self._slow_down()
+            if retry_after:
+                self._paused_until = max(self._paused_until, self._clock() + retry_after)
+            return
+
+        if self.latency_ewma is not None and latency > self.latency_ewma * self.latency_factor:
+            self._slow_down()
+        elif status < 400:
+            self.rate = min(self.max_rate, self.rate + self.increase)
+        self.latency_ewma = latency if self.latency_ewma is None else 0.8 * self.latency_ewma + 0.2 * latency
+
+
+class RateLimiterRegistry:
+    def __init__(self, factory: Callable[[str], AdaptiveRateLimiter]) -> None:
+        self._factory = factory
+        self._limiters: Dict[Tuple[str, str], AdaptiveRateLimiter] = {}
+
+    def get(self, url: str) -> AdaptiveRateLimiter:
+        endpoint = endpoint_class(url)
+        key = (httpx.URL(url).host, endpoint)
+        limiter = self._limiters.get(key)
+        if limiter is None:
+            limiter = self._factory(endpoint)
+            self._limiters[key] = limiter
+        return limiter
+
+    def snapshot(self) -> Dict[Tuple[str, str], float]:
+        return {key: limiter.rate for key, limiter in self._limiters.items()}
+
+
+def parse_retry_after(resp: httpx.Response) -> Optional[float]:
+    value = resp.headers.get("retry-after")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
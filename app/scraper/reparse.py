@@ -0,0 +1,183 @@
+import argparse
+import asyncio
+import json
+import logging
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from app.core.config import get_settings
+from app.db.repository import (
+    get_anime_scrape_states,
+    get_episode_ids_for_urls,
+    get_mirror_scraped_at,
+    mirror_keys,
+)
+from app.db.async_repository import run_in_session
+from app.db.session import AsyncSessionLocal
+from app.db.writer import DbWriter
+from app.scraper.archive import PageArchive, archive_key
+from app.scraper.parsepool import PARSE_BACKENDS, ParsePool, run_parser
+from app.scraper.parsers import decode_embed_base64_to_iframe_src, parse_anime_list, parse_mirrors
+from app.scraper.pipeline import (
+    build_anime_context,
+    build_mirror_record,
+    init_db,
+    mirror_embed_form,
+    parse_anime_page,
+    persist_anime_page,
+    store_episode_mirrors,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+settings = get_settings()
+
+
+async def known_anime_items(archive: PageArchive) -> tuple[Dict[str, dict], Dict[str, Optional[datetime]]]:
+    states = await run_in_session(
+        AsyncSessionLocal, get_anime_scrape_states, chunk_size=settings.scraper_db_chunk_size
+    )
+    items = {
+        href: {"href": href, "title": state["title"], "status": state["status_list_page"]}
+        for href, state in states.items()
+    }
+    archived_list = archive.read_latest(urljoin(settings.base_url, settings.list_path))
+    if archived_list is not None:
+        for item in parse_anime_list(archived_list[0].decode("utf-8", "replace")):
+            if item.get("href"):
+                items[item["href"]] = item
+    return items, {href: state["last_scraped_at"] for href, state in states.items()}
+
+
+def is_stale(fetched_at: datetime, stored_at: Optional[datetime]) -> bool:
+    return stored_at is not None and fetched_at < stored_at
+
+
+def archived_embed(archive: PageArchive, ajax_url: str, mirror: dict) -> Optional[tuple[str, datetime]]:
+    archived = archive.read_latest(archive_key(ajax_url, mirror_embed_form(mirror, None)))
+    if archived is None:
+        return None
+    body, fetched_at = archived
+    try:
+        embed_b64 = json.loads(body).get("data")
+    except (ValueError, AttributeError):
+        return None
+    return (embed_b64, fetched_at) if embed_b64 else None
+
+
+async def reparse_archive(archive: PageArchive, parse_pool: Optional[ParsePool] = None, force: bool = False) -> dict:
+    init_db()
+    items, last_scraped_at = await known_anime_items(archive)
+    entries = archive.entries()
+    detail_urls = [href for href in items if href in entries]
+    concurrency = asyncio.Semaphore(max(1, (parse_pool.concurrency if parse_pool else 1) * 2))
+    counts = {"anime": 0, "episodes": 0, "mirrors": 0, "stale": 0, "failed": 0}
+
+    async with DbWriter(
+        AsyncSessionLocal,
+        batch_size=settings.scraper_write_batch_size,
+        flush_interval=settings.scraper_write_flush_ms / 1000,
+        queue_size=settings.scraper_queue_size,
+    ) as writer:
+
+        async def reparse_anime(href: str) -> None:
+            ctx = build_anime_context(items[href])
+            archived = archive.read_latest(href)
+            if ctx is None or archived is None:
+                return
+            body, fetched_at = archived
+            if not force and is_stale(fetched_at, last_scraped_at.get(href)):
+                counts["stale"] += 1
+                return
+            ctx["html"] = body.decode("utf-8", "replace")
+            ctx["scraped_at"] = fetched_at
+            try:
+                async with concurrency:
+                    ctx = await parse_anime_page(ctx, parse_pool)
+                await writer.submit(partial(persist_anime_page, ctx=ctx))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("reparse anime failed", extra={"url": href, "error": str(exc)})
+                counts["failed"] += 1
+                return
+            counts["anime"] += 1
+
+        await asyncio.gather(*(reparse_anime(href) for href in detail_urls))
+
+        episode_ids = await run_in_session(
+            AsyncSessionLocal,
+            get_episode_ids_for_urls,
+            [key for key in entries if key not in items],
+            settings.scraper_db_chunk_size,
+        )
+        mirror_scraped_at = await run_in_session(
+            AsyncSessionLocal, get_mirror_scraped_at, list(episode_ids.values()), settings.scraper_db_chunk_size
+        )
+        ajax_url = urljoin(settings.base_url, "/wp-admin/admin-ajax.php")
+
+        async def reparse_episode(episode_url: str, episode_id: int) -> None:
+            archived = archive.read_latest(episode_url)
+            if archived is None:
+                return
+            try:
+                records: List[dict] = []
+                async with concurrency:
+                    mirrors = await run_parser(parse_pool, parse_mirrors, archived[0].decode("utf-8", "replace"))
+                    for mirror in mirrors:
+                        embed = archived_embed(archive, ajax_url, mirror)
+                        if embed is None:
+                            continue
+                        embed_b64, fetched_at = embed
+                        stored_at = max(
+                            filter(None, (mirror_scraped_at.get(key) for key in mirror_keys(episode_id, mirror))),
+                            default=None,
+                        )
+                        if not force and is_stale(fetched_at, stored_at):
+                            counts["stale"] += 1
+                            continue
+                        iframe_src = await run_parser(parse_pool, decode_embed_base64_to_iframe_src, embed_b64)
+                        records.append(build_mirror_record(mirror, embed_b64, iframe_src, None, fetched_at))
+                if records:
+                    await writer.submit(partial(store_episode_mirrors, mirrors_by_episode={episode_id: records}))
+            except Exception as exc:  # noqa: BLE001
+                logger.warning("reparse episode failed", extra={"episode_url": episode_url, "error": str(exc)})
+                counts["failed"] += 1
+                return
+            counts["episodes"] += 1
+            counts["mirrors"] += len(records)
+
+        await asyncio.gather(*(reparse_episode(url, ep_id) for url, ep_id in episode_ids.items()))
+
+    logger.info("reparse completed", extra=counts)
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Rebuild anime, episode and mirror rows from the raw-page archive.")
+    parser.add_argument("--archive-dir", default=settings.scraper_archive_dir)
+    parser.add_argument("--backend", default="process", choices=PARSE_BACKENDS)
+    parser.add_argument("--workers", type=int, default=settings.scraper_parse_workers)
+    parser.add_argument(
+        "--force", action="store_true", help="also apply archived pages older than the rows already stored"
+    )
+    args = parser.parse_args(argv)
+
+    if not logging.getLogger().hasHandlers():
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s %(levelname)s %(name)s %(message)s",
+        )
+
+    async def run() -> dict:
+        with ParsePool(args.backend, args.workers) as parse_pool:
+            return await reparse_archive(PageArchive(args.archive_dir), parse_pool, force=args.force)
+
+    counts = asyncio.run(run())
+    print(json.dumps(counts))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,267 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+import signal
+import statistics
+import time
+from datetime import datetime, timedelta
+from functools import partial
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import urljoin
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.metrics import publish_run_metrics, write_metrics_file
+from app.db.repository import (
+    get_anime_scrape_states,
+    get_episode_first_seen,
+    get_fully_mirrored_anime_ids,
+    prune_crawl_jobs,
+)
+from app.db.async_repository import run_in_session
+from app.db.session import AsyncSessionLocal
+from app.db.writer import DbWriter
+from app.scraper.client import ScraperClient
+from app.scraper.parsepool import create_parse_pool
+from app.scraper.pipeline import (
+    NonceCache,
+    fetch_list_items,
+    init_db,
+    normalize_status,
+    scrape_anime_item,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+settings = get_settings()
+
+
+CADENCE_FRACTION = 0.5
+MIN_EPISODE_GAP = timedelta(hours=1)
+RETRY_DELAY = timedelta(minutes=5)
+
+
+class RefreshSchedule:
+    def __init__(self) -> None:
+        self._heap: List[tuple[datetime, int, str]] = []
+        self._due: Dict[str, datetime] = {}
+        self._counter = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._due
+
+    def push(self, key: str, due: datetime) -> None:
+        self._due[key] = due
+        heapq.heappush(self._heap, (due, next(self._counter), key))
+
+    def discard(self, key: str) -> None:
+        self._due.pop(key, None)
+
+    def _drop_stale(self) -> None:
+        while self._heap:
+            due, _, key = self._heap[0]
+            if self._due.get(key) == due:
+                return
+            heapq.heappop(self._heap)
+
+    def next_due(self) -> Optional[datetime]:
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime, limit: int) -> List[str]:
+        keys: List[str] = []
+        while len(keys) < limit:
+            self._drop_stale()
+            if not self._heap or self._heap[0][0] > now:
+                break
+            _, _, key = heapq.heappop(self._heap)
+            del self._due[key]
+            keys.append(key)
+        return keys
+
+
+def observed_cadence(first_seen: Sequence[datetime]) -> Optional[timedelta]:
+    ordered = sorted(first_seen)
+    gaps = [later - earlier for earlier, later in zip(ordered, ordered[1:]) if later - earlier >= MIN_EPISODE_GAP]
+    if not gaps:
+        return None
+    return statistics.median(gaps)
+
+
+def refresh_interval(cadence: Optional[timedelta]) -> timedelta:
+    floor = timedelta(hours=settings.scraper_ongoing_refresh_hours)
+    ceiling = max(floor, timedelta(hours=settings.scraper_max_refresh_hours))
+    if cadence is None:
+        return floor
+    return min(ceiling, max(floor, cadence * CADENCE_FRACTION))
+
+
+def next_due_at(state: dict, now: datetime) -> Optional[datetime]:
+    last_scraped_at = state.get("last_scraped_at")
+    if last_scraped_at is None:
+        return now
+    list_status = normalize_status(state.get("status_list_page"))
+    if list_status == "completed" and state.get("fully_mirrored"):
+        return None
+    if list_status == "ongoing" and normalize_status(state.get("status_detail")) == "ongoing":
+        return last_scraped_at + refresh_interval(observed_cadence(state.get("episode_first_seen") or []))
+    return last_scraped_at + timedelta(hours=settings.scraper_ongoing_refresh_hours)
+
+
+def load_refresh_states(session: Session, source_urls: Optional[Sequence[str]] = None) -> Dict[str, dict]:
+    chunk_size = settings.scraper_db_chunk_size
+    states = get_anime_scrape_states(session, source_urls, chunk_size)
+    completed_ids = [
+        state["anime_id"]
+        for state in states.values()
+        if normalize_status(state["status_list_page"]) == "completed"
+    ]
+    ongoing_ids = [
+        state["anime_id"]
+        for state in states.values()
+        if normalize_status(state["status_list_page"]) == "ongoing"
+    ]
+    fully_mirrored = get_fully_mirrored_anime_ids(session, completed_ids, chunk_size)
+    first_seen = get_episode_first_seen(session, ongoing_ids, chunk_size)
+    for state in states.values():
+        state["fully_mirrored"] = state["anime_id"] in fully_mirrored
+        state["episode_first_seen"] = first_seen.get(state["anime_id"], [])
+    return states
+
+
+def anime_item(state: dict) -> dict:
+    return {"href": state["source_url"], "title": state["title"], "status": state["status_list_page"]}
+
+
+async def run_daemon(stop_event: Optional[asyncio.Event] = None) -> None:
+    stop_event = stop_event or asyncio.Event()
+    started = time.monotonic()
+    init_db()
+    list_url = urljoin(settings.base_url, settings.list_path)
+    list_refresh = timedelta(minutes=settings.scraper_list_refresh_minutes)
+    schedule = RefreshSchedule()
+    items: Dict[str, dict] = {}
+
+    now = datetime.utcnow()
+    for href, state in (await run_in_session(AsyncSessionLocal, load_refresh_states)).items():
+        items[href] = anime_item(state)
+        due = next_due_at(state, now)
+        if due is not None:
+            schedule.push(href, due)
+    schedule.push(list_url, now)
+    logger.info("scheduler loaded", extra={"known": len(items), "scheduled": len(schedule) - 1})
+
+    episode_semaphore = asyncio.Semaphore(settings.scraper_episode_concurrency)
+    ajax_semaphore = asyncio.Semaphore(settings.scraper_mirror_concurrency)
+    nonce_cache = NonceCache(settings.scraper_nonce_ttl_seconds)
+
+    async def refresh_list(client: ScraperClient) -> None:
+        try:
+            list_items = await fetch_list_items(client, list_url)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("list refresh failed", extra={"url": list_url, "error": str(exc)})
+            list_items = []
+        discovered = 0
+        for item in list_items:
+            href = item.get("href")
+            if not href:
+                continue
+            if href not in items:
+                schedule.push(href, datetime.utcnow())
+                discovered += 1
+            items[href] = item
+        schedule.push(list_url, datetime.utcnow() + list_refresh)
+        logger.info("list refreshed", extra={"count": len(list_items), "discovered": discovered})
+
+    async with ScraperClient() as client:
+        with create_parse_pool() as parse_pool:
+            async with DbWriter(
+                AsyncSessionLocal,
+                batch_size=settings.scraper_write_batch_size,
+                flush_interval=settings.scraper_write_flush_ms / 1000,
+                queue_size=settings.scraper_queue_size,
+            ) as writer:
+                while not stop_event.is_set():
+                    now = datetime.utcnow()
+                    keys = schedule.pop_due(now, settings.scraper_concurrency)
+                    if not keys:
+                        next_due = schedule.next_due()
+                        timeout = (next_due - now).total_seconds() if next_due else list_refresh.total_seconds()
+                        with contextlib.suppress(asyncio.TimeoutError):
+                            await asyncio.wait_for(stop_event.wait(), timeout=max(0.0, timeout))
+                        continue
+
+                    if list_url in keys:
+                        keys.remove(list_url)
+                        await refresh_list(client)
+                    if not keys:
+                        continue
+
+                    await writer.submit(partial(prune_crawl_jobs, kind="episode_mirrors"))
+                    results = await asyncio.gather(
+                        *(
+                            scrape_anime_item(
+                                items[key],
+                                client,
+                                writer,
+                                episode_semaphore,
+                                ajax_semaphore,
+                                nonce_cache,
+                                parse_pool,
+                            )
+                            for key in keys
+                        ),
+                        return_exceptions=True,
+                    )
+                    for key, result in zip(keys, results):
+                        if isinstance(result, Exception):
+                            logger.warning("anime refresh failed", extra={"url": key, "error": str(result)})
+                        elif isinstance(result, BaseException):
+                            raise result
+
+                    states = await run_in_session(AsyncSessionLocal, load_refresh_states, keys)
+                    now = datetime.utcnow()
+                    for key in keys:
+                        state = states.get(key)
+                        due = next_due_at(state, now) if state else now + RETRY_DELAY
+                        if due is not None:
+                            schedule.push(key, max(due, now + RETRY_DELAY))
+                    next_due = schedule.next_due()
+                    logger.info(
+                        "refreshed due anime",
+                        extra={"count": len(keys), "next_due": next_due.isoformat() if next_due else None},
+                    )
+                    write_metrics_file()
+    publish_run_metrics(time.monotonic() - started)
+
+
+def run_blocking_daemon() -> None:
+    if not logging.getLogger().hasHandlers():
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s %(levelname)s %(name)s %(message)s",
+        )
+
+    async def main() -> None:
+        stop_event = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            with contextlib.suppress(NotImplementedError):
+                loop.add_signal_handler(sig, stop_event.set)
+        await run_daemon(stop_event)
+
+    logger.info("starting scrape scheduler")
+    asyncio.run(main())
+    logger.info("scrape scheduler stopped")
+
+
+if __name__ == "__main__":
+    run_blocking_daemon()
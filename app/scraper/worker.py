@@ -0,0 +1,309 @@
+import argparse
+import asyncio
+import contextlib
+import logging
+import multiprocessing
+import os
+import socket
+import time
+import uuid
+from functools import partial
+from typing import Dict, List, Optional
+from urllib.parse import urljoin
+
+from sqlalchemy.orm import Session
+
+from app.core.config import get_settings
+from app.core.metrics import metrics, publish_run_metrics, timed_acquire
+from app.db.repository import (
+    claim_crawl_jobs,
+    clear_crawl_jobs,
+    complete_crawl_job,
+    enqueue_crawl_jobs,
+    has_unfinished_crawl_jobs,
+    renew_crawl_leases,
+)
+from app.db.async_repository import run_in_session
+from app.db.session import AsyncSessionLocal, SessionLocal
+from app.db.writer import DbWriter
+from app.scraper.client import ScraperClient
+from app.scraper.parsepool import ParsePool, create_parse_pool
+from app.scraper.pipeline import (
+    NonceCache,
+    enqueue_detail_jobs,
+    enqueue_pending_job_keys,
+    episode_mirror_jobs,
+    fetch_anime_item,
+    fetch_episode_mirror_data,
+    fetch_list_items,
+    init_db,
+    parse_anime_page,
+    persist_anime_page,
+    store_episode_mirrors,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+settings = get_settings()
+
+
+CLAIM_ORDER = ("list", "episode_mirrors", "detail")
+
+
+class LeaseLost(Exception):
+    pass
+
+
+def make_worker_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+def seed_crawl_frontier(list_url: str, force: bool = False) -> bool:
+    with SessionLocal() as session:
+        if has_unfinished_crawl_jobs(session) and not force:
+            return False
+        clear_crawl_jobs(session)
+        enqueue_crawl_jobs(session, "list", [(list_url, {})])
+        session.commit()
+    return True
+
+
+def claim_leases(session: Session, worker_id: str, limit: int) -> List[tuple[int, str, str, dict]]:
+    claimed: List[tuple[int, str, str, dict]] = []
+    for kind in CLAIM_ORDER:
+        remaining = limit - len(claimed)
+        if remaining <= 0:
+            break
+        for job_id, job_key, payload in claim_crawl_jobs(
+            session, kind, worker_id, remaining, settings.scraper_lease_seconds
+        ):
+            claimed.append((job_id, kind, job_key, payload))
+    return claimed
+
+
+async def claim_jobs(worker_id: str, limit: int) -> List[tuple[int, str, str, dict]]:
+    return await run_in_session(AsyncSessionLocal, claim_leases, worker_id, limit, commit=True)
+
+
+async def renew_leases(worker_id: str, job_ids: List[int]) -> int:
+    return await run_in_session(
+        AsyncSessionLocal, renew_crawl_leases, worker_id, job_ids, settings.scraper_lease_seconds, commit=True
+    )
+
+
+async def frontier_active() -> bool:
+    return await run_in_session(AsyncSessionLocal, has_unfinished_crawl_jobs)
+
+
+def finish_leased_job(
+    session: Session, job_id: int, worker_id: str, state: str, error_message: Optional[str] = None
+) -> None:
+    if not complete_crawl_job(session, job_id, worker_id, state, error_message):
+        raise LeaseLost(f"lease on crawl job {job_id} is no longer held by {worker_id}")
+
+
+def save_leased_list(session: Session, job_id: int, worker_id: str, list_items: List[dict]) -> None:
+    finish_leased_job(session, job_id, worker_id, "done")
+    enqueue_detail_jobs(session, list_items)
+
+
+def save_leased_anime_page(session: Session, job_id: int, worker_id: str, ctx: dict) -> int:
+    finish_leased_job(session, job_id, worker_id, "done")
+    episodes_to_mirror = persist_anime_page(session, ctx)
+    if not settings.scraper_fetch_mirrors:
+        return 0
+    return len(enqueue_pending_job_keys(session, "episode_mirrors", episode_mirror_jobs(episodes_to_mirror)))
+
+
+def save_leased_episode_mirrors(
+    session: Session, job_id: int, worker_id: str, episode_id: int, mirrors: List[dict]
+) -> None:
+    finish_leased_job(session, job_id, worker_id, "done")
+    store_episode_mirrors(session, {episode_id: mirrors})
+
+
+async def process_job(
+    job: tuple[int, str, str, dict],
+    worker_id: str,
+    client: ScraperClient,
+    writer: DbWriter,
+    episode_semaphore: asyncio.Semaphore,
+    ajax_semaphore: asyncio.Semaphore,
+    nonce_cache: NonceCache,
+    parse_pool: Optional[ParsePool] = None,
+) -> None:
+    job_id, kind, job_key, payload = job
+    try:
+        if kind == "list":
+            list_items = await fetch_list_items(client, job_key)
+            await writer.submit(partial(save_leased_list, job_id=job_id, worker_id=worker_id, list_items=list_items))
+        elif kind == "detail":
+            ctx = await fetch_anime_item(payload, client, writer)
+            if ctx is None:
+                await writer.submit(partial(finish_leased_job, job_id=job_id, worker_id=worker_id, state="done"))
+                return
+            ctx = await parse_anime_page(ctx, parse_pool)
+            queued = await writer.submit(
+                partial(save_leased_anime_page, job_id=job_id, worker_id=worker_id, ctx=ctx)
+            )
+            metrics.inc("scraper_items_total", result="done")
+            logger.info(
+                "committed anime",
+                extra={"url": ctx["href"], "episodes": len(ctx["episodes"]), "mirror_jobs": queued},
+            )
+        elif kind == "episode_mirrors":
+            async with timed_acquire(episode_semaphore, "episode"):
+                mirrors = await fetch_episode_mirror_data(client, job_key, ajax_semaphore, nonce_cache, parse_pool)
+            await writer.submit(
+                partial(
+                    save_leased_episode_mirrors,
+                    job_id=job_id,
+                    worker_id=worker_id,
+                    episode_id=int(payload["episode_id"]),
+                    mirrors=mirrors,
+                )
+            )
+        else:
+            raise ValueError(f"unknown crawl job kind: {kind}")
+    except LeaseLost as exc:
+        logger.warning("crawl job lease lost", extra={"kind": kind, "job_key": job_key, "error": str(exc)})
+    except Exception as exc:  # noqa: BLE001
+        logger.warning("crawl job failed", extra={"kind": kind, "job_key": job_key, "error": str(exc)})
+        if kind == "detail":
+            metrics.inc("scraper_items_total", result="failed")
+        try:
+            await writer.submit(
+                partial(
+                    finish_leased_job, job_id=job_id, worker_id=worker_id, state="failed", error_message=str(exc)
+                )
+            )
+        except Exception as mark_exc:  # noqa: BLE001
+            logger.warning("crawl job release failed", extra={"job_key": job_key, "error": str(mark_exc)})
+
+
+async def heartbeat(worker_id: str, in_flight: Dict[int, asyncio.Task]) -> None:
+    while True:
+        await asyncio.sleep(settings.scraper_lease_seconds / 3)
+        job_ids = list(in_flight)
+        if not job_ids:
+            continue
+        try:
+            renewed = await renew_leases(worker_id, job_ids)
+        except Exception as exc:  # noqa: BLE001
+            logger.warning("lease heartbeat failed", extra={"worker_id": worker_id, "error": str(exc)})
+            continue
+        if renewed < len(job_ids):
+            logger.warning(
+                "some crawl job leases expired",
+                extra={"worker_id": worker_id, "held": len(job_ids), "renewed": renewed},
+            )
+
+
+async def run_worker(worker_id: Optional[str] = None, exit_when_idle: bool = True) -> int:
+    worker_id = worker_id or make_worker_id()
+    started = time.monotonic()
+    init_db()
+    logger.info("starting crawl worker", extra={"worker_id": worker_id})
+    processed = 0
+    in_flight: Dict[int, asyncio.Task] = {}
+    episode_semaphore = asyncio.Semaphore(settings.scraper_episode_concurrency)
+    ajax_semaphore = asyncio.Semaphore(settings.scraper_mirror_concurrency)
+    nonce_cache = NonceCache(settings.scraper_nonce_ttl_seconds)
+
+    async with ScraperClient() as client:
+        with create_parse_pool() as parse_pool:
+            async with DbWriter(
+                AsyncSessionLocal,
+                batch_size=settings.scraper_write_batch_size,
+                flush_interval=settings.scraper_write_flush_ms / 1000,
+                queue_size=settings.scraper_queue_size,
+            ) as writer:
+                heartbeat_task = asyncio.create_task(heartbeat(worker_id, in_flight))
+                try:
+                    while True:
+                        capacity = settings.scraper_concurrency - len(in_flight)
+                        for job in await claim_jobs(worker_id, capacity) if capacity > 0 else []:
+                            in_flight[job[0]] = asyncio.create_task(
+                                process_job(
+                                    job,
+                                    worker_id,
+                                    client,
+                                    writer,
+                                    episode_semaphore,
+                                    ajax_semaphore,
+                                    nonce_cache,
+                                    parse_pool,
+                                )
+                            )
+                        if not in_flight:
+                            if exit_when_idle and not await frontier_active():
+                                break
+                            await asyncio.sleep(settings.scraper_worker_poll_seconds)
+                            continue
+                        await asyncio.wait(
+                            list(in_flight.values()),
+                            timeout=settings.scraper_worker_poll_seconds,
+                            return_when=asyncio.FIRST_COMPLETED,
+                        )
+                        for job_id, task in list(in_flight.items()):
+                            if task.done():
+                                del in_flight[job_id]
+                                task.result()
+                                processed += 1
+                finally:
+                    heartbeat_task.cancel()
+                    with contextlib.suppress(asyncio.CancelledError):
+                        await heartbeat_task
+                    for task in in_flight.values():
+                        task.cancel()
+                    await asyncio.gather(*in_flight.values(), return_exceptions=True)
+    logger.info("crawl worker finished", extra={"worker_id": worker_id, "processed": processed})
+    publish_run_metrics(time.monotonic() - started)
+    return processed
+
+
+def configure_logging() -> None:
+    if not logging.getLogger().hasHandlers():
+        logging.basicConfig(
+            level=logging.INFO,
+            format="%(asctime)s %(levelname)s %(name)s %(message)s",
+        )
+
+
+def run_worker_process(exit_when_idle: bool = True) -> None:
+    configure_logging()
+    asyncio.run(run_worker(exit_when_idle=exit_when_idle))
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Claim and process crawl jobs from the shared crawl_job table.")
+    parser.add_argument("--seed", action="store_true", help="enqueue a new list job when no crawl is in progress")
+    parser.add_argument("--force", action="store_true", help="with --seed, drop unfinished jobs and start over")
+    parser.add_argument("--processes", type=int, default=1, help="number of local worker processes")
+    parser.add_argument("--forever", action="store_true", help="keep polling after the frontier is drained")
+    args = parser.parse_args(argv)
+
+    configure_logging()
+    if args.seed:
+        init_db()
+        if seed_crawl_frontier(urljoin(settings.base_url, settings.list_path), force=args.force):
+            logger.info("seeded crawl frontier")
+        else:
+            logger.info("crawl frontier already active")
+
+    exit_when_idle = not args.forever
+    if args.processes <= 1:
+        run_worker_process(exit_when_idle)
+        return
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=run_worker_process, args=(exit_when_idle,)) for _ in range(args.processes)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join()
+
+
+if __name__ == "__main__":
+    main()
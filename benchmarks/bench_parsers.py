@@ -0,0 +1,142 @@
+import argparse
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from importlib import metadata
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.scraper.parsers import (
+    decode_embed_base64_to_iframe_src,
+    parse_anime_list,
+    parse_detail,
+    parse_detail_page,
+    parse_episodes,
+    parse_mirrors,
+)
+from benchmarks.corpus import build_corpus
+
+
+PARSERS: List[Tuple[str, Callable, str]] = [
+    ("parse_anime_list", parse_anime_list, "list"),
+    ("parse_detail", parse_detail, "detail"),
+    ("parse_episodes", parse_episodes, "detail"),
+    ("parse_detail_page", parse_detail_page, "detail"),
+    ("parse_mirrors", parse_mirrors, "episode"),
+    ("decode_embed_base64_to_iframe_src", decode_embed_base64_to_iframe_src, "embed"),
+]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def bench_case(fn: Callable, page: str, iterations: int, warmup: int) -> dict:
+    for _ in range(warmup):
+        fn(page)
+
+    timings: List[float] = []
+    for _ in range(iterations):
+        started = time.perf_counter()
+        fn(page)
+        timings.append(time.perf_counter() - started)
+
+    tracemalloc.start()
+    fn(page)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    total = sum(timings)
+    return {
+        "iterations": iterations,
+        "pages_per_sec": iterations / total if total else None,
+        "latency_ms": {
+            "mean": statistics.fmean(timings) * 1000,
+            "p50": _percentile(timings, 50) * 1000,
+            "p95": _percentile(timings, 95) * 1000,
+            "max": max(timings) * 1000,
+        },
+        "peak_memory_kb": peak / 1024,
+    }
+
+
+def run(iterations: int, warmup: int, only: Optional[List[str]] = None) -> dict:
+    corpus = build_corpus()
+    results = []
+    for name, fn, kind in PARSERS:
+        if only and name not in only:
+            continue
+        for page_name, page in corpus[kind].items():
+            result = bench_case(fn, page, iterations, warmup)
+            result.update({"function": name, "page": page_name, "page_bytes": len(page)})
+            results.append(result)
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "selectolax": metadata.version("selectolax"),
+        "results": results,
+    }
+
+
+def compare(current: dict, baseline: dict) -> List[dict]:
+    base_index: Dict[Tuple[str, str], dict] = {
+        (row["function"], row["page"]): row for row in baseline.get("results", [])
+    }
+    rows = []
+    for row in current["results"]:
+        base = base_index.get((row["function"], row["page"]))
+        if not base or not base.get("pages_per_sec") or not row.get("pages_per_sec"):
+            continue
+        rows.append(
+            {
+                "function": row["function"],
+                "page": row["page"],
+                "speedup": row["pages_per_sec"] / base["pages_per_sec"],
+            }
+        )
+    return rows
+
+
+def format_table(report: dict) -> str:
+    lines = [f"{'function':<36}{'page':<18}{'pages/s':>12}{'p50 ms':>10}{'p95 ms':>10}{'peak KiB':>11}"]
+    for row in report["results"]:
+        lines.append(
+            f"{row['function']:<36}{row['page']:<18}{row['pages_per_sec']:>12.1f}"
+            f"{row['latency_ms']['p50']:>10.3f}{row['latency_ms']['p95']:>10.3f}{row['peak_memory_kb']:>11.1f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Micro-benchmark the HTML parsers against a synthetic corpus.")
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--warmup", type=int, default=3)
+    parser.add_argument("--only", nargs="*", help="limit to these parser function names")
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    parser.add_argument("--compare", help="baseline JSON report to compare against")
+    args = parser.parse_args(argv)
+
+    report = run(args.iterations, args.warmup, args.only)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            report["comparison"] = compare(report, json.load(fh))
+
+    print(format_table(report), file=sys.stderr)
+    for row in report.get("comparison", []):
+        print(f"{row['function']:<36}{row['page']:<18}x{row['speedup']:.2f}", file=sys.stderr)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
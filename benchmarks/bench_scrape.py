@@ -0,0 +1,198 @@
+import argparse
+import asyncio
+import json
+import platform
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.core.config import get_settings
+from app.db.session import async_db_url
+from app.scraper import pipeline
+from app.scraper.client import ScraperClient
+from app.scraper.parsepool import PARSE_BACKENDS
+from benchmarks.site import SyntheticSite
+
+
+settings = get_settings()
+
+DELAY_SETTINGS = ("scraper_delay_min", "scraper_delay_max", "scraper_ajax_delay_min", "scraper_ajax_delay_max")
+
+
+@contextmanager
+def benchmark_environment(site: SyntheticSite, db_path: Path, **overrides: object) -> Iterator[None]:
+    values = {name: 0 for name in DELAY_SETTINGS}
+    values.update(
+        {
+            "base_url": site.base_url,
+            "list_path": site.list_path,
+            "scraper_max_items": None,
+            "scraper_resume": False,
+            "scraper_fetch_mirrors": True,
+            "scraper_adaptive_rate": False,
+            "scraper_http_cache": False,
+            "scraper_archive": False,
+            "scraper_metrics_file": None,
+        }
+    )
+    values.update(overrides)
+    saved = {name: getattr(settings, name) for name in values}
+    saved_pipeline = (pipeline.AsyncSessionLocal, pipeline.engine, pipeline.ScraperClient)
+
+    engine = create_engine(f"sqlite:///{db_path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(async_db_url(str(engine.url)))
+    for name, value in values.items():
+        setattr(settings, name, value)
+    pipeline.AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    pipeline.engine = engine
+    pipeline.ScraperClient = lambda: ScraperClient(transport=site.transport())
+    try:
+        yield
+    finally:
+        pipeline.AsyncSessionLocal, pipeline.engine, pipeline.ScraperClient = saved_pipeline
+        for name, value in saved.items():
+            setattr(settings, name, value)
+        asyncio.run(async_engine.dispose())
+        engine.dispose()
+
+
+def run(
+    anime: int = 50,
+    episodes: int = 12,
+    mirrors_per_quality: int = 1,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    concurrency: int = settings.scraper_concurrency,
+    episode_concurrency: int = settings.scraper_episode_concurrency,
+    mirror_concurrency: int = settings.scraper_mirror_concurrency,
+    parse_backend: str = "inline",
+    write_batch_size: int = settings.scraper_write_batch_size,
+    runs: int = 1,
+    seed: int = 0,
+) -> dict:
+    site = SyntheticSite(
+        anime=anime,
+        episodes=episodes,
+        mirrors_per_quality=mirrors_per_quality,
+        latency_ms=latency_ms,
+        jitter_ms=jitter_ms,
+        error_rate=error_rate,
+        seed=seed,
+    )
+    config = {
+        "scraper_concurrency": max(1, concurrency),
+        "scraper_episode_concurrency": max(1, episode_concurrency),
+        "scraper_mirror_concurrency": max(1, mirror_concurrency),
+        "scraper_parse_backend": parse_backend,
+        "scraper_write_batch_size": max(1, write_batch_size),
+    }
+    results = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        with benchmark_environment(site, Path(tmp_dir) / "bench.db", **config):
+            for index in range(runs):
+                site.requests.clear()
+                site.errors.clear()
+                started = time.perf_counter()
+                summary = asyncio.run(pipeline.scrape_once())
+                wall = time.perf_counter() - started
+                results.append(
+                    {
+                        "run": index + 1,
+                        "wall_seconds": round(wall, 3),
+                        "items": summary["items"],
+                        "items_per_sec": summary["items_per_sec"],
+                        "requests": summary["requests"],
+                        "requests_per_sec": summary["requests_per_sec"],
+                        "retries": summary["retries"],
+                        "db_write_seconds": summary["db_write_seconds"],
+                        "db_commit_seconds": summary["db_commit_seconds"],
+                        "parse_seconds": summary["parse_seconds"],
+                        "mirror_success_rate": summary["mirror_success_rate"],
+                        "skipped": summary["skipped"],
+                        "site_requests": dict(site.requests),
+                        "site_errors": dict(site.errors),
+                    }
+                )
+    return {
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "site": {
+            "anime": anime,
+            "episodes": episodes,
+            "mirrors_per_episode": mirrors_per_quality * 3,
+            "latency_ms": latency_ms,
+            "jitter_ms": jitter_ms,
+            "error_rate": error_rate,
+        },
+        "config": config,
+        "results": results,
+    }
+
+
+def format_table(report: dict) -> str:
+    lines = [
+        f"{'run':<5}{'wall s':>9}{'items':>8}{'items/s':>10}{'requests':>10}{'req/s':>10}"
+        f"{'retries':>9}{'db write s':>12}{'db commit s':>13}"
+    ]
+    for row in report["results"]:
+        lines.append(
+            f"{row['run']:<5}{row['wall_seconds']:>9.3f}{int(sum(row['items'].values())):>8}"
+            f"{row['items_per_sec'] or 0:>10.2f}{row['requests']:>10}{row['requests_per_sec'] or 0:>10.1f}"
+            f"{row['retries']:>9}{row['db_write_seconds']:>12.3f}{row['db_commit_seconds']:>13.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Benchmark scrape_once end-to-end against a synthetic site.")
+    parser.add_argument("--anime", type=int, default=50)
+    parser.add_argument("--episodes", type=int, default=12)
+    parser.add_argument("--mirrors-per-quality", type=int, default=1)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, default=settings.scraper_concurrency)
+    parser.add_argument("--episode-concurrency", type=int, default=settings.scraper_episode_concurrency)
+    parser.add_argument("--mirror-concurrency", type=int, default=settings.scraper_mirror_concurrency)
+    parser.add_argument("--parse-backend", default="inline", choices=PARSE_BACKENDS)
+    parser.add_argument("--write-batch-size", type=int, default=settings.scraper_write_batch_size)
+    parser.add_argument("--runs", type=int, default=1, help="repeat against the same database to measure re-scrapes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write the JSON report to this file instead of stdout")
+    args = parser.parse_args(argv)
+
+    report = run(
+        anime=args.anime,
+        episodes=args.episodes,
+        mirrors_per_quality=args.mirrors_per_quality,
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        concurrency=args.concurrency,
+        episode_concurrency=args.episode_concurrency,
+        mirror_concurrency=args.mirror_concurrency,
+        parse_backend=args.parse_backend,
+        write_batch_size=args.write_batch_size,
+        runs=max(1, args.runs),
+        seed=args.seed,
+    )
+    print(format_table(report), file=sys.stderr)
+
+    payload = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(payload)
+    else:
+        print(payload)
+
+
+if __name__ == "__main__":
+    main()
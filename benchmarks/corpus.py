@@ -0,0 +1,116 @@
+import base64
+import json
+import random
+from typing import Dict, List
+
+
+GENRES = ["Action", "Adventure", "Comedy", "Drama", "Fantasy", "Romance", "Slice of Life", "Sports"]
+QUALITIES = ["360p", "480p", "720p"]
+PROVIDERS = ["ondesu", "odstream", "desudrive", "filedon", "mega"]
+
+
+def anime_slug(index: int) -> str:
+    return f"anime-{index:05d}-sub-indo"
+
+
+def list_page(base_url: str, items: int, ongoing_every: int = 5) -> str:
+    rows: List[str] = []
+    for index in range(items):
+        status = "<color>On-Going</color>" if ongoing_every and index % ongoing_every == 0 else ""
+        rows.append(
+            f'<li><a class="hodebgst" href="{base_url}/anime/{anime_slug(index)}/" '
+            f'title="Anime {index}">Anime {index} Title{status}</a></li>'
+        )
+    return (
+        "<html><body><div class=\"venser\"><div class=\"daftarkartun\">"
+        f"<ul>{''.join(rows)}</ul>"
+        "</div></div></body></html>"
+    )
+
+
+def detail_page(base_url: str, index: int, episodes: int, ongoing: bool = False, seed: int = 0) -> str:
+    rng = random.Random(seed + index)
+    genres = rng.sample(GENRES, 3)
+    genre_links = ", ".join(f'<a href="{base_url}/genres/{g.lower()}/">{g}</a>' for g in genres)
+    status = "Ongoing" if ongoing else "Completed"
+    fields = [
+        ("Judul", f"Anime {index} Title"),
+        ("Japanese", f"アニメ {index}"),
+        ("Skor", f"{rng.uniform(5, 9):.2f}"),
+        ("Produser", "Aniplex, Dentsu"),
+        ("Tipe", "TV"),
+        ("Status", status),
+        ("Total Episode", str(episodes) if not ongoing else "Unknown"),
+        ("Durasi", "24 Menit"),
+        ("Tanggal Rilis", "Jan 01, 2024"),
+        ("Studio", "Studio Bench"),
+    ]
+    info = "".join(f"<p><span><b>{label}</b>: {value}</span></p>" for label, value in fields)
+    info += f"<p><span><b>Genre</b>: {genre_links}</span></p>"
+    synopsis = "".join(f"<p>Synopsis paragraph {n} for anime {index}. " + "Lorem ipsum " * 20 + "</p>" for n in range(3))
+    episode_rows = "".join(
+        f'<li><span><a href="{base_url}/episode/{anime_slug(index)}-episode-{n}/">'
+        f"Anime {index} Episode {n} Subtitle Indonesia</a></span>"
+        f'<span class="zeebr">{(n % 28) + 1} Jan,24</span></li>'
+        for n in range(episodes, 0, -1)
+    )
+    return (
+        "<html><body><div class=\"venser\">"
+        f'<div class="fotoanime"><img src="{base_url}/img/{index}.jpg"/>'
+        f'<div class="infozin"><div class="infozingle">{info}</div></div>'
+        f'<div class="sinopc">{synopsis}</div></div>'
+        f'<div class="episodelist"><ul>{episode_rows}</ul></div>'
+        "</div></body></html>"
+    )
+
+
+def mirror_data_content(mirror_id: int, i: int, quality: str) -> str:
+    return base64.b64encode(json.dumps({"id": mirror_id, "i": i, "q": quality}).encode()).decode()
+
+
+def episode_page(episode_id: int, mirrors_per_quality: int) -> str:
+    blocks: List[str] = []
+    for quality in QUALITIES:
+        links = "".join(
+            f'<li><a href="#" data-content="{mirror_data_content(episode_id, i, quality)}">'
+            f"{PROVIDERS[i % len(PROVIDERS)]}</a></li>"
+            for i in range(mirrors_per_quality)
+        )
+        blocks.append(f'<ul class="m{quality}">{links}</ul>')
+    return (
+        "<html><body><div class=\"venutama\">"
+        f'<div class="mirrorstream">{"".join(blocks)}</div>'
+        "</div></body></html>"
+    )
+
+
+def embed_payload(mirror_id: int, i: int, quality: str) -> str:
+    html = (
+        '<div class="responsive-embed-stream">'
+        f'<iframe src="https://embed.example/{mirror_id}/{i}/{quality}" allowfullscreen></iframe>'
+        "</div>"
+    )
+    return base64.b64encode(html.encode()).decode()
+
+
+def build_corpus(base_url: str = "https://bench.example") -> Dict[str, Dict[str, str]]:
+    return {
+        "list": {
+            "list-100": list_page(base_url, 100),
+            "list-1000": list_page(base_url, 1000),
+            "list-5000": list_page(base_url, 5000),
+        },
+        "detail": {
+            "detail-12ep": detail_page(base_url, 1, 12),
+            "detail-100ep": detail_page(base_url, 2, 100, ongoing=True),
+            "detail-1100ep": detail_page(base_url, 3, 1100, ongoing=True),
+        },
+        "episode": {
+            "episode-3mirror": episode_page(1, 1),
+            "episode-15mirror": episode_page(2, 5),
+            "episode-30mirror": episode_page(3, 10),
+        },
+        "embed": {
+            "embed": embed_payload(1, 0, "720p"),
+        },
+    }
@@ -0,0 +1,82 @@
+import asyncio
+import random
+import re
+from collections import Counter
+from urllib.parse import parse_qs
+
+import httpx
+
+from benchmarks.corpus import detail_page, embed_payload, episode_page, list_page
+
+
+DETAIL_PATH = re.compile(r"^/anime/anime-(\d+)-sub-indo/$")
+EPISODE_PATH = re.compile(r"^/episode/anime-(\d+)-sub-indo-episode-(\d+)/$")
+NONCE = "bench-nonce"
+
+
+class SyntheticSite:
+    def __init__(
+        self,
+        base_url: str = "https://bench.example",
+        list_path: str = "/anime-list/",
+        anime: int = 50,
+        episodes: int = 12,
+        mirrors_per_quality: int = 1,
+        ongoing_every: int = 5,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ) -> None:
+        self.base_url = base_url.rstrip("/")
+        self.list_path = list_path
+        self.anime = anime
+        self.episodes = episodes
+        self.mirrors_per_quality = mirrors_per_quality
+        self.ongoing_every = ongoing_every
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.rng = random.Random(seed)
+        self.requests: Counter = Counter()
+        self.errors: Counter = Counter()
+
+    def is_ongoing(self, index: int) -> bool:
+        return bool(self.ongoing_every) and index % self.ongoing_every == 0
+
+    def route(self, request: httpx.Request) -> tuple[str, httpx.Response]:
+        path = request.url.path
+        if path == self.list_path:
+            return "list", httpx.Response(200, text=list_page(self.base_url, self.anime, self.ongoing_every))
+        match = DETAIL_PATH.match(path)
+        if match and int(match.group(1)) < self.anime:
+            index = int(match.group(1))
+            page = detail_page(self.base_url, index, self.episodes, ongoing=self.is_ongoing(index))
+            return "detail", httpx.Response(200, text=page)
+        match = EPISODE_PATH.match(path)
+        if match:
+            episode_id = int(match.group(1)) * 100000 + int(match.group(2))
+            return "episode", httpx.Response(200, text=episode_page(episode_id, self.mirrors_per_quality))
+        if path == "/wp-admin/admin-ajax.php":
+            form = {key: values[0] for key, values in parse_qs(request.content.decode()).items()}
+            if "id" not in form:
+                return "nonce", httpx.Response(200, json={"data": NONCE})
+            if form.get("nonce") != NONCE:
+                return "embed", httpx.Response(200, json={"data": None})
+            payload = embed_payload(int(form["id"]), int(form["i"]), form["q"])
+            return "embed", httpx.Response(200, json={"data": payload})
+        return "other", httpx.Response(404)
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        delay = self.latency_ms + self.rng.uniform(-self.jitter_ms, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+        kind, response = self.route(request)
+        self.requests[kind] += 1
+        if self.error_rate and self.rng.random() < self.error_rate:
+            self.errors[kind] += 1
+            return httpx.Response(503, headers={"Retry-After": "0"})
+        return response
+
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self.handle)
@@ -1,11 +1,19 @@
 import asyncio
+import base64
+import json
+import string
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+from urllib.parse import parse_qs
 
+import httpx
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
@@ -14,6 +22,9 @@ if str(ROOT) not in sys.path:
 from app.db import session as db_session_module
 from app.api.routes import anime as anime_routes
 from app.main import create_app
+from app.scraper import client as client_module
+
+MOCK_SITE_BASE = "https://site.test"
 
 
 @pytest.fixture(scope="session")
@@ -44,6 +55,26 @@ def test_db(tmp_path):
         db_session_module.SessionLocal = old_session_local
 
 
+@pytest.fixture()
+def async_test_db(test_db):
+    engine = create_async_engine(
+        db_session_module.async_db_url(str(test_db.kw["bind"].url)), poolclass=NullPool
+    )
+    session_local = async_sessionmaker(engine, autoflush=False, expire_on_commit=False)
+
+    old_engine = db_session_module.async_engine
+    old_session_local = db_session_module.AsyncSessionLocal
+
+    db_session_module.async_engine = engine
+    db_session_module.AsyncSessionLocal = session_local
+    try:
+        yield session_local
+    finally:
+        asyncio.run(engine.dispose())
+        db_session_module.async_engine = old_engine
+        db_session_module.AsyncSessionLocal = old_session_local
+
+
 @pytest.fixture()
 def db_session(test_db):
     session = test_db()
@@ -57,16 +88,85 @@ def db_session(test_db):
 
 
 @pytest.fixture()
-def client(test_db):
+def client(async_test_db):
     app = create_app()
 
-    def override_get_db():
-        db = test_db()
-        try:
+    async def override_get_db():
+        async with async_test_db() as db:
             yield db
-        finally:
-            db.close()
 
     app.dependency_overrides[anime_routes.get_db] = override_get_db
     with TestClient(app) as c:
         yield c
+
+
+def _mirror_link(mirror_id: int, i: int, q: str, provider: str) -> str:
+    payload = base64.b64encode(json.dumps({"id": mirror_id, "i": i, "q": q}).encode()).decode()
+    return f'<li><a data-content="{payload}">{provider}</a></li>'
+
+
+def build_site_handler(anime_count: int = 2, nonce_action: str = client_module.settings.ajax_action_nonce):
+    slugs = string.ascii_lowercase[:anime_count]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        path = request.url.path
+        if path == "/anime-list/":
+            items = "".join(
+                f'<li><a class="hodebgst" href="{MOCK_SITE_BASE}/anime/{slug}/">Anime {slug.upper()}'
+                + ("<color>On-Going</color>" if slug == "b" else "")
+                + "</a></li>"
+                for slug in slugs
+            )
+            return httpx.Response(200, text=f"<ul>{items}</ul>")
+        if path.startswith("/anime/"):
+            slug = path.split("/")[2]
+            episodes = "".join(
+                f'<li><span><a href="{MOCK_SITE_BASE}/episode/{slug}-{n}/">Anime {slug} Episode {n}</a></span>'
+                f'<span class="zeebr">{n} Jan</span></li>'
+                for n in (1, 2)
+            )
+            status = "Ongoing" if slug == "b" else "Completed"
+            return httpx.Response(
+                200,
+                text=(
+                    '<div class="fotoanime"><img src="img.jpg"/><div class="infozin"><div class="infozingle">'
+                    f"<p><span><b>Judul</b>: Anime {slug.upper()}</span></p>"
+                    f"<p><span><b>Status</b>: {status}</span></p>"
+                    "<p><span><b>Total Episode</b>: 2</span></p>"
+                    "<p><span><b>Genre</b>: <a>Action</a>, <a>Comedy</a></span></p>"
+                    '</div></div><div class="sinopc"><p>Synopsis</p></div></div>'
+                    f'<div class="episodelist"><ul>{episodes}</ul></div>'
+                ),
+            )
+        if path.startswith("/episode/"):
+            return httpx.Response(
+                200,
+                text=(
+                    '<div class="mirrorstream"><ul class="m480p">'
+                    + _mirror_link(1, 0, "480p", "prov1")
+                    + _mirror_link(1, 1, "480p", "prov2")
+                    + "</ul></div>"
+                ),
+            )
+        if path == "/wp-admin/admin-ajax.php":
+            form = parse_qs(request.content.decode())
+            if form["action"][0] == nonce_action:
+                return httpx.Response(200, json={"data": "nonce-1"})
+            embed = base64.b64encode(
+                f'<iframe src="https://embed.test/{form["id"][0]}/{form["i"][0]}"></iframe>'.encode()
+            )
+            return httpx.Response(200, json={"data": embed.decode()})
+        return httpx.Response(404)
+
+    return handler
+
+
+@pytest.fixture()
+def mock_site(monkeypatch):
+    monkeypatch.setattr(client_module.settings, "base_url", MOCK_SITE_BASE)
+    monkeypatch.setattr(client_module.settings, "scraper_max_items", None)
+    monkeypatch.setattr(client_module.settings, "scraper_adaptive_rate", False)
+    monkeypatch.setattr(client_module.settings, "scraper_http_cache", False)
+    for name in ("scraper_delay_min", "scraper_delay_max", "scraper_ajax_delay_min", "scraper_ajax_delay_max"):
+        monkeypatch.setattr(client_module.settings, name, 0)
+    return SimpleNamespace(base=MOCK_SITE_BASE, build_handler=build_site_handler)
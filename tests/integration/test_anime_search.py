@@ -0,0 +1,55 @@
+from sqlalchemy import text
+
+from app.db import models
+from app.db.schema import sync_schema
+
+
+def _anime(db_session, slug, title, synopsis=None, title_japanese=None):
+    anime = models.Anime(
+        source_url=f"https://x/anime/{slug}/",
+        title=title,
+        title_japanese=title_japanese,
+        synopsis=synopsis,
+        status_list_page="completed",
+    )
+    db_session.add(anime)
+    db_session.flush()
+    return anime
+
+
+def test_search_uses_fts_ranking_and_prefix(client, test_db, db_session):
+    sync_schema(test_db.kw["bind"])
+    mentions = _anime(db_session, "a", "Dungeon Meshi", synopsis="A party remembers Frieren the mage.")
+    frieren = _anime(db_session, "b", "Sousou no Frieren", title_japanese="葬送のフリーレン")
+    _anime(db_session, "c", "One Piece", synopsis="Pirates")
+    db_session.commit()
+
+    resp = client.get("/anime/", params={"q": "frier"})
+    assert resp.status_code == 200
+    assert [item["id"] for item in resp.json()["items"]] == [frieren.id, mentions.id]
+    assert resp.json()["total"] == 2
+    first = client.get("/anime/", params={"q": "frier", "limit": 1}).json()
+    second = client.get("/anime/", params={"q": "frier", "limit": 1, "after": first["next_cursor"]}).json()
+    assert [first["items"][0]["id"], second["items"][0]["id"]] == [frieren.id, mentions.id]
+    assert second["next_cursor"] is None
+
+    assert [item["id"] for item in client.get("/anime/", params={"q": "sousou frieren"}).json()["items"]] == [
+        frieren.id
+    ]
+    assert client.get("/anime/", params={"q": '"'}).json()["total"] == 0
+
+    frieren.title = "Beyond Journey's End"
+    db_session.delete(mentions)
+    db_session.commit()
+    assert client.get("/anime/", params={"q": "frier"}).json()["total"] == 0
+    assert [item["id"] for item in client.get("/anime/", params={"q": "journey"}).json()["items"]] == [frieren.id]
+
+
+def test_sync_schema_rebuilds_index_for_existing_rows(test_db, db_session):
+    _anime(db_session, "a", "Sousou no Frieren")
+    db_session.commit()
+    engine = test_db.kw["bind"]
+    sync_schema(engine)
+    sync_schema(engine)
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT rowid FROM anime_fts WHERE anime_fts MATCH 'frieren'")).all() == [(1,)]
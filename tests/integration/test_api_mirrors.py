@@ -16,7 +16,6 @@ def test_get_episode_mirrors_empty(client, db_session):
         mirror_id=1,
         mirror_i=0,
         mirror_q="480p",
-        raw_data_content="",
         fetch_status="success",
     )
     db_session.add(mirror)
@@ -0,0 +1,28 @@
+import asyncio
+
+from app.db import models
+from app.db.async_repository import get_anime_by_id, run_in_session
+from app.db.session import async_db_url
+
+
+def test_async_db_url_swaps_in_async_driver():
+    assert async_db_url("sqlite:///./data/anime.db") == "sqlite+aiosqlite:///./data/anime.db"
+    assert async_db_url("postgresql://u:p@db/anime") == "postgresql+asyncpg://u:p@db/anime"
+    assert async_db_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+
+
+def test_run_in_session_commits_sync_ops(test_db, async_test_db):
+    def add_anime(session, title):
+        anime = models.Anime(source_url=f"u-{title}", title=title, status_list_page="completed")
+        session.add(anime)
+        session.flush()
+        return anime.id
+
+    async def run():
+        anime_id = await run_in_session(async_test_db, add_anime, "A", commit=True)
+        async with async_test_db() as session:
+            return await get_anime_by_id(session, anime_id, with_genres=True)
+
+    anime = asyncio.run(run())
+    assert anime.title == "A"
+    assert anime.genres == []
@@ -0,0 +1,49 @@
+from sqlalchemy import event
+
+from app.db import models
+from app.db.repository import bulk_upsert_episodes
+
+
+def _episodes(count, changed=None):
+    return [
+        {
+            "episode_url": f"https://x/ep{n}",
+            "episode_title": changed if changed and n == 2 else f"Episode {n}",
+            "episode_date_text": None,
+            "episode_number": n,
+        }
+        for n in range(1, count + 1)
+    ]
+
+
+def test_bulk_upsert_episodes_inserts_updates_and_maps_ids(db_session):
+    anime = models.Anime(source_url="u", title="t", status_list_page="completed")
+    db_session.add(anime)
+    db_session.flush()
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        ids_by_url = bulk_upsert_episodes(db_session, anime.id, _episodes(1100), chunk_size=500)
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+    db_session.commit()
+
+    assert len(ids_by_url) == 1100
+    assert len(statements) <= 12
+    rows = {ep.episode_url: ep for ep in db_session.query(models.Episode).all()}
+    assert {url: row.id for url, row in rows.items()} == ids_by_url
+    before = {url: row.updated_at for url, row in rows.items()}
+
+    again = bulk_upsert_episodes(db_session, anime.id, _episodes(1100, changed="Episode 2 (Recap)"))
+    db_session.commit()
+    db_session.expire_all()
+
+    assert again == ids_by_url
+    rows = {ep.episode_url: ep for ep in db_session.query(models.Episode).all()}
+    assert rows["https://x/ep2"].episode_title == "Episode 2 (Recap)"
+    assert rows["https://x/ep2"].updated_at > before["https://x/ep2"]
+    assert rows["https://x/ep1"].updated_at == before["https://x/ep1"]
+    assert all(row.anime_id == anime.id for row in rows.values())
@@ -0,0 +1,58 @@
+from app.db import models
+from app.db.repository import bulk_upsert_episode_mirrors
+
+
+def _mirror(i, provider, quality="480p", status="success"):
+    return {
+        "quality": quality,
+        "provider_name": provider,
+        "iframe_src": f"https://embed/{provider}",
+        "mirror_id": 1,
+        "mirror_i": i,
+        "mirror_q": quality,
+        "raw_data_content": "dc",
+        "fetch_status": status,
+        "error_message": None,
+    }
+
+
+def _episodes(db_session, count):
+    anime = models.Anime(source_url="u", title="t", status_list_page="completed")
+    db_session.add(anime)
+    db_session.flush()
+    episodes = [models.Episode(anime_id=anime.id, episode_url=f"eu{n}", episode_title=f"e{n}") for n in range(count)]
+    db_session.add_all(episodes)
+    db_session.flush()
+    return [ep.id for ep in episodes]
+
+
+def test_bulk_upsert_mirrors_resolves_both_unique_keys(db_session):
+    ep1, ep2 = _episodes(db_session, 2)
+    written = bulk_upsert_episode_mirrors(
+        db_session, {ep1: [_mirror(0, "p1"), _mirror(1, "p2")], ep2: [_mirror(0, "p1")]}
+    )
+    db_session.commit()
+    assert written == 3
+    ids = {(m.episode_id, m.provider_name): m.id for m in db_session.query(models.EpisodeMirror).all()}
+
+    updated_payload = _mirror(0, "p1", status="failed")
+    moved_display = _mirror(7, "p2")
+    bulk_upsert_episode_mirrors(db_session, {ep1: [updated_payload, moved_display]})
+    db_session.commit()
+    db_session.expire_all()
+
+    mirrors = {(m.episode_id, m.provider_name): m for m in db_session.query(models.EpisodeMirror).all()}
+    assert len(mirrors) == 3
+    assert mirrors[(ep1, "p1")].id == ids[(ep1, "p1")]
+    assert mirrors[(ep1, "p1")].fetch_status == "failed"
+    assert mirrors[(ep1, "p2")].id == ids[(ep1, "p2")]
+    assert mirrors[(ep1, "p2")].mirror_i == 7
+
+
+def test_bulk_upsert_mirrors_merges_duplicates_within_batch(db_session):
+    (ep1,) = _episodes(db_session, 1)
+    bulk_upsert_episode_mirrors(db_session, {ep1: [_mirror(0, "p1"), _mirror(0, "p1", status="partial")]})
+    db_session.commit()
+    mirrors = db_session.query(models.EpisodeMirror).all()
+    assert len(mirrors) == 1
+    assert mirrors[0].fetch_status == "partial"
@@ -0,0 +1,65 @@
+import copy
+
+from app.db import models
+from app.scraper.pipeline import build_anime_context, persist_anime_page
+
+
+def _ctx(episode_titles):
+    ctx = build_anime_context({"href": "https://x/anime/a/", "title": "List Title", "status": "completed"})
+    ctx.update(
+        {
+            "detail": {"title": "Detail Judul", "status_detail": "Completed", "total_episode": "2"},
+            "genres": ["Action"],
+            "synopsis": "S",
+            "episodes": [
+                {
+                    "episode_url": f"https://x/ep{n}",
+                    "episode_title": title,
+                    "episode_date_text": None,
+                    "episode_number": n,
+                }
+                for n, title in enumerate(episode_titles, start=1)
+            ],
+            "is_ongoing": False,
+        }
+    )
+    return ctx
+
+
+def _snapshot(session):
+    session.expire_all()
+    anime = session.query(models.Anime).one()
+    episodes = {ep.episode_url: ep.updated_at for ep in session.query(models.Episode).all()}
+    return anime.title, anime.updated_at, anime.content_hash, episodes
+
+
+def test_unchanged_page_is_a_noop(db_session):
+    base = _ctx(["Ep 1", "Ep 2"])
+    refs = persist_anime_page(db_session, copy.deepcopy(base))
+    db_session.commit()
+    before = _snapshot(db_session)
+
+    second = copy.deepcopy(base)
+    refs_again = persist_anime_page(db_session, second)
+    db_session.commit()
+
+    assert second["unchanged"] is True
+    assert refs_again == refs
+    assert _snapshot(db_session) == before
+    assert before[0] == "Detail Judul"
+
+
+def test_changed_page_only_rewrites_changed_rows(db_session):
+    persist_anime_page(db_session, _ctx(["Ep 1", "Ep 2"]))
+    db_session.commit()
+    _, _, old_hash, old_episodes = _snapshot(db_session)
+
+    changed = _ctx(["Ep 1", "Ep 2 (End)"])
+    persist_anime_page(db_session, changed)
+    db_session.commit()
+    _, _, new_hash, new_episodes = _snapshot(db_session)
+
+    assert changed["unchanged"] is False
+    assert new_hash != old_hash
+    assert new_episodes["https://x/ep1"] == old_episodes["https://x/ep1"]
+    assert new_episodes["https://x/ep2"] > old_episodes["https://x/ep2"]
@@ -0,0 +1,187 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from app.db import models
+from app.db import repository
+from app.db.writer import DbWriter
+from app.scraper import pipeline
+
+LIST_HTML = """
+<ul>
+  <li><a class="hodebgst" href="https://x/anime/a">A</a></li>
+  <li><a class="hodebgst" href="https://x/anime/b">B</a></li>
+  <li><a class="hodebgst" href="https://x/anime/c">C</a></li>
+</ul>
+"""
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeClient:
+    list_fetches = 0
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return None
+
+    async def get(self, url):
+        FakeClient.list_fetches += 1
+        return FakeResponse(LIST_HTML)
+
+
+class Crash(BaseException):
+    pass
+
+
+def test_enqueue_is_idempotent_and_tracks_state(db_session):
+    repository.enqueue_crawl_jobs(db_session, "detail", [("u1", {"href": "u1"}), ("u2", {"href": "u2"})])
+    db_session.commit()
+    repository.mark_crawl_job(db_session, "detail", "u1", "done")
+    jobs = repository.enqueue_crawl_jobs(db_session, "detail", [("u1", {"href": "u1"})])
+    db_session.commit()
+
+    assert jobs[0].state == "done"
+    pending = repository.get_pending_crawl_jobs(db_session, "detail")
+    assert [repository.crawl_job_payload(job) for job in pending] == [{"href": "u2"}]
+    assert repository.has_unfinished_crawl_jobs(db_session)
+
+
+def test_scrape_once_resumes_from_frontier(test_db, async_test_db, monkeypatch):
+    monkeypatch.setattr(pipeline, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(pipeline, "engine", test_db.kw["bind"])
+    monkeypatch.setattr(pipeline, "ScraperClient", FakeClient)
+    monkeypatch.setattr(pipeline.settings, "scraper_concurrency", 1)
+    monkeypatch.setattr(pipeline.settings, "scraper_max_items", None)
+    FakeClient.list_fetches = 0
+    processed = []
+
+    async def fake_fetch_anime_item(item, *args, **kwargs):
+        if item["href"] == "https://x/anime/b" and not processed.count("crashed"):
+            processed.append("crashed")
+            raise Crash()
+        processed.append(item["href"])
+        return None
+
+    monkeypatch.setattr(pipeline, "fetch_anime_item", fake_fetch_anime_item)
+
+    with pytest.raises(Crash):
+        asyncio.run(pipeline.scrape_once())
+    asyncio.run(pipeline.scrape_once())
+
+    assert FakeClient.list_fetches == 1
+    assert processed == ["https://x/anime/a", "crashed", "https://x/anime/b", "https://x/anime/c"]
+    with test_db() as session:
+        states = {job.job_key: job.state for job in session.query(models.CrawlJob).all()}
+    assert states["https://x/anime/b"] == "done"
+    assert not any(state == "pending" for state in states.values())
+
+
+def test_prepare_frontier_leaves_live_worker_leases_alone(db_session, monkeypatch):
+    repository.enqueue_crawl_jobs(db_session, "detail", [(f"u{i}", {"href": f"u{i}"}) for i in range(2)])
+    db_session.commit()
+    live, expired = repository.claim_crawl_jobs(db_session, "detail", "w1", 2, 60)
+    db_session.query(models.CrawlJob).filter_by(id=expired[0]).update(
+        {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    db_session.commit()
+
+    monkeypatch.setattr(pipeline.settings, "scraper_resume", True)
+    assert pipeline.prepare_crawl_frontier(db_session, "https://x/list")
+    db_session.commit()
+    db_session.expire_all()
+    states = {job.id: (job.state, job.lease_owner) for job in db_session.query(models.CrawlJob).all()}
+    assert states == {live[0]: ("leased", "w1"), expired[0]: ("pending", None)}
+
+    monkeypatch.setattr(pipeline.settings, "scraper_resume", False)
+    with pytest.raises(pipeline.FrontierBusy):
+        pipeline.prepare_crawl_frontier(db_session, "https://x/list")
+    db_session.rollback()
+    assert db_session.query(models.CrawlJob).count() == 2
+
+
+def _episode_jobs(db_session, count):
+    anime = models.Anime(source_url="https://x/anime/a", title="A", status_list_page="on-going")
+    db_session.add(anime)
+    db_session.flush()
+    episodes = [
+        models.Episode(anime_id=anime.id, episode_url=f"https://x/ep{n}", episode_title=f"Ep {n}") for n in range(count)
+    ]
+    db_session.add_all(episodes)
+    db_session.commit()
+    return [{"episode_url": ep.episode_url, "episode_id": ep.id} for ep in episodes]
+
+
+def _fetched_mirror(provider="p"):
+    return {
+        "quality": "480p",
+        "provider_name": provider,
+        "iframe_src": "https://embed/1",
+        "mirror_id": 1,
+        "mirror_i": 0,
+        "mirror_q": "480p",
+        "fetch_status": "success",
+        "error_message": None,
+    }
+
+
+def _scrape_mirrors(async_test_db, episodes):
+    async def run():
+        semaphore = asyncio.Semaphore(1)
+        async with DbWriter(async_test_db, batch_size=10, flush_interval=0, queue_size=10) as writer:
+            await pipeline.scrape_episode_mirrors(None, writer, episodes, semaphore, asyncio.Semaphore(1))
+
+    asyncio.run(run())
+
+
+def test_episode_mirrors_are_checkpointed_before_the_anime_finishes(test_db, async_test_db, db_session, monkeypatch):
+    episodes = _episode_jobs(db_session, 4)
+    monkeypatch.setattr(pipeline.settings, "scraper_write_batch_size", 2)
+    monkeypatch.setattr(pipeline.settings, "scraper_write_flush_ms", 60_000)
+    seen_at_crash = {}
+
+    async def fake_fetch(client, url, *args):
+        if url == "https://x/ep2":
+            for _ in range(200):
+                with test_db() as session:
+                    done = {
+                        job.job_key
+                        for job in session.query(models.CrawlJob).filter_by(kind="episode_mirrors", state="done")
+                    }
+                    mirrors = session.query(models.EpisodeMirror).count()
+                if len(done) == 2:
+                    break
+                await asyncio.sleep(0.01)
+            seen_at_crash.update(done=done, mirrors=mirrors)
+            raise Crash()
+        return [_fetched_mirror()]
+
+    monkeypatch.setattr(pipeline, "fetch_episode_mirror_data", fake_fetch)
+
+    with pytest.raises(Crash):
+        _scrape_mirrors(async_test_db, episodes)
+
+    assert seen_at_crash == {"done": {"https://x/ep0", "https://x/ep1"}, "mirrors": 2}
+
+
+def test_failed_mirror_batch_only_fails_the_bad_episode(async_test_db, db_session, monkeypatch):
+    episodes = _episode_jobs(db_session, 3)
+    monkeypatch.setattr(pipeline.settings, "scraper_write_batch_size", 3)
+    monkeypatch.setattr(pipeline.settings, "scraper_write_flush_ms", 60_000)
+
+    async def fake_fetch(client, url, *args):
+        return [_fetched_mirror(provider=None if url == "https://x/ep1" else "p")]
+
+    monkeypatch.setattr(pipeline, "fetch_episode_mirror_data", fake_fetch)
+    _scrape_mirrors(async_test_db, episodes)
+
+    db_session.expire_all()
+    states = {job.job_key: job.state for job in db_session.query(models.CrawlJob).all()}
+    assert states == {"https://x/ep0": "done", "https://x/ep1": "failed", "https://x/ep2": "done"}
+    assert db_session.query(models.EpisodeMirror).count() == 2
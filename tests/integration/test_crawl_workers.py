@@ -0,0 +1,154 @@
+import asyncio
+import multiprocessing
+from datetime import datetime, timedelta
+
+import httpx
+import pytest
+
+from app.db import models
+from app.db import repository
+from app.db.writer import DbWriter
+from app.scraper import pipeline
+from app.scraper import worker
+from app.scraper.client import ScraperClient
+
+
+def test_claim_is_exclusive_until_lease_expires(db_session):
+    repository.enqueue_crawl_jobs(db_session, "detail", [(f"u{i}", {"href": f"u{i}"}) for i in range(3)])
+    db_session.commit()
+
+    first = repository.claim_crawl_jobs(db_session, "detail", "w1", 2, 60)
+    second = repository.claim_crawl_jobs(db_session, "detail", "w2", 5, 60)
+    db_session.commit()
+    assert [key for _, key, _ in first] == ["u0", "u1"]
+    assert [key for _, key, _ in second] == ["u2"]
+    assert repository.claim_crawl_jobs(db_session, "detail", "w3", 5, 60) == []
+
+    db_session.query(models.CrawlJob).filter_by(job_key="u0").update(
+        {"lease_expires_at": datetime.utcnow() - timedelta(seconds=1)}
+    )
+    reclaimed = repository.claim_crawl_jobs(db_session, "detail", "w3", 5, 60)
+    db_session.commit()
+    assert [key for _, key, _ in reclaimed] == ["u0"]
+
+    job_id = reclaimed[0][0]
+    assert repository.renew_crawl_leases(db_session, "w1", [job_id], 60) == 0
+    assert repository.complete_crawl_job(db_session, job_id, "w1", "done") is False
+    assert repository.renew_crawl_leases(db_session, "w3", [job_id], 60) == 1
+    assert repository.complete_crawl_job(db_session, job_id, "w3", "done") is True
+    db_session.commit()
+    assert repository.has_unfinished_crawl_jobs(db_session)
+
+
+def _run_worker_process(engine) -> None:
+    engine.dispose(close=False)
+    asyncio.run(worker.run_worker())
+
+
+def test_local_worker_processes_share_one_database(test_db, async_test_db, mock_site, tmp_path, monkeypatch):
+    engine = test_db.kw["bind"]
+    site = mock_site.build_handler(anime_count=6)
+    log_path = tmp_path / "requests.log"
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        with open(log_path, "a", encoding="utf-8") as fh:
+            fh.write(f"{request.method} {request.url.path}\n")
+        return site(request)
+
+    monkeypatch.setattr(pipeline, "engine", engine)
+    monkeypatch.setattr(pipeline, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(worker, "SessionLocal", test_db)
+    monkeypatch.setattr(worker, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(worker, "ScraperClient", lambda: ScraperClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(worker.settings, "scraper_concurrency", 2)
+    monkeypatch.setattr(worker.settings, "scraper_worker_poll_seconds", 0.05)
+    monkeypatch.setattr(worker.settings, "scraper_write_flush_ms", 0)
+
+    assert worker.seed_crawl_frontier(f"{mock_site.base}/anime-list/")
+    assert not worker.seed_crawl_frontier(f"{mock_site.base}/anime-list/")
+
+    ctx = multiprocessing.get_context("fork")
+    procs = [ctx.Process(target=_run_worker_process, args=(engine,)) for _ in range(3)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(60)
+    assert [proc.exitcode for proc in procs] == [0, 0, 0]
+
+    gets = [line.split(" ", 1)[1] for line in log_path.read_text().splitlines() if line.startswith("GET ")]
+    assert len(gets) == len(set(gets))
+    assert len([path for path in gets if path.startswith("/anime/")]) == 6
+    assert len([path for path in gets if path.startswith("/episode/")]) == 12
+
+    with test_db() as session:
+        assert session.query(models.Anime).count() == 6
+        assert session.query(models.Episode).count() == 12
+        assert session.query(models.EpisodeMirror).count() == 24
+        jobs = session.query(models.CrawlJob).all()
+        assert len(jobs) == 1 + 6 + 12
+        assert {job.state for job in jobs} == {"done"}
+        assert all(job.attempts == 1 and job.lease_owner is None for job in jobs)
+
+
+def test_skipped_detail_job_keeps_scrape_state(db_session, async_test_db, monkeypatch):
+    scraped_at = datetime.utcnow() - timedelta(hours=5)
+    db_session.add(
+        models.Anime(
+            source_url="https://x/anime/a/",
+            title="Detail A",
+            status_list_page="On-Going",
+            status_detail="Ongoing",
+            last_scraped_at=scraped_at,
+        )
+    )
+    item = {"href": "https://x/anime/a/", "title": "List A", "status": "On-Going"}
+    repository.enqueue_crawl_jobs(db_session, "detail", [(item["href"], item)])
+    db_session.commit()
+    monkeypatch.setattr(pipeline.settings, "scraper_ongoing_refresh_hours", 6)
+    ((job_id, job_key, payload),) = repository.claim_crawl_jobs(db_session, "detail", "w1", 1, 60)
+    db_session.commit()
+
+    async def run() -> None:
+        semaphore = asyncio.Semaphore(1)
+        async with DbWriter(async_test_db, batch_size=1, flush_interval=0, queue_size=10) as writer:
+            await worker.process_job(
+                (job_id, "detail", job_key, payload), "w1", None, writer, semaphore, semaphore, pipeline.NonceCache(60)
+            )
+
+    asyncio.run(run())
+
+    db_session.expire_all()
+    anime = db_session.query(models.Anime).one()
+    assert anime.last_scraped_at == scraped_at
+    assert anime.title == "Detail A"
+    assert db_session.query(models.CrawlJob).one().state == "done"
+
+
+def test_worker_awaits_in_flight_jobs_before_closing_writer(async_test_db, monkeypatch):
+    claims = []
+    writer_open_at_cancel = []
+
+    async def fake_claim_jobs(worker_id, limit):
+        claims.append(limit)
+        if len(claims) > 1:
+            raise RuntimeError("database unavailable")
+        return [(1, "detail", "https://x/anime/a/", {})]
+
+    async def fake_process_job(job, worker_id, client, writer, *args):
+        try:
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            await asyncio.sleep(0.05)
+            writer_open_at_cancel.append(writer._task is not None)
+            raise
+
+    monkeypatch.setattr(worker, "init_db", lambda: None)
+    monkeypatch.setattr(worker, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(worker, "claim_jobs", fake_claim_jobs)
+    monkeypatch.setattr(worker, "process_job", fake_process_job)
+    monkeypatch.setattr(worker, "ScraperClient", lambda: ScraperClient(transport=httpx.MockTransport(lambda r: None)))
+    monkeypatch.setattr(worker.settings, "scraper_worker_poll_seconds", 0.01)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(worker.run_worker("w1"))
+    assert writer_open_at_cancel == [True]
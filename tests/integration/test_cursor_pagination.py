@@ -0,0 +1,91 @@
+from sqlalchemy import inspect
+
+from app.db import models
+from app.db.repository import encode_cursor
+from app.db.schema import sync_schema
+
+
+def _walk(client, url, **params):
+    pages = []
+    after = None
+    while True:
+        query = dict(params, **({"after": after} if after else {}))
+        data = client.get(url, params=query).json()
+        pages.append([item["id"] for item in data["items"]])
+        after = data["next_cursor"]
+        if after is None:
+            return pages
+
+
+def _anime(db_session, slug, title):
+    anime = models.Anime(source_url=f"https://x/anime/{slug}/", title=title, status_list_page="completed")
+    db_session.add(anime)
+    db_session.flush()
+    return anime
+
+
+def test_anime_list_walks_by_title_then_id(client, db_session):
+    ids = [_anime(db_session, slug, title).id for slug, title in [("a", "B"), ("b", "A"), ("c", "B"), ("d", "C")]]
+    db_session.commit()
+
+    pages = _walk(client, "/anime/", limit=2)
+    assert pages == [[ids[1], ids[0]], [ids[2], ids[3]]]
+
+
+def test_episode_cursor_keeps_unnumbered_episodes_in_place(client, db_session):
+    anime = _anime(db_session, "a", "A")
+    numbers = [2, None, 1, 3, None]
+    episodes = []
+    for index, number in enumerate(numbers):
+        episode = models.Episode(
+            anime_id=anime.id, episode_url=f"eu{index}", episode_title=f"e{index}", episode_number=number
+        )
+        db_session.add(episode)
+        db_session.flush()
+        episodes.append(episode.id)
+    db_session.commit()
+
+    expected_asc = [episodes[2], episodes[0], episodes[3], episodes[1], episodes[4]]
+    for limit in (1, 2, 3):
+        pages = _walk(client, f"/anime/{anime.id}/episodes", limit=limit)
+        assert sum(pages, []) == expected_asc
+        pages = _walk(client, f"/anime/{anime.id}/episodes", limit=limit, order="desc")
+        assert sum(pages, []) == [episodes[4], episodes[1], episodes[3], episodes[0], episodes[2]]
+
+
+def test_mirror_cursor_and_invalid_cursor(client, db_session):
+    anime = _anime(db_session, "a", "A")
+    episode = models.Episode(anime_id=anime.id, episode_url="eu", episode_title="et")
+    db_session.add(episode)
+    db_session.flush()
+    for index, quality in enumerate(["360p", "480p", "720p"]):
+        db_session.add(
+            models.EpisodeMirror(
+                episode_id=episode.id,
+                quality=quality,
+                provider_name="p",
+                mirror_id=1,
+                mirror_i=index,
+                mirror_q=quality,
+            )
+        )
+    db_session.commit()
+
+    pages = _walk(client, f"/anime/episodes/{episode.id}/mirrors", limit=2)
+    assert [len(page) for page in pages] == [2, 1]
+    assert sorted(sum(pages, [])) == sum(pages, [])
+
+    bad_cursors = ["not-a-cursor", encode_cursor([{"x": 1}, 1]), encode_cursor(["1", True]), encode_cursor([1.5])]
+    for url in ("/anime/", f"/anime/{anime.id}/episodes", f"/anime/episodes/{episode.id}/mirrors"):
+        for cursor in bad_cursors:
+            assert client.get(url, params={"after": cursor}).status_code == 400
+    assert client.get("/anime/", params={"after": encode_cursor([1, 1])}).status_code == 400
+    assert client.get(f"/anime/{anime.id}/episodes", params={"after": encode_cursor(["A", 1])}).status_code == 400
+
+
+def test_sync_schema_adds_keyset_indexes(test_db):
+    engine = test_db.kw["bind"]
+    with engine.begin() as conn:
+        conn.exec_driver_sql("DROP INDEX ix_anime_title_id")
+    sync_schema(engine)
+    assert "ix_anime_title_id" in {index["name"] for index in inspect(engine).get_indexes("anime")}
@@ -0,0 +1,40 @@
+import asyncio
+
+from app.db import models
+from app.db.writer import DbWriter
+
+
+def _add_genre(session, name):
+    session.add(models.Genre(name=name))
+    return name
+
+
+def test_writer_batches_ops_and_isolates_failures(test_db, async_test_db):
+    sessions = []
+
+    def counting_factory():
+        sessions.append(1)
+        return async_test_db()
+
+    async def run():
+        async with DbWriter(counting_factory, batch_size=10, flush_interval=0.05, queue_size=10) as writer:
+            futures = [await writer.enqueue(lambda s, n=n: _add_genre(s, f"g{n}")) for n in range(3)]
+            futures.append(await writer.enqueue(lambda s: _add_genre(s, "g0")))
+            return await asyncio.gather(*futures, return_exceptions=True)
+
+    results = asyncio.run(run())
+    assert results[:3] == ["g0", "g1", "g2"]
+    assert isinstance(results[3], Exception)
+    assert len(sessions) == 5
+    with test_db() as session:
+        assert sorted(g.name for g in session.query(models.Genre).all()) == ["g0", "g1", "g2"]
+
+
+def test_writer_submit_returns_result(test_db, async_test_db):
+    async def run():
+        async with DbWriter(async_test_db, batch_size=5, flush_interval=0, queue_size=1) as writer:
+            return await writer.submit(lambda s: _add_genre(s, "solo"))
+
+    assert asyncio.run(run()) == "solo"
+    with test_db() as session:
+        assert session.query(models.Genre).count() == 1
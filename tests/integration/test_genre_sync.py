@@ -0,0 +1,55 @@
+from sqlalchemy import event
+
+from app.db import models
+from app.db.repository import GenreCache, sync_anime_genres
+
+
+def _anime(db_session, url):
+    anime = models.Anime(source_url=url, title="t", status_list_page="completed")
+    db_session.add(anime)
+    db_session.flush()
+    return anime
+
+
+def _capture(db_session):
+    statements = []
+    event.listen(db_session.get_bind(), "before_cursor_execute", lambda *args: statements.append(args[2]))
+    return statements
+
+
+def test_sync_only_touches_changed_associations(db_session):
+    cache = GenreCache()
+    anime = _anime(db_session, "u1")
+    assert sync_anime_genres(db_session, anime, ["Action", "Comedy"], cache)
+    db_session.commit()
+
+    statements = _capture(db_session)
+    assert sync_anime_genres(db_session, anime, ["Comedy", "Drama"], cache)
+    db_session.commit()
+    writes = [s.split()[0] for s in statements if s.split()[0] in ("INSERT", "DELETE")]
+    assert sorted(writes) == ["DELETE", "INSERT", "INSERT"]
+
+    statements.clear()
+    assert not sync_anime_genres(db_session, anime, ["Comedy", "Drama"], cache)
+    assert not [s for s in statements if s.split()[0] in ("INSERT", "DELETE", "UPDATE")]
+    assert sorted(g.name for g in anime.genres) == ["Comedy", "Drama"]
+
+
+def test_genre_cache_is_warm_and_rollback_safe(db_session):
+    cache = GenreCache()
+    first = _anime(db_session, "u1")
+    sync_anime_genres(db_session, first, ["Action"], cache)
+    db_session.commit()
+
+    statements = _capture(db_session)
+    second = _anime(db_session, "u2")
+    sync_anime_genres(db_session, second, ["Action"], cache)
+    assert not [s for s in statements if "FROM genre" in s]
+
+    sync_anime_genres(db_session, second, ["Action", "Mecha"], cache)
+    db_session.rollback()
+    third = _anime(db_session, "u3")
+    sync_anime_genres(db_session, third, ["Mecha"], cache)
+    db_session.commit()
+    assert [g.name for g in third.genres] == ["Mecha"]
+    assert db_session.query(models.Genre).count() == 2
@@ -0,0 +1,103 @@
+from sqlalchemy import create_engine, inspect, text
+from sqlalchemy.orm import Session
+
+from app.db import models
+from app.db.repository import bulk_upsert_episode_mirrors, get_episode_mirror_raw, upsert_episode_mirror
+from app.db.schema import sync_schema
+from app.scraper import pipeline
+
+
+def _mirror(i, provider, embed="PGlmcmFtZT4="):
+    return {
+        "quality": "480p",
+        "provider_name": provider,
+        "iframe_src": f"https://embed/{provider}",
+        "mirror_id": 1,
+        "mirror_i": i,
+        "mirror_q": "480p",
+        "raw_data_content": "eyJpZCI6IDF9",
+        "raw_embed_html": embed,
+        "nonce": "n1",
+        "fetch_status": "success",
+        "error_message": None,
+    }
+
+
+def _episode(db_session):
+    anime = models.Anime(source_url="u", title="t", status_list_page="completed")
+    db_session.add(anime)
+    db_session.flush()
+    episode = models.Episode(anime_id=anime.id, episode_url="eu", episode_title="e")
+    db_session.add(episode)
+    db_session.flush()
+    return episode.id
+
+
+def test_raw_payloads_live_in_compressed_side_table(db_session):
+    episode_id = _episode(db_session)
+    bulk_upsert_episode_mirrors(db_session, {episode_id: [_mirror(0, "p1"), _mirror(1, "p2")]})
+    db_session.commit()
+
+    columns = {col["name"] for col in inspect(db_session.get_bind()).get_columns("episode_mirror")}
+    assert not columns & {"raw_data_content", "raw_embed_html", "nonce"}
+    mirrors = {m.provider_name: m for m in db_session.query(models.EpisodeMirror).all()}
+    assert get_episode_mirror_raw(db_session, mirrors["p1"].id) == {
+        "raw_data_content": "eyJpZCI6IDF9",
+        "raw_embed_html": "PGlmcmFtZT4=",
+        "nonce": "n1",
+    }
+
+    bulk_upsert_episode_mirrors(db_session, {episode_id: [_mirror(0, "p1", embed=None) | {"nonce": None}]})
+    upsert_episode_mirror(db_session, episode_id, _mirror(1, "p2", embed="bmV3"))
+    db_session.commit()
+    assert get_episode_mirror_raw(db_session, mirrors["p1"].id)["raw_embed_html"] is None
+    assert get_episode_mirror_raw(db_session, mirrors["p2"].id)["raw_embed_html"] == "bmV3"
+    assert db_session.query(models.EpisodeMirrorRaw).count() == 2
+
+
+def test_raw_payloads_dropped_when_disabled(db_session, monkeypatch):
+    monkeypatch.setattr(pipeline.settings, "scraper_mirror_raw", False)
+    episode_id = _episode(db_session)
+    pipeline.store_episode_mirrors(db_session, {episode_id: [_mirror(0, "p1")]})
+    db_session.commit()
+    assert db_session.query(models.EpisodeMirror).count() == 1
+    assert db_session.query(models.EpisodeMirrorRaw).count() == 0
+
+
+def test_sync_schema_moves_legacy_raw_columns(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'legacy.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE episode_mirror (id INTEGER PRIMARY KEY, episode_id INTEGER NOT NULL, "
+                "quality VARCHAR NOT NULL, provider_name VARCHAR NOT NULL, iframe_src VARCHAR, "
+                "mirror_id INTEGER NOT NULL, mirror_i INTEGER NOT NULL, mirror_q VARCHAR NOT NULL, "
+                "raw_data_content TEXT, nonce VARCHAR, raw_embed_html TEXT, fetch_status VARCHAR NOT NULL, "
+                "error_message TEXT, last_scraped_at DATETIME NOT NULL, created_at DATETIME NOT NULL, "
+                "updated_at DATETIME NOT NULL)"
+            )
+        )
+        conn.execute(
+            text(
+                "INSERT INTO episode_mirror VALUES "
+                "(1, 1, '480p', 'p1', 'src', 1, 0, '480p', 'dc', 'n1', 'embed', 'success', NULL, "
+                "'2024-01-01', '2024-01-01', '2024-01-01'), "
+                "(2, 1, '720p', 'p1', NULL, 1, 0, '720p', NULL, NULL, NULL, 'failed', 'x', "
+                "'2024-01-01', '2024-01-01', '2024-01-01')"
+            )
+        )
+
+    sync_schema(engine)
+
+    columns = {col["name"] for col in inspect(engine).get_columns("episode_mirror")}
+    assert not columns & {"raw_data_content", "raw_embed_html", "nonce"}
+    with engine.connect() as conn:
+        assert conn.execute(text("SELECT iframe_src FROM episode_mirror WHERE id = 1")).scalar() == "src"
+    with Session(engine) as session:
+        assert session.query(models.EpisodeMirrorRaw).count() == 1
+        assert get_episode_mirror_raw(session, 1) == {
+            "raw_data_content": "dc",
+            "raw_embed_html": "embed",
+            "nonce": "n1",
+        }
+    engine.dispose()
@@ -0,0 +1,96 @@
+import asyncio
+from datetime import datetime, timedelta
+
+import httpx
+
+from app.db import models
+from app.db.session import Base
+from app.scraper import pipeline
+from app.scraper import reparse
+from app.scraper.archive import PageArchive
+from app.scraper.client import ScraperClient
+from app.scraper.parsepool import ParsePool
+
+
+def _snapshot(session):
+    return (
+        sorted((a.source_url, a.title, a.status_detail, a.synopsis) for a in session.query(models.Anime).all()),
+        sorted((e.episode_url, e.episode_title, e.episode_number) for e in session.query(models.Episode).all()),
+        sorted(
+            (m.episode.episode_url, m.provider_name, m.iframe_src, m.fetch_status)
+            for m in session.query(models.EpisodeMirror).all()
+        ),
+    )
+
+
+def test_reparse_rebuilds_rows_from_archive_without_network(test_db, async_test_db, mock_site, tmp_path, monkeypatch):
+    engine = test_db.kw["bind"]
+    handler = mock_site.build_handler()
+    archive_dir = tmp_path / "archive"
+    monkeypatch.setattr(pipeline, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(pipeline, "engine", engine)
+    monkeypatch.setattr(reparse, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(
+        pipeline,
+        "ScraperClient",
+        lambda: ScraperClient(transport=httpx.MockTransport(handler), archive=PageArchive(archive_dir)),
+    )
+
+    asyncio.run(pipeline.scrape_once())
+    with test_db() as session:
+        crawled = _snapshot(session)
+    assert len(crawled[2]) == 8
+
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    async def run():
+        with ParsePool("thread", 2) as parse_pool:
+            return await reparse.reparse_archive(PageArchive(archive_dir), parse_pool)
+
+    counts = asyncio.run(run())
+
+    assert counts == {"anime": 2, "episodes": 4, "mirrors": 8, "stale": 0, "failed": 0}
+    with test_db() as session:
+        assert _snapshot(session) == crawled
+
+
+def test_reparse_skips_archive_entries_older_than_stored_rows(
+    test_db, async_test_db, mock_site, tmp_path, monkeypatch
+):
+    handler = mock_site.build_handler()
+    archive_dir = tmp_path / "archive"
+    monkeypatch.setattr(pipeline, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(pipeline, "engine", test_db.kw["bind"])
+    monkeypatch.setattr(reparse, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(
+        pipeline,
+        "ScraperClient",
+        lambda: ScraperClient(transport=httpx.MockTransport(handler), archive=PageArchive(archive_dir)),
+    )
+    asyncio.run(pipeline.scrape_once())
+
+    def reparse_once(force=False):
+        return asyncio.run(reparse.reparse_archive(PageArchive(archive_dir), force=force))
+
+    assert reparse_once()["stale"] == 0
+
+    newer = datetime.utcnow() + timedelta(hours=1)
+    with test_db() as session:
+        session.query(models.Anime).update({"synopsis": "Newer", "content_hash": None, "last_scraped_at": newer})
+        session.query(models.EpisodeMirror).update({"iframe_src": "https://embed.test/newer", "last_scraped_at": newer})
+        session.commit()
+
+    counts = reparse_once()
+    assert counts["stale"] == 2 + 8
+    assert counts["anime"] == 0 and counts["mirrors"] == 0
+    with test_db() as session:
+        assert {a.synopsis for a in session.query(models.Anime).all()} == {"Newer"}
+        assert {a.last_scraped_at for a in session.query(models.Anime).all()} == {newer}
+        assert {m.iframe_src for m in session.query(models.EpisodeMirror).all()} == {"https://embed.test/newer"}
+
+    counts = reparse_once(force=True)
+    assert counts["stale"] == 0 and counts["anime"] == 2 and counts["mirrors"] == 8
+    with test_db() as session:
+        assert {a.synopsis for a in session.query(models.Anime).all()} == {"Synopsis"}
+        assert "https://embed.test/newer" not in {m.iframe_src for m in session.query(models.EpisodeMirror).all()}
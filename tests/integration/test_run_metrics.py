@@ -0,0 +1,30 @@
+import asyncio
+
+import httpx
+
+from app.core import metrics as metrics_module
+from app.scraper import pipeline
+from app.scraper.client import ScraperClient
+
+
+def test_scrape_once_publishes_summary_and_textfile(test_db, async_test_db, mock_site, tmp_path, monkeypatch):
+    handler = mock_site.build_handler()
+    metrics_file = tmp_path / "metrics" / "scraper.prom"
+    monkeypatch.setattr(pipeline, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(pipeline, "engine", test_db.kw["bind"])
+    monkeypatch.setattr(pipeline, "ScraperClient", lambda: ScraperClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(metrics_module.settings, "scraper_metrics_file", str(metrics_file))
+
+    summary = asyncio.run(pipeline.scrape_once())
+
+    assert summary["requests"] == 1 + 2 + 4 + 1 + 8
+    assert summary["requests_by_endpoint"] == {"page": 7.0, "ajax": 9.0}
+    assert summary["items"] == {"done": 2.0}
+    assert summary["mirror_success_rate"] == 1.0
+    assert summary["parse_seconds"] >= 0
+    assert set(summary["semaphore_wait_seconds"]) == {"ajax", "episode"}
+
+    text = metrics_file.read_text()
+    assert 'scraper_mirrors_total{status="success"} 8' in text
+    assert 'scraper_parse_seconds_count{parser="parse_detail_page"} 2' in text
+    assert "scraper_db_commit_seconds_count" in text
@@ -0,0 +1,51 @@
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta
+
+import httpx
+
+from app.db import models
+from app.scraper import pipeline
+from app.scraper import scheduler
+from app.scraper.client import ScraperClient
+
+
+def test_daemon_refreshes_due_anime_and_sleeps_until_next(test_db, async_test_db, mock_site, monkeypatch):
+    site = mock_site.build_handler()
+    requests = Counter()
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests[request.url.path] += 1
+        return site(request)
+
+    monkeypatch.setattr(pipeline, "engine", test_db.kw["bind"])
+    monkeypatch.setattr(pipeline, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(scheduler, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(scheduler, "ScraperClient", lambda: ScraperClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(scheduler.settings, "scraper_write_flush_ms", 0)
+
+    async def run():
+        stop = asyncio.Event()
+        daemon = asyncio.create_task(scheduler.run_daemon(stop))
+        for _ in range(500):
+            await asyncio.sleep(0.01)
+            with test_db() as session:
+                if session.query(models.EpisodeMirror).count() == 8:
+                    break
+        await asyncio.sleep(0.1)
+        stop.set()
+        await asyncio.wait_for(daemon, 5)
+
+    asyncio.run(run())
+
+    assert requests["/anime-list/"] == 1
+    assert requests["/anime/a/"] == requests["/anime/b/"] == 1
+
+    with test_db() as session:
+        states = scheduler.load_refresh_states(session)
+    now = datetime.utcnow()
+    anime_a = states[f"{mock_site.base}/anime/a/"]
+    anime_b = states[f"{mock_site.base}/anime/b/"]
+    assert anime_a["fully_mirrored"]
+    assert scheduler.next_due_at(anime_a, now) is None
+    assert scheduler.next_due_at(anime_b, now) > now + timedelta(hours=5)
@@ -0,0 +1,20 @@
+from sqlalchemy import create_engine, inspect, text
+
+from app.db.schema import sync_schema
+
+
+def test_sync_schema_adds_new_nullable_columns(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'old.db'}")
+    with engine.begin() as conn:
+        conn.execute(
+            text(
+                "CREATE TABLE anime (id INTEGER PRIMARY KEY, source_url VARCHAR NOT NULL, title VARCHAR NOT NULL, "
+                "status_list_page VARCHAR NOT NULL, last_scraped_at DATETIME NOT NULL, "
+                "created_at DATETIME NOT NULL, updated_at DATETIME NOT NULL)"
+            )
+        )
+    sync_schema(engine)
+    columns = {col["name"] for col in inspect(engine).get_columns("anime")}
+    assert {"content_hash", "synopsis", "title_japanese"} <= columns
+    assert inspect(engine).has_table("crawl_job")
+    engine.dispose()
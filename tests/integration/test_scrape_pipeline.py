@@ -0,0 +1,57 @@
+import asyncio
+
+import httpx
+from sqlalchemy import event
+
+from app.db import models
+from app.scraper import pipeline
+from app.scraper.client import HttpCache, ScraperClient
+
+def test_scrape_once_persists_anime_episodes_and_mirrors(test_db, async_test_db, mock_site, tmp_path, monkeypatch):
+    base = mock_site.base
+    handler = mock_site.build_handler()
+    monkeypatch.setattr(pipeline, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(pipeline, "engine", test_db.kw["bind"])
+    monkeypatch.setattr(
+        pipeline,
+        "ScraperClient",
+        lambda: ScraperClient(transport=httpx.MockTransport(handler), cache=HttpCache(tmp_path / "cache", 1 << 20)),
+    )
+
+    asyncio.run(pipeline.scrape_once())
+
+    with test_db() as session:
+        animes = {a.source_url: a for a in session.query(models.Anime).all()}
+        assert set(animes) == {f"{base}/anime/a/", f"{base}/anime/b/"}
+        anime_a = animes[f"{base}/anime/a/"]
+        assert anime_a.title == "Anime A"
+        assert anime_a.synopsis == "Synopsis"
+        assert sorted(g.name for g in anime_a.genres) == ["Action", "Comedy"]
+        assert session.query(models.Genre).count() == 2
+        assert session.query(models.Episode).count() == 4
+        mirrors = session.query(models.EpisodeMirror).all()
+        assert len(mirrors) == 8
+        assert all(m.fetch_status == "success" for m in mirrors)
+        assert {m.iframe_src for m in mirrors} == {"https://embed.test/1/0", "https://embed.test/1/1"}
+        assert not session.query(models.CrawlJob).filter(models.CrawlJob.state != "done").count()
+
+
+def test_scrape_once_looks_up_mirrors_once_per_anime(test_db, async_test_db, mock_site, tmp_path, monkeypatch):
+    handler = mock_site.build_handler()
+    monkeypatch.setattr(pipeline, "AsyncSessionLocal", async_test_db)
+    monkeypatch.setattr(pipeline, "engine", test_db.kw["bind"])
+    monkeypatch.setattr(pipeline, "ScraperClient", lambda: ScraperClient(transport=httpx.MockTransport(handler)))
+    monkeypatch.setattr(pipeline.settings, "scraper_write_flush_ms", 100)
+    lookups = []
+
+    @event.listens_for(async_test_db.kw["bind"].sync_engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("SELECT episode_mirror.id") and "episode_mirror.provider_name" in statement:
+            lookups.append(parameters)
+
+    asyncio.run(pipeline.scrape_once())
+
+    with test_db() as session:
+        assert session.query(models.EpisodeMirror).count() == 8
+    assert len(lookups) == 2
+    assert all(len(params) == 2 for params in lookups)
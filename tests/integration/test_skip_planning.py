@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import event
+
+from app.db import models
+from app.db.repository import enqueue_crawl_jobs
+from app.scraper.pipeline import plan_detail_jobs
+
+
+def _anime(db_session, slug, status_list_page, status_detail, scraped_hours_ago, mirrored=False):
+    anime = models.Anime(
+        source_url=f"https://x/anime/{slug}",
+        title=slug.upper(),
+        status_list_page=status_list_page,
+        status_detail=status_detail,
+        total_episode="1",
+        last_scraped_at=datetime.utcnow() - timedelta(hours=scraped_hours_ago),
+    )
+    db_session.add(anime)
+    db_session.flush()
+    episode = models.Episode(anime_id=anime.id, episode_url=f"https://x/ep/{slug}", episode_title="Ep 1")
+    db_session.add(episode)
+    db_session.flush()
+    if mirrored:
+        db_session.add(
+            models.EpisodeMirror(
+                episode_id=episode.id,
+                quality="480p",
+                provider_name="p",
+                mirror_id=1,
+                mirror_i=0,
+                mirror_q="480p",
+                fetch_status="success",
+            )
+        )
+    return anime
+
+
+def test_plan_skips_known_items_with_set_based_queries(db_session):
+    _anime(db_session, "done", "completed", "Completed", 1, mirrored=True)
+    _anime(db_session, "partial", "completed", "Completed", 1)
+    _anime(db_session, "fresh", "on-going", "Ongoing", 1)
+    _anime(db_session, "stale", "on-going", "Ongoing", 48)
+    items = [
+        {"href": "https://x/anime/done", "title": "DONE (renamed)", "status": "completed"},
+        {"href": "https://x/anime/partial", "title": "PARTIAL", "status": "completed"},
+        {"href": "https://x/anime/fresh", "title": "FRESH", "status": "On-Going"},
+        {"href": "https://x/anime/stale", "title": "STALE", "status": "on-going"},
+        {"href": "https://x/anime/new", "title": "NEW", "status": "on-going"},
+        {"href": "https://x/anime/untitled", "title": None, "status": "on-going"},
+    ]
+    jobs = [(item["href"], item) for item in items]
+    enqueue_crawl_jobs(db_session, "detail", jobs)
+    db_session.commit()
+
+    statements = []
+    engine = db_session.get_bind()
+    listener = lambda *args: statements.append(args[2])  # noqa: E731
+    event.listen(engine, "before_cursor_execute", listener)
+    try:
+        work = plan_detail_jobs(db_session, jobs)
+        db_session.commit()
+    finally:
+        event.remove(engine, "before_cursor_execute", listener)
+
+    assert [key for key, _ in work] == [
+        "https://x/anime/partial",
+        "https://x/anime/stale",
+        "https://x/anime/new",
+    ]
+    assert len(statements) <= 4
+    states = {job.job_key: job.state for job in db_session.query(models.CrawlJob).all()}
+    assert {key for key, state in states.items() if state == "done"} == {
+        "https://x/anime/done",
+        "https://x/anime/fresh",
+        "https://x/anime/untitled",
+    }
+    renamed = db_session.query(models.Anime).filter_by(source_url="https://x/anime/done").one()
+    fresh = db_session.query(models.Anime).filter_by(source_url="https://x/anime/fresh").one()
+    assert renamed.title == "DONE"
+    assert fresh.status_list_page == "On-Going"
+    assert fresh.last_scraped_at < datetime.utcnow() - timedelta(minutes=30)
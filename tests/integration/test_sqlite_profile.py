@@ -0,0 +1,53 @@
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+from app.db.session import Base, async_db_url, create_async_db_engine, create_db_engine, pool_size_options
+
+
+def test_pragmas_applied_on_connect(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    with engine.connect() as conn:
+        assert conn.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+        assert conn.execute(text("PRAGMA synchronous")).scalar() == 1
+        assert conn.execute(text("PRAGMA busy_timeout")).scalar() == 5000
+        assert conn.execute(text("PRAGMA cache_size")).scalar() == -65536
+        assert conn.execute(text("PRAGMA temp_store")).scalar() == 2
+    engine.dispose()
+
+
+def test_read_only_engine_reads_during_open_write(tmp_path):
+    db_url = f"sqlite:///{tmp_path / 'profile.db'}"
+    writer = create_db_engine(db_url)
+    Base.metadata.create_all(bind=writer)
+    with writer.begin() as conn:
+        conn.execute(text("INSERT INTO genre (name) VALUES ('Action')"))
+
+    async def read_while_writing():
+        reader = create_async_db_engine(async_db_url(db_url), read_only=True)
+        try:
+            with writer.connect() as conn:
+                conn.execute(text("INSERT INTO genre (name) VALUES ('Drama')"))
+                async with reader.connect() as rconn:
+                    names = (await rconn.execute(text("SELECT name FROM genre"))).scalars().all()
+                    with pytest.raises(OperationalError):
+                        await rconn.execute(text("INSERT INTO genre (name) VALUES ('Comedy')"))
+                conn.commit()
+        finally:
+            await reader.dispose()
+        return names
+
+    assert asyncio.run(read_while_writing()) == ["Action"]
+    writer.dispose()
+
+
+def test_read_pool_size_only_for_queue_pools(tmp_path):
+    assert pool_size_options("sqlite+aiosqlite:///:memory:", 5) == {}
+    file_url = f"sqlite+aiosqlite:///{tmp_path / 'pool.db'}"
+    assert pool_size_options(file_url, 5) == {"pool_size": 5}
+    engine = create_async_db_engine(
+        "sqlite+aiosqlite:///:memory:", read_only=True, **pool_size_options("sqlite+aiosqlite:///:memory:", 5)
+    )
+    asyncio.run(engine.dispose())
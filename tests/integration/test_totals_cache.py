@@ -0,0 +1,49 @@
+from sqlalchemy import event
+
+from app.db import models
+from app.db.repository import get_anime_list
+from app.db.schema import sync_schema
+
+
+def _add_anime(db_session, slug, status="completed"):
+    db_session.add(models.Anime(source_url=f"https://x/anime/{slug}/", title=f"Anime {slug}", status_list_page=status))
+    db_session.commit()
+
+
+def test_totals_are_cached_until_table_changes(test_db, db_session):
+    engine = test_db.kw["bind"]
+    sync_schema(engine)
+    _add_anime(db_session, "a")
+    _add_anime(db_session, "b", status="on-going")
+    counts = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if "count(*)" in statement.lower():
+            counts.append(statement)
+
+    assert get_anime_list(db_session, "completed", None, 10, 0)[1] == 1
+    assert get_anime_list(db_session, "completed", None, 10, 0)[1] == 1
+    assert get_anime_list(db_session, None, None, 10, 0)[1] == 2
+    assert len(counts) == 2
+
+    _add_anime(db_session, "c")
+    assert get_anime_list(db_session, "completed", None, 10, 0)[1] == 2
+    assert len(counts) == 3
+
+    db_session.query(models.Anime).update({"content_hash": "h"})
+    db_session.commit()
+    assert get_anime_list(db_session, "completed", None, 10, 0)[1] == 2
+    assert len(counts) == 3
+
+    items, total, _ = get_anime_list(db_session, None, None, 1, 0, with_total=False)
+    assert len(items) == 1 and total is None
+    assert len(counts) == 3
+
+
+def test_api_can_skip_totals(client, db_session):
+    _add_anime(db_session, "a")
+    assert client.get("/anime/").json()["total"] == 1
+    resp = client.get("/anime/", params={"with_total": "false"})
+    assert resp.json()["total"] is None
+    assert len(resp.json()["items"]) == 1
@@ -0,0 +1,24 @@
+from app.scraper.parsers import parse_anime_list, parse_detail_page, parse_mirrors
+from benchmarks.bench_parsers import compare, run
+from benchmarks.corpus import build_corpus
+
+
+def test_corpus_pages_parse():
+    corpus = build_corpus()
+    assert len(parse_anime_list(corpus["list"]["list-1000"])) == 1000
+    detail, genres, _, episodes = parse_detail_page(corpus["detail"]["detail-1100ep"])
+    assert detail["status_detail"] == "Ongoing"
+    assert len(genres) == 3
+    assert len(episodes) == 1100
+    assert len(parse_mirrors(corpus["episode"]["episode-15mirror"])) == 15
+
+
+def test_bench_report_is_comparable():
+    report = run(iterations=1, warmup=0, only=["parse_mirrors"])
+    assert {row["page"] for row in report["results"]} == {
+        "episode-3mirror",
+        "episode-15mirror",
+        "episode-30mirror",
+    }
+    assert all(row["pages_per_sec"] > 0 for row in report["results"])
+    assert all(row["speedup"] == 1 for row in compare(report, report))
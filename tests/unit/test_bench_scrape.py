@@ -0,0 +1,24 @@
+from app.core.config import get_settings
+from app.scraper import pipeline
+from benchmarks.bench_scrape import format_table, run
+
+
+def test_scrape_benchmark_reports_throughput_and_restores_settings():
+    settings = get_settings()
+    base_url = settings.base_url
+    session_local = pipeline.AsyncSessionLocal
+
+    report = run(anime=3, episodes=2, concurrency=2, runs=2)
+
+    first, second = report["results"]
+    assert first["items"] == {"done": 3.0}
+    assert first["site_requests"]["detail"] == 3
+    assert first["site_requests"]["episode"] == 6
+    assert first["site_requests"]["embed"] == 18
+    assert first["mirror_success_rate"] == 1.0
+    assert first["items_per_sec"] > 0 and first["requests_per_sec"] > 0
+    assert first["db_write_seconds"] > 0
+    assert "detail" not in second["site_requests"]
+    assert "items/s" in format_table(report)
+    assert settings.base_url == base_url
+    assert pipeline.AsyncSessionLocal is session_local
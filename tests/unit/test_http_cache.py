@@ -0,0 +1,56 @@
+import asyncio
+
+import httpx
+
+from app.scraper import client as client_module
+from app.scraper.client import HttpCache, ScraperClient
+
+
+def _no_delay(monkeypatch):
+    monkeypatch.setattr(client_module.settings, "scraper_delay_min", 0)
+    monkeypatch.setattr(client_module.settings, "scraper_delay_max", 0)
+    monkeypatch.setattr(client_module.settings, "scraper_adaptive_rate", False)
+
+
+def test_get_serves_304_from_cache(tmp_path, monkeypatch):
+    _no_delay(monkeypatch)
+    seen_headers = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_headers.append(dict(request.headers))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, headers={"ETag": '"v1"', "Content-Type": "text/html"}, text="<p>hello</p>")
+
+    async def run():
+        cache = HttpCache(tmp_path, 1024 * 1024)
+        async with ScraperClient(transport=httpx.MockTransport(handler), cache=cache) as c:
+            first = await c.get("https://x/page")
+            second = await c.get("https://x/page")
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.text == "<p>hello</p>"
+    assert second.status_code == 200
+    assert second.text == "<p>hello</p>"
+    assert "if-none-match" not in seen_headers[0]
+    assert seen_headers[1]["if-none-match"] == '"v1"'
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    def make_resp(body: str) -> httpx.Response:
+        return httpx.Response(200, headers={"Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}, text=body)
+
+    cache = HttpCache(tmp_path, 25)
+    cache.store("https://x/a", make_resp("a" * 10))
+    cache.store("https://x/b", make_resp("b" * 10))
+    assert cache.read_body("https://x/a") == b"a" * 10
+    cache.store("https://x/c", make_resp("c" * 10))
+
+    assert cache.lookup("https://x/b") is None
+    assert cache.lookup("https://x/a") is not None
+    assert cache.lookup("https://x/c") is not None
+    assert cache.total_bytes == 20
+
+    reloaded = HttpCache(tmp_path, 25)
+    assert reloaded.read_body("https://x/c") == b"c" * 10
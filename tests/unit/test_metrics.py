@@ -0,0 +1,51 @@
+from app.core import metrics as metrics_module
+from app.core.metrics import MetricsRegistry, run_summary, write_metrics_file
+
+
+def test_prometheus_text_renders_counters_and_cumulative_buckets():
+    registry = MetricsRegistry()
+    registry.inc("scraper_requests_total", endpoint="page", status=200)
+    registry.inc("scraper_requests_total", 2, endpoint="ajax", status=200)
+    registry.observe("scraper_parse_seconds", 0.003, parser="parse_mirrors")
+    registry.observe("scraper_parse_seconds", 0.2, parser="parse_mirrors")
+    registry.observe("scraper_parse_seconds", 60, parser="parse_mirrors")
+
+    text = registry.render_prometheus()
+
+    assert "# TYPE scraper_requests_total counter" in text
+    assert 'scraper_requests_total{endpoint="ajax",status="200"} 2' in text
+    assert 'scraper_parse_seconds_bucket{parser="parse_mirrors",le="0.005"} 1' in text
+    assert 'scraper_parse_seconds_bucket{parser="parse_mirrors",le="0.25"} 2' in text
+    assert 'scraper_parse_seconds_bucket{parser="parse_mirrors",le="+Inf"} 3' in text
+    assert 'scraper_parse_seconds_count{parser="parse_mirrors"} 3' in text
+
+
+def test_run_summary_aggregates_rates():
+    registry = MetricsRegistry()
+    registry.inc("scraper_requests_total", 10, endpoint="page", status=200)
+    registry.inc("scraper_mirrors_total", 3, status="success")
+    registry.inc("scraper_mirrors_total", 1, status="failed")
+    registry.inc("scraper_items_skipped_total", 4, reason="completed")
+    registry.observe("scraper_semaphore_wait_seconds", 0.5, semaphore="ajax")
+
+    summary = run_summary(registry, 5.0)
+
+    assert summary["requests"] == 10
+    assert summary["requests_per_sec"] == 2.0
+    assert summary["mirror_success_rate"] == 0.75
+    assert summary["skipped"] == {"completed": 4}
+    assert summary["semaphore_wait_seconds"] == {"ajax": 0.5}
+
+
+def test_metrics_file_write_errors_are_logged_not_raised(tmp_path, monkeypatch):
+    blocker = tmp_path / "blocker"
+    blocker.write_text("")
+    monkeypatch.setattr(metrics_module.settings, "scraper_metrics_file", str(blocker / "scraper.prom"))
+    registry = MetricsRegistry()
+    registry.inc("scraper_requests_total")
+
+    write_metrics_file(registry)
+
+    monkeypatch.setattr(metrics_module.settings, "scraper_metrics_file", str(tmp_path / "scraper.prom"))
+    write_metrics_file(registry)
+    assert "scraper_requests_total 1" in (tmp_path / "scraper.prom").read_text()
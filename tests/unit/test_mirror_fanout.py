@@ -0,0 +1,55 @@
+import asyncio
+
+from app.scraper import pipeline
+from app.scraper.pipeline import NonceCache, fetch_episode_mirror_data
+
+EPISODE_HTML = """
+<div class="mirrorstream">
+  <ul class="m480p">
+    <li><a data-content="eyJpZCI6MSwiaSI6MCwicSI6IjQ4MHAifQ==">prov1</a></li>
+    <li><a data-content="eyJpZCI6MSwiaSI6MSwicSI6IjQ4MHAifQ==">prov2</a></li>
+  </ul>
+  <ul class="m720p">
+    <li><a data-content="eyJpZCI6MiwiaSI6MCwicSI6IjcyMHAifQ==">prov3</a></li>
+  </ul>
+</div>
+"""
+
+
+class FakeResponse:
+    text = EPISODE_HTML
+
+
+class FakeClient:
+    async def get(self, url):
+        return FakeResponse()
+
+
+def test_fanout_fetches_embeds_concurrently_in_stable_order(monkeypatch):
+    monkeypatch.setattr(pipeline.settings, "scraper_mirror_fanout", True)
+    in_flight = [0]
+    peak = [0]
+
+    async def fake_fetch_nonce(client, referer, semaphore):
+        return "nonce"
+
+    async def fake_fetch_mirror_embed(client, referer, payload, nonce, semaphore):
+        async with semaphore:
+            in_flight[0] += 1
+            peak[0] = max(peak[0], in_flight[0])
+            await asyncio.sleep(0.01 * (3 - payload["mirror_i"] - payload["mirror_id"]))
+            in_flight[0] -= 1
+        return None
+
+    monkeypatch.setattr(pipeline, "fetch_nonce", fake_fetch_nonce)
+    monkeypatch.setattr(pipeline, "fetch_mirror_embed", fake_fetch_mirror_embed)
+
+    async def run():
+        return await fetch_episode_mirror_data(
+            FakeClient(), "https://x/ep1", asyncio.Semaphore(2), NonceCache(60)
+        )
+
+    results = asyncio.run(run())
+    assert [r["provider_name"] for r in results] == ["prov1", "prov2", "prov3"]
+    assert all(r["fetch_status"] == "failed" for r in results)
+    assert peak[0] == 2
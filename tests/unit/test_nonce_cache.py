@@ -0,0 +1,60 @@
+import asyncio
+
+from app.scraper import pipeline
+from app.scraper.pipeline import NonceCache
+
+
+def _counting_fetch(monkeypatch):
+    calls = []
+
+    async def fake_fetch_nonce(client, referer, semaphore):
+        calls.append(referer)
+        await asyncio.sleep(0)
+        return f"n{len(calls)}"
+
+    monkeypatch.setattr(pipeline, "fetch_nonce", fake_fetch_nonce)
+    return calls
+
+
+def test_nonce_is_shared_until_ttl(monkeypatch):
+    calls = _counting_fetch(monkeypatch)
+    now = [0.0]
+
+    async def run():
+        cache = NonceCache(60, clock=lambda: now[0])
+        sem = asyncio.Semaphore(1)
+        first = await cache.get(None, "https://x/ep1", sem)
+        second = await cache.get(None, "https://x/ep2", sem)
+        now[0] = 61.0
+        third = await cache.get(None, "https://x/ep3", sem)
+        return first, second, third
+
+    assert asyncio.run(run()) == ("n1", "n1", "n2")
+    assert len(calls) == 2
+
+
+def test_concurrent_refreshes_fetch_once(monkeypatch):
+    calls = _counting_fetch(monkeypatch)
+
+    async def run():
+        cache = NonceCache(60)
+        sem = asyncio.Semaphore(4)
+        stale = await cache.get(None, "https://x/ep", sem)
+        return await asyncio.gather(*(cache.refresh(None, "https://x/ep", sem, stale) for _ in range(5)))
+
+    assert asyncio.run(run()) == ["n2"] * 5
+    assert len(calls) == 2
+
+
+def test_refresh_skipped_for_verified_nonce(monkeypatch):
+    calls = _counting_fetch(monkeypatch)
+
+    async def run():
+        cache = NonceCache(60)
+        sem = asyncio.Semaphore(1)
+        nonce = await cache.get(None, "https://x/ep", sem)
+        cache.mark_valid(nonce)
+        return await cache.refresh(None, "https://x/ep", sem, nonce)
+
+    assert asyncio.run(run()) == "n1"
+    assert len(calls) == 1
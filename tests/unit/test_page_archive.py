@@ -0,0 +1,33 @@
+from datetime import datetime
+
+from app.scraper.archive import PageArchive, archive_key
+
+
+def test_archive_is_content_addressed_and_keeps_latest(tmp_path):
+    archive = PageArchive(tmp_path)
+    body = b"<html>" + b"x" * 4096 + b"</html>"
+    first = archive.store("https://x/a", "https://x/a", body, fetched_at=datetime(2024, 1, 1))
+    archive.store("https://x/a", "https://x/a", body, fetched_at=datetime(2024, 1, 2))
+    archive.store("https://x/b", "https://x/b", body, fetched_at=datetime(2024, 1, 2))
+    archive.store("https://x/a", "https://x/a", b"<html>v2</html>", fetched_at=datetime(2024, 1, 3))
+
+    objects = list((tmp_path / "objects").rglob("*.gz"))
+    assert len(objects) == 2
+    assert sum(path.stat().st_size for path in objects) < len(body)
+    assert len((tmp_path / "index.jsonl").read_text().splitlines()) == 4
+
+    reloaded = PageArchive(tmp_path)
+    assert reloaded.read_latest("https://x/a") == (b"<html>v2</html>", datetime(2024, 1, 3))
+    assert reloaded.read(first) == body
+
+    archive.store("https://x/b", "https://x/b", body, fetched_at=datetime(2024, 1, 4))
+    assert PageArchive(tmp_path).read_latest("https://x/b") == (body, datetime(2024, 1, 4))
+    assert len(list((tmp_path / "objects").rglob("*.gz"))) == 2
+
+
+def test_archive_key_ignores_nonce():
+    url = "https://x/wp-admin/admin-ajax.php"
+    assert archive_key(url, {"id": 1, "i": 0, "q": "480p", "nonce": "n1", "action": "e"}) == archive_key(
+        url, {"action": "e", "q": "480p", "i": "0", "id": "1", "nonce": "n2"}
+    )
+    assert archive_key("https://x/a") == "https://x/a"
@@ -0,0 +1,33 @@
+import asyncio
+
+import pytest
+
+from app.scraper.parsepool import ParsePool, run_parser
+from app.scraper.parsers import parse_detail_page
+
+DETAIL_HTML = """
+<div class="fotoanime"><img src="img.jpg"/>
+  <div class="infozin"><div class="infozingle">
+    <p><span><b>Judul</b>: Title A</span></p>
+    <p><span><b>Genre</b>: <a>Action</a></span></p>
+  </div></div>
+  <div class="sinopc"><p>S1</p></div>
+</div>
+<div class="episodelist"><ul>
+  <li><span><a href="https://x/ep1">Anime Episode 1</a></span><span class="zeebr">1 Jan</span></li>
+</ul></div>
+"""
+
+
+@pytest.mark.parametrize("backend", ["inline", "thread", "process"])
+def test_parse_pool_backends_match_inline(backend):
+    async def run():
+        with ParsePool(backend, workers=2) as pool:
+            return await run_parser(pool, parse_detail_page, DETAIL_HTML)
+
+    assert asyncio.run(run()) == parse_detail_page(DETAIL_HTML)
+
+
+def test_parse_pool_rejects_unknown_backend():
+    with pytest.raises(ValueError):
+        ParsePool("gpu")
@@ -1,4 +1,4 @@
-from app.scraper.parsers import parse_anime_list, parse_detail, parse_episodes
+from app.scraper.parsers import parse_anime_list, parse_detail, parse_detail_page, parse_episodes
 
 
 def test_parse_anime_list_on_going():
@@ -60,3 +60,28 @@ def test_parse_episodes():
     assert eps[0]["episode_url"] == "https://x/ep1"
     assert eps[0]["episode_number"] == 1
     assert eps[1]["episode_number"] == 12
+
+
+def test_parse_detail_page_single_pass():
+    html = '''
+    <div class="fotoanime">
+      <img src="img.jpg" />
+      <div class="infozin"><div class="infozingle">
+        <p><span><b>Judul</b>: Title A</span></p>
+        <p><span><b>Status</b>: Ongoing</span></p>
+        <p><span><b>Genre</b>: <a>Action</a></span></p>
+        <p><span>No label here</span></p>
+      </div></div>
+      <div class="sinopc"><p>S1</p></div>
+    </div>
+    <div class="episodelist"><ul>
+      <li><span><a href="https://x/ep3">Anime Episode 3 Subtitle Indonesia</a></span></li>
+    </ul></div>
+    '''
+    detail, genres, synopsis, episodes = parse_detail_page(html)
+    assert (detail, genres, synopsis) == parse_detail(html)
+    assert episodes == parse_episodes(html)
+    assert detail["status_detail"] == "Ongoing"
+    assert detail["studio"] is None
+    assert episodes[0]["episode_number"] == 3
+    assert episodes[0]["episode_date_text"] is None
@@ -0,0 +1,60 @@
+import asyncio
+
+from app.scraper.ratelimit import AdaptiveRateLimiter, RateLimiterRegistry, endpoint_class
+
+
+def _limiter(clock=None) -> AdaptiveRateLimiter:
+    kwargs = {"clock": clock} if clock else {}
+    return AdaptiveRateLimiter(
+        rate=1.0, min_rate=0.1, max_rate=4.0, increase=0.5, backoff=0.5, latency_factor=2.0, **kwargs
+    )
+
+
+def test_rate_increases_while_healthy_and_caps():
+    limiter = _limiter()
+    for _ in range(3):
+        limiter.record(200, 0.1)
+    assert limiter.rate == 2.5
+    for _ in range(10):
+        limiter.record(200, 0.1)
+    assert limiter.rate == 4.0
+
+
+def test_rate_backs_off_on_throttle_and_latency():
+    limiter = _limiter()
+    limiter.record(200, 0.1)
+    limiter.record(429, 0.1)
+    assert limiter.rate == 0.75
+    limiter.record(200, 1.0)
+    assert limiter.rate == 0.375
+    for _ in range(10):
+        limiter.record(503, 0.1)
+    assert limiter.rate == 0.1
+
+
+def test_retry_after_pauses_acquire(monkeypatch):
+    now = [100.0]
+    slept = []
+
+    async def fake_sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    async def run():
+        limiter = _limiter(clock=lambda: now[0])
+        limiter.record(429, 0.1, retry_after=5)
+        monkeypatch.setattr(asyncio, "sleep", fake_sleep)
+        await limiter.acquire()
+
+    asyncio.run(run())
+    assert slept == [5.0]
+
+
+def test_registry_separates_host_and_endpoint():
+    registry = RateLimiterRegistry(lambda endpoint: _limiter())
+    page = registry.get("https://x/anime/a/")
+    ajax = registry.get("https://x/wp-admin/admin-ajax.php")
+    assert page is registry.get("https://x/anime/b/")
+    assert page is not ajax
+    assert page is not registry.get("https://y/anime/a/")
+    assert endpoint_class("https://x/wp-admin/admin-ajax.php") == "ajax"
@@ -0,0 +1,47 @@
+from datetime import datetime, timedelta
+
+from app.scraper import scheduler
+from app.scraper.scheduler import RefreshSchedule, next_due_at, observed_cadence
+
+NOW = datetime(2024, 1, 10, 12, 0)
+
+
+def _settings(monkeypatch):
+    monkeypatch.setattr(scheduler.settings, "scraper_ongoing_refresh_hours", 6)
+    monkeypatch.setattr(scheduler.settings, "scraper_max_refresh_hours", 168)
+
+
+def test_schedule_pops_in_due_order_and_ignores_stale_entries():
+    schedule = RefreshSchedule()
+    schedule.push("a", NOW + timedelta(hours=2))
+    schedule.push("b", NOW - timedelta(minutes=1))
+    schedule.push("c", NOW - timedelta(hours=1))
+    schedule.push("a", NOW - timedelta(minutes=30))
+    schedule.discard("c")
+
+    assert schedule.pop_due(NOW, 10) == ["a", "b"]
+    assert schedule.next_due() is None
+    assert len(schedule) == 0
+
+
+def test_cadence_ignores_episodes_first_seen_together():
+    batch = NOW + timedelta(seconds=1)
+    first_seen = [NOW, batch, batch + timedelta(days=7), batch + timedelta(days=14)]
+    assert observed_cadence(first_seen) == timedelta(days=7)
+    assert observed_cadence([NOW, NOW + timedelta(seconds=1)]) is None
+
+
+def test_next_due_follows_status_and_cadence(monkeypatch):
+    _settings(monkeypatch)
+    ongoing = {"status_list_page": "on-going", "status_detail": "Ongoing", "last_scraped_at": NOW}
+
+    assert next_due_at({**ongoing, "last_scraped_at": None}, NOW) == NOW
+    assert next_due_at(ongoing, NOW) == NOW + timedelta(hours=6)
+    weekly = [NOW - timedelta(days=14), NOW - timedelta(days=7), NOW]
+    assert next_due_at({**ongoing, "episode_first_seen": weekly}, NOW) == NOW + timedelta(days=3, hours=12)
+    monthly = [NOW - timedelta(days=90), NOW - timedelta(days=30)]
+    assert next_due_at({**ongoing, "episode_first_seen": monthly}, NOW) == NOW + timedelta(hours=168)
+
+    completed = {"status_list_page": "completed", "status_detail": "Completed", "last_scraped_at": NOW}
+    assert next_due_at({**completed, "fully_mirrored": True}, NOW) is None
+    assert next_due_at({**completed, "fully_mirrored": False}, NOW) == NOW + timedelta(hours=6)